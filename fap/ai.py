@@ -1,1012 +1,1726 @@
-import logging
-import google.generativeai as genai
-import os
-from transformers import AutoModelForSequenceClassification, AutoTokenizer
-import torch
-import asyncio
-import aiofiles
-import json
-import uuid
-import time
-from dotenv import load_dotenv
-import io
-import sys
-from huggingface_hub import login
-import subprocess
-import tempfile
-import py_compile
-import re
-import platform
-from RestrictedPython import compile_restricted, safe_globals
-from RestrictedPython.PrintCollector import PrintCollector
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import make_pipeline
-import difflib
-import pandas as pd
-import aiohttp
-
-load_dotenv()
-
-# --------------------------
-# Hugging Face 모델 로그인 및 오류 모델 로드
-# --------------------------
-hf_token = os.getenv("HF_TOKEN")
-if hf_token:
-    login(hf_token)
-
-error_model_name = "MilkTeaaaaaeee/1235657"
-error_model = AutoModelForSequenceClassification.from_pretrained(
-    error_model_name, use_auth_token=True
-)
-error_tokenizer = AutoTokenizer.from_pretrained(
-    error_model_name, use_auth_token=True
-)
-
-# --------------------------
-# ContentGenerator 클래스
-# --------------------------
-class ContentGenerator:
-    def __init__(self):
-        genai.configure(api_key=os.getenv("OPENAI_API_KEY"))
-        generation_config = {
-            "temperature": 1,
-            "top_p": 0.95,
-            "top_k": 40,
-            "max_output_tokens": 8192,
-            "response_mime_type": "text/plain",
-        }
-        self.model = genai.GenerativeModel(
-            model_name="gemini-1.5-flash",
-            generation_config=generation_config,
-        )
-
-    async def generate_content_async(self, prompt):
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.model.generate_content, prompt)
-
-    async def generate_theory(self, topic):
-        prompt = f"""
-        다음 파이썬 주제에 대한 이론을 설명해주세요:
-        {topic}
-
-        다음 지침을 따라주세요:
-        1. 각 개념에 대해 구체적인 예시를 포함해주세요.
-        2. 가능한 경우, 실생활에서의 응용 사례를 들어 설명해주세요.
-        3. 중요한 개념은 강조해주세요.
-        4. 코드 예제를 통해 설명하는 경우, 코드의 각 부분에 대한 설명을 추가해주세요.
-        5. 관련된 다른 주제나 개념과 연결 지어 설명해주세요.
-        6. 답변은 한국어로만 작성해주세요.
-        """
-        response = await self.generate_content_async(prompt)
-        return response.text
-
-    async def generate_exercises(self, topic):
-        prompt = f"""
-        다음 파이썬 주제에 대한 쉬움 난이도의 3개의 연습문제를 생성해주세요:
-        {topic}
-
-        각 문제는 이전에 생성된 문제와 중복되지 않아야 합니다.
-        각 문제는 다음 형식을 정확히 따라야 합니다:
-        문제 번호. 문제 설명 (난이도: 쉬움)
-        - 구체적인 지시사항 (여러 줄 가능)
-        입력 예:
-            (구체적인 사용자 입력 예시)
-        출력 예:
-            (예시 입력에 대한 구체적인 예상 출력)
-
-        각 문제에 대해 반드시 구체적인 입력 예와 출력 예를 제공해주세요.
-        문제는 '---'로 구분해주세요.
-
-        답변은 반드시 한국어로 작성해주세요.
-        """
-        # 문제(연습문제) 생성
-        response = await self.generate_content_async(prompt)
-        exercises = await self.parse_exercises(response.text, topic)
-        # 생성된 문제 각각에 대해 정답 코드 생성 & DB 저장
-
-        # generate_answer()에 문제 instructions, input_example, output_example까지 넘겨줌
-        for exercise in exercises:
-            exercise["correct_answer"] = await self.generate_answer(
-                topic,
-                exercise["question"],
-                exercise["instructions"],
-                exercise["input_example"],
-                exercise["output_example"],
-                exercise["number"]
-            )
-        return exercises
-
-    async def parse_exercises(self, response_text, topic):
-        problems = re.split(r'\n\s*---\s*\n', response_text.strip())
-        exercises = []
-        for idx, problem in enumerate(problems, 1):
-            ex = self.parse_single_exercise(problem, idx, topic)
-            if ex:
-                exercises.append(ex)
-        return exercises
-
-    def parse_single_exercise(self, problem_text, idx, topic):
-        lines = [line.strip() for line in problem_text.strip().split('\n')]
-        if len(lines) < 3:
-            return None
-        question = lines[0]
-        instructions = []
-        input_example = ""
-        output_example = ""
-        current_section = "instructions"
-        for line in lines[1:]:
-            if line.startswith("입력 예:"):
-                current_section = "input"
-                continue
-            elif line.startswith("출력 예:"):
-                current_section = "output"
-                continue
-
-            if current_section == "instructions":
-                instructions.append(line)
-            elif current_section == "input":
-                input_example += line + "\n"
-            elif current_section == "output":
-                output_example += line + "\n"
-
-        if not (question and instructions and input_example and output_example):
-            return None
-        return {
-            "number": f"{idx:03d}",
-            "topic": topic,
-            "question": question,
-            "instructions": instructions,
-            "input_example": input_example.strip(),
-            "output_example": output_example.strip(),
-            "correct_answer": ""
-        }
-
-    async def generate_answer(
-        self,
-        topic,
-        question,
-        instructions,
-        input_example,
-        output_example,
-        problem_number=None
-    ):
-        """
-        주제에 맞는 로직, 문제의 지시사항/입출력 예시를 정확히 반영하도록 프롬프트 강화
-        """
-        joined_instructions = "\n".join(instructions)
-        prompt = f"""
-        아래는 파이썬 연습문제입니다.
-
-        주제: {topic}
-        문제 설명: {question}
-
-        상세 지시사항:
-        {joined_instructions}
-
-        입력 예:
-        {input_example}
-
-        출력 예:
-        {output_example}
-
-        아래 요구사항을 반드시 충족하여 파이썬 정답 코드를 작성하세요:
-        1) 반드시 위 주제({topic})와 관련된 로직/문법을 활용할 것
-        2) 문제에서 제시한 '입력 예'와 '출력 예'에 맞춰 정확히 동작해야 함
-        3) 불필요한 추가 출력이나 주석은 넣지 말 것
-        4) 문제 지시사항을 충분히 반영할 것
-
-        코드만 작성해주세요.
-        """
-
-        response = await self.generate_content_async(prompt)
-        answer_code = response.text.strip()
-        await self.save_answer_to_db(question, answer_code, problem_number)
-        return answer_code
-
-    async def save_answer_to_db(self, question, answer_code, problem_number):
-        api_client = APIClient()
-        data = {
-            "question": question,
-            "answer_code": answer_code,
-            "problem_number": problem_number
-        }
-        await api_client.save_answer(data)
-
-    async def generate_hint(self, question, hint_count):
-        hint_prompts = [
-            f"다음 문제에 대한 첫 번째 힌트를 생성해주세요:\n{question}\n힌트는 문제 해결의 방향을 제시해야 하지만, 직접적인 답은 주지 말고, 한국어로 작성해주세요.",
-            f"다음 문제에 대한 추가 힌트를 생성해주세요. 첫 번째 힌트와는 다른 관점에서 접근하도록 작성하되, 한국어로 작성해주세요:\n{question}",
-            f"다음 문제에 대한 고급 힌트를 생성해주세요. 문제를 해결하기 위한 구체적인 단계를 제안해주세요. 한국어로 작성해주세요:\n{question}",
-            f"다음 문제에 대한 마지막 힌트를 생성해주세요. 가능한 정답에 가까워질 수 있는 방향으로 한국어로 작성해주세요:\n{question}"
-        ]
-        prompt = hint_prompts[min(hint_count, len(hint_prompts) - 1)]
-        response = await self.generate_content_async(prompt)
-        return response.text.strip()
-
-
-# --------------------------
-# 커스텀 출력 콜렉터 정의
-# --------------------------
-class MyPrintCollector:
-    def __init__(self):
-        self.outputs = []
-    def __call__(self, *args, **kwargs):
-        self.outputs.append(" ".join(map(str, args)))
-
-
-# --------------------------
-# CodeVerifier 클래스
-# --------------------------
-class CodeVerifier:
-    def __init__(self, api_key):
-        # 아래 한 줄 추가 (혹은 유지)해서 generativeai 초기화
-        genai.configure(api_key=api_key)
-        self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-        self.error_model_name = "MilkTeaaaaaeee/1235657"
-        self.error_model = AutoModelForSequenceClassification.from_pretrained(
-            self.error_model_name, use_auth_token=True
-        )
-        self.error_tokenizer = AutoTokenizer.from_pretrained(
-            self.error_model_name, use_auth_token=True
-        )
-        self.api_key = api_key
-
-    async def classify_error(self, user_code):
-        inputs = self.error_tokenizer(user_code, return_tensors="pt", truncation=True, padding=True)
-        with torch.no_grad():
-            outputs = self.error_model(**inputs)
-        predicted_class = torch.argmax(outputs.logits, dim=1).item()
-        return self.error_model.config.id2label[predicted_class]
-
-    async def execute_code_snippet(self, code_snippet, input_example):
-        try:
-            output = await self.execute_code(code_snippet, input_example, restricted=True)
-            return output
-        except Exception as e:
-            return f"오류 발생: {e}"
-
-    async def analyze_error(self, user_code):
-        try:
-            error_type = await self.classify_error(user_code)
-            suggestion = await self.generate_suggestion(user_code, error_type)
-            return suggestion
-        except Exception as e:
-            return f"오류 발생: {e}"
-
-    async def generate_suggestion(self, user_code, error_type):
-        prompt = f"""
-        다음 파이썬 코드에서 오류 유형 '{error_type}'가 감지되었습니다.
-        코드:
-        {user_code}
-
-        아래 지침을 따르세요:
-        - 오류 원인과 수정 제안을 한국어로 작성해주세요.
-        - JSON이 아닌 일반 텍스트로만 간단히 제안해도 됩니다.
-        """
-        response = await self.gemini_model.generate_content(prompt)
-        return response.text.strip()
-
-    async def execute_code(self, code, input_example, restricted=True):
-        collector = MyPrintCollector()
-        restricted_globals = {
-            "__builtins__": safe_globals["__builtins__"],
-            "_print_": collector,
-            "_getattr_": getattr,
-            "_getitem_": lambda obj, key: obj[key],
-            "_getiter_": iter,
-            "input": lambda prompt='': input_example,
-        }
-        try:
-            compiled_code = compile_restricted(code, "<string>", "exec")
-            locals_dict = {}
-            exec(compiled_code, restricted_globals, locals_dict)
-            return "\n".join(collector.outputs)
-        except Exception as e:
-            raise Exception(f"RestrictedPython 오류: {e}")
-
-    async def additional_validation(self, user_code, correct_answer, user_output, correct_output):
-        prompt = f"""
-        다음 두 코드의 의미적 차이를 분석해주세요:
-        사용자 코드:
-        {user_code}
-        정답 코드:
-        {correct_answer}
-        사용자 출력:
-        {user_output}
-        정답 출력:
-        {correct_output}
-
-        분석 결과는 한국어로 작성해주세요.
-        """
-        response = await self.gemini_model.generate_content(prompt)
-        return response.text.strip()
-
-    async def compare_code(self, user_code, correct_answer, input_example, output_example):
-        try:
-            user_output = await self.execute_code(user_code, input_example, restricted=True)
-            correct_output = await self.execute_code(correct_answer, input_example, restricted=True)
-
-            user_output = self.normalize_output(user_output)
-            correct_output = self.normalize_output(correct_output)
-
-            additional_validation_result = await self.additional_validation(
-                user_code, correct_answer, user_output, correct_output
-            )
-
-            await self.save_validation_result_to_db(
-                user_code, correct_answer, user_output, correct_output, additional_validation_result
-            )
-
-            if user_output == correct_output:
-                # 예외: 단순 print('정답') 방지
-                if "print('정답')" in user_code and len(user_code.strip()) < 20:
-                    return False, "오답입니다. 단순한 출력만으로는 정답으로 처리되지 않습니다."
-                else:
-                    return True, "정답입니다."
-            else:
-                return False, f"오답입니다. 예상 출력: {output_example}, 실제 출력: {user_output}"
-
-        except Exception as e:
-            logging.error(f"코드 비교 중 오류 발생: {e}")
-            return False, f"오류 발생: {e}"
-
-    def normalize_output(self, output):
-        return re.sub(r'\s+', ' ', output).strip()
-
-    def check_syntax(self, code):
-        try:
-            py_compile.compile(io.StringIO(code).read(), '<string>')
-            return True
-        except py_compile.PyCompileError:
-            return False
-
-    # 여기서 "문제" 대신 exercise['question']을 반영해 보다 직설적이 되도록 수정
-    async def review_error_and_suggest_correction(self, user_code, exercise, error_type):
-        """
-        - 문법적 오류가 없고
-        - 논리적 오류가 없고
-        - 문제에서 지시한 사항을 정확히 이행
-        - 문제에서 설명한 입력과 출력이 문제의 의도대로 동작
-        - 로직이 오류 없고, 문제에서 의도하는 로직이 잘 반영
-        - 문제에서 지시한 내용과 제공 코드가 무관하지 않아야 함
-        """
-        prompt = f"""
-        다음 Python 코드에서 오류를 검토해주세요.
-
-        문제(실제 문제 내용): {exercise['question']}
-
-        사용자 코드:
-        {user_code}
-
-        오류 유형 (MilkTeaaaaaeee 모델): {error_type}
-
-        아래 조건들을 모두 만족하는지 확인하세요:
-        1) 코드에 문법적 오류가 없는지
-        2) 논리적 오류(예: 잘못된 로직, 불필요한 로직 등)가 없는지
-        3) '{exercise['question']}'에서 지시한 사항을 정확히 이행하여 정상적으로 동작하는지
-        4) '{exercise['question']}'에서 설명한 입력과 출력이 문제의 의도대로 동작해야 함
-        5) 로직이 오류가 없더라도 '{exercise['question']}'에서 의도한 로직이 잘 반영되어야 함
-        6) '{exercise['question']}'에서 지시한 내용과 제공한 코드가 무관하지 않은지
-
-        모두 만족한다면 "수정이 필요하지 않음"만 "correction_suggestion" 값으로 넣어주세요.
-
-        아래 내용을 반드시 JSON 형태(한글)로만 응답해 주세요:
-        {{
-          "error_type": "재검토된 오류 유형",
-          "error_line": "오류가 있는 라인 표시 (예: 3)",
-          "correction_suggestion": "위 조건중 하나라도 만족하지 않으면 구체적인 수정 방안을, 모두 만족하면 '수정이 필요하지 않음' 만 넣어주세요."
-        }}
-        """
-        try:
-            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
-            result_text = response.text.strip()
-            if not result_text:
-                logging.error("Gemini 모델 응답이 비어 있습니다.")
-                return "오답입니다.\n오류 분석 응답이 비어 있습니다."
-            start = result_text.find("{")
-            end = result_text.rfind("}")
-            if start == -1 or end == -1:
-                logging.error("응답에 JSON 객체를 찾을 수 없습니다.")
-                return "오답입니다.\n정상적인 JSON 응답을 받지 못했습니다."
-            json_str = result_text[start:end+1]
-            try:
-                result = json.loads(json_str)
-            except Exception as e:
-                logging.exception("JSON 파싱 오류")
-                return "오답입니다.\n오류 분석 JSON 파싱 실패로, 구체적인 수정 제안을 찾을 수 없습니다."
-            error_line = result.get("error_line", "알 수 없음")
-            suggestion = result.get("correction_suggestion", "수정 제안 없음")
-            e_type = result.get("error_type", "알 수 없음")
-            return (
-                f"오류 유형: {e_type}\n"
-                f"오류 라인: {error_line}\n"
-                f"수정 제안: {suggestion}"
-            )
-        except json.JSONDecodeError as e:
-            logging.exception(f"Gemini 모델 응답 JSON 파싱 오류: {e}")
-            return "오답입니다.\n오류 분석 JSON 파싱 실패로, 구체적인 수정 제안을 찾을 수 없습니다."
-        except Exception as e:
-            logging.exception(f"Gemini 모델 오류 발생: {e}")
-            return "오답입니다.\n오류 분석 중 알 수 없는 문제가 발생했습니다."
-
-    async def save_validation_result_to_db(self, user_code, correct_answer, user_output, correct_output, analysis):
-        # 필요하다면 구현
-        pass
-
-
-# --------------------------
-# UserProgress 클래스
-# --------------------------
-class UserProgress:
-    def __init__(self, user_id=None, current_topic=None, last_problem_number=0, interaction_count=0):
-        self.user_id = user_id
-        self.current_topic = current_topic
-        self.last_problem_number = last_problem_number
-        self.interaction_count = interaction_count
-
-
-# --------------------------
-# APIClient 클래스
-# --------------------------
-class APIClient:
-    def __init__(self):
-        self.base_url = "http://localhost:8080/api/submit-code"
-        self.max_retries = 3
-        self.retry_delay = 1
-
-    async def save_submission(self, data):
-        for attempt in range(self.max_retries):
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        self.base_url,
-                        json=data,
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as resp:
-                        resp.raise_for_status()
-                        return await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                logging.error(f"API 호출 실패 (시도 {attempt + 1}/{self.max_retries}): {e}")
-                if attempt == self.max_retries - 1:
-                    logging.error(f"모든 시도가 실패했습니다. 데이터 저장 실패: {data}")
-                    raise
-                await asyncio.sleep(self.retry_delay * (attempt + 1))
-        return None
-
-    async def save_answer(self, data):
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "http://localhost:8080/api/save-answer",
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                try:
-                    resp.raise_for_status()
-                    return await resp.json()
-                except aiohttp.ClientResponseError as e:
-                    logging.error(f"API 요청 실패: {e}")
-                    return {"error": str(e)}
-
-    async def get_submissions(self, user_id):
-        for attempt in range(self.max_retries):
-            try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"{self.base_url}/{user_id}",
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as resp:
-                        resp.raise_for_status()
-                        return await resp.json()
-            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                logging.error(f"API 호출 실패 (시도 {attempt + 1}/{self.max_retries}): {e}")
-                if attempt == self.max_retries - 1:
-                    raise
-                await asyncio.sleep(self.retry_delay * (attempt + 1))
-        return None
-
-
-# --------------------------
-# UserSessionManager 클래스
-# --------------------------
-class UserSessionManager:
-    def __init__(self, db_session=None):
-        self.db = db_session
-        self.sessions = {}
-        self.user_progress = {}
-        self.api_client = APIClient()
-
-    async def save_exercises(self, user_id, exercises):
-        return
-
-    async def validate_submission(self, user_id, user_code, problem_number):
-        answer_code = await self.get_answer_from_db(problem_number)
-        similarity = difflib.SequenceMatcher(None, answer_code, user_code).ratio()
-        return similarity > 0.8
-
-    async def get_answer_from_db(self, problem_number):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"http://localhost:8080/api/get-answer/{problem_number}",
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                resp.raise_for_status()
-                answers = await resp.json()
-                if isinstance(answers, list) and answers:
-                    latest_answer = max(answers, key=lambda x: x.get("createdAt", ""))
-                    return latest_answer.get("answer_code", "")
-                return answers.get("answer_code", "")
-
-    async def load_exercises(self, user_id):
-        submissions = await self.api_client.get_submissions(user_id)
-        results = []
-        if submissions:
-            for sub in submissions:
-                if sub.get('problem_number', '').startswith('EXERCISE_'):
-                    try:
-                        ex = json.loads(sub['code'])
-                        results.append(ex)
-                    except:
-                        pass
-        return results
-
-    async def analyze_user_profile(self, user_id):
-        if user_id in self.user_progress:
-            df = pd.DataFrame([self.user_progress[user_id].__dict__])
-            return f"사용자 프로필 분석 결과: {df.to_dict(orient='records')}"
-        return "프로필 데이터가 없습니다."
-
-    async def is_problem_solved(self, user_id, problem_number):
-        solved = [
-            exercise["number"]
-            for exercise in self.sessions[user_id].get("current_exercises", [])
-            if exercise.get("solved", False)
-        ]
-        return problem_number in solved
-
-    async def save_user_state(self, user_id, state):
-        if user_id not in self.user_progress:
-            self.user_progress[user_id] = UserProgress(
-                user_id=user_id,
-                current_topic=state.get('current_topic', '파이썬이란?'),
-                last_problem_number=state.get('last_problem', 0),
-                interaction_count=state.get('interaction_count', 0)
-            )
-        else:
-            self.user_progress[user_id].current_topic = state.get('current_topic', '파이썬이란?')
-            self.user_progress[user_id].last_problem_number = state.get('last_problem', 0)
-            self.user_progress[user_id].interaction_count = state.get('interaction_count', 0)
-
-    async def load_user_state(self, user_id):
-        if user_id in self.user_progress:
-            self.sessions[user_id] = {
-                "current_topic": self.user_progress[user_id].current_topic,
-                "last_problem": self.user_progress[user_id].last_problem_number,
-                "feedback": [],
-                "last_feedback_time": time.time(),
-                "feedback_count": 0,
-                "interaction_count": self.user_progress[user_id].interaction_count,
-                "current_exercises": await self.load_exercises(user_id),
-                "state": {},
-                "hint_counts": {},
-                "difficulty_level": "쉬움"
-            }
-        else:
-            self.sessions[user_id] = {
-                "current_topic": "파이썬이란?",
-                "last_problem": 0,
-                "feedback": [],
-                "last_feedback_time": time.time(),
-                "feedback_count": 0,
-                "interaction_count": 0,
-                "current_exercises": [],
-                "state": {},
-                "hint_counts": {},
-                "difficulty_level": "쉬움"
-            }
-            await self.save_user_state(user_id, self.sessions[user_id])
-
-    async def update_user_progress(self, user_id, problem_number):
-        pass
-
-    async def update_dashboard(self, user_id):
-        state = self.sessions[user_id].get('state', {})
-        current_chapter = self.sessions[user_id].get('current_chapter', '01')
-        last_problem = self.sessions[user_id].get('last_problem', 0)
-        interaction_count = self.sessions[user_id].get('interaction_count', 0)
-        logging.info(
-            f"사용자 {user_id}의 대시보드 업데이트: 챕터 {current_chapter}, 문제 {last_problem}, 상호작용 {interaction_count}"
-        )
-        if interaction_count % 10 == 0 and interaction_count != 0:
-            feedback = (
-                f"🤖 챗봇: {interaction_count}번의 상호작용을 완료하셨습니다! 잘 하고 계십니다.\n"
-                f"현재 {current_chapter}장을 학습 중이며, {last_problem}번 문제까지 풀어보셨습니다.\n"
-                "계속해서 열심히 학습해 주세요!"
-            )
-            return feedback
-        return ""
-
-
-# --------------------------
-# PythonTutor 클래스
-# --------------------------
-class PythonTutor:
-    def __init__(self, api_key):
-        self.logger = logging.getLogger(__name__)
-        self.content_generator = ContentGenerator()
-        self.current_topic_index = 0
-        self.session_manager = UserSessionManager(db_session=None)
-        self.api_client = APIClient()
-        self.python_topics = [
-            "파이썬이란?",
-            "파이썬의 특징",
-            "파이썬으로 무엇을 할 수 있을까?",
-            "파이썬 설치하기",
-            "파이썬 둘러보기",
-            "파이썬과 에디터",
-            "숫자형",
-            "문자열 자료형",
-            "리스트 자료형",
-            "튜플 자료형",
-            "딕셔너리 자료형",
-            "집합 자료형",
-            "불 자료형",
-            "변수",
-            "if문",
-            "while문",
-            "for문",
-            "함수",
-            "사용자 입출력",
-            "파일 읽고 쓰기",
-            "프로그램의 입출력",
-            "클래스",
-            "모듈",
-            "패키지",
-            "예외 처리",
-            "내장 함수",
-            "표준 라이브러리",
-            "외부 라이브러리"
-        ]
-        self.api_key = api_key
-        genai.configure(api_key=self.api_key)
-        self.intent_classifier = self.train_intent_classifier()
-
-    async def handle_user_profile_request(self, user_id):
-        profile_analysis = await self.session_manager.analyze_user_profile(user_id)
-        return f"🤖 챗봇: 사용자 프로필 분석 결과\n\n{profile_analysis}"
-
-    async def get_exercise(self, problem_number, user_id):
-        current_topic = self.session_manager.sessions[user_id]["current_topic"]
-        ex_list = self.session_manager.sessions[user_id]["current_exercises"]
-        for ex in ex_list:
-            if ex['number'] == problem_number and ex['topic'] == current_topic:
-                return ex
-        return None
-
-    async def handle_interactive_problem_request(self, user_input, user_id):
-        topic = self.session_manager.sessions[user_id]["current_topic"]
-        prompt = f"사용자가 '{user_input}'에 대해 더 알고 싶어합니다. 관련된 정보를 한국어로 제공해주세요."
-        response = await self.content_generator.generate_content_async(prompt)
-        return f"🤖 챗봇: {response.text}"
-
-    async def handle_exercise_request(self, user_input, user_id):
-        topic_match = re.search(r'(.*)\s*연습문제', user_input)
-        if topic_match:
-            topic = topic_match.group(1).strip()
-            exercises = await self.content_generator.generate_exercises(topic)
-            self.session_manager.sessions[user_id]["current_exercises"] = exercises
-            self.session_manager.sessions[user_id]["current_topic"] = topic
-            self.session_manager.sessions[user_id]["last_problem"] = 0
-
-            response = "\n\n".join([
-                f"{exercise['number']}. {exercise['question']}\n" +
-                "\n".join(exercise['instructions']) + "\n" +
-                f"입력 예:\n{exercise['input_example']}\n출력 예:\n{exercise['output_example']}"
-                for exercise in exercises
-            ])
-            return response
-        else:
-            return "❌ 잘못된 입력입니다. '[주제] 연습문제' 형식으로 입력해주세요."
-
-    async def handle_code_snippet_request(self, code_snippet, user_id):
-        try:
-            verifier = CodeVerifier(api_key=self.api_key)
-            output = await verifier.execute_code_snippet(code_snippet, "")
-            if "오류 발생" in output:
-                suggestion = await verifier.analyze_error(code_snippet)
-                error_type = await verifier.classify_error(code_snippet)
-                feedback_message = (
-                    f"🤖 챗봇: {error_type} 오류가 발생했습니다.\n\n{output}\n\n수정 제안: {suggestion}"
-                )
-            else:
-                feedback_message = f"🤖 챗봇: 코드 스니펫 실행 결과\n\n{output}"
-            return feedback_message
-        except Exception as e:
-            return f"🤖 챗봇: 오류 발생\n\n{e}"
-
-    async def handle_theory_request(self, user_input, user_id):
-        if user_input == "다음 주제":
-            self.current_topic_index += 1
-            if self.current_topic_index >= len(self.python_topics):
-                return "🎉 모든 주제를 완료하셨습니다. 축하합니다!"
-            topic = self.python_topics[self.current_topic_index]
-            theory_content = await self.content_generator.generate_theory(topic)
-            self.session_manager.sessions[user_id]["current_topic"] = topic
-            response = (
-                f"🤖 챗봇: {topic}에 대한 이론 설명입니다.\n\n" +
-                f"{theory_content}\n\n" +
-                f"'{topic} 연습문제'라고 입력하시면 문제를 제공해드립니다."
-            )
-            return response
-        else:
-            topic_match = re.search(r'(.*)\s*이론', user_input)
-            if topic_match:
-                topic = topic_match.group(1).strip()
-                if topic not in self.python_topics:
-                    return f"❌ 존재하지 않는 주제입니다: {topic}"
-                if self.python_topics.index(topic) < self.current_topic_index:
-                    return f"❌ 이미 완료한 주제입니다: {topic}"
-                theory_content = await self.content_generator.generate_theory(topic)
-                self.session_manager.sessions[user_id]["current_topic"] = topic
-                self.current_topic_index = self.python_topics.index(topic)
-                return f"🤖 챗봇: {topic}에 대한 이론 설명입니다.\n\n{theory_content}"
-            else:
-                return "❌ 잘못된 입력입니다. '[주제] 이론' 형식으로 입력해주세요."
-
-    async def handle_hint_request(self, user_input, user_id):
-        parts = user_input.split()
-        if len(parts) < 2:
-            return "❌ 잘못된 입력입니다. '힌트 [문제번호]'를 입력해주세요. 예: '힌트 001'"
-        problem_number = parts[1]
-        exercise = await self.get_exercise(problem_number, user_id)
-        if not exercise:
-            return f"❌ 존재하지 않는 문제 번호이거나 현재 토픽과 맞지 않습니다: {problem_number}"
-        hint_count = self.session_manager.sessions[user_id].get("hint_counts", {}).get(problem_number, 0)
-        hint = await self.content_generator.generate_hint(exercise["question"], hint_count)
-        if "hint_counts" not in self.session_manager.sessions[user_id]:
-            self.session_manager.sessions[user_id]["hint_counts"] = {}
-        self.session_manager.sessions[user_id]["hint_counts"][problem_number] = hint_count + 1
-        return f"🤖 챗봇: {problem_number}번 문제 힌트:\n\n{hint}"
-
-    async def handle_more_exercise_request(self, user_input, user_id):
-        if user_input != "더 풀기":
-            return "❌ 잘못된 입력입니다. '더 풀기'를 입력해주세요."
-        current_topic = self.session_manager.sessions[user_id]["current_topic"]
-        current_difficulty = self.session_manager.sessions[user_id].get("difficulty_level", "쉬움")
-        difficulty_levels = ["쉬움", "보통", "어려움"]
-        current_index = difficulty_levels.index(current_difficulty)
-
-        if current_index == len(difficulty_levels) - 1:
-            self.current_topic_index += 1
-            if self.current_topic_index >= len(self.python_topics):
-                return "🎉 모든 주제를 완료하셨습니다. 축하합니다!"
-            next_topic = self.python_topics[self.current_topic_index]
-            intro = f"🆕 새로운 주제: {next_topic}\n\n"
-            intro += await self.content_generator.generate_theory(next_topic)
-            new_exercises = await self.content_generator.generate_exercises(next_topic)
-            self.session_manager.sessions[user_id]["last_problem"] = 0
-            self.session_manager.sessions[user_id]["current_exercises"] = new_exercises
-            self.session_manager.sessions[user_id]["current_topic"] = next_topic
-            self.session_manager.sessions[user_id]["difficulty_level"] = "쉬움"
-            return intro + "\n" + self.format_exercises(new_exercises)
-        else:
-            new_difficulty = difficulty_levels[current_index + 1]
-            self.session_manager.sessions[user_id]["difficulty_level"] = new_difficulty
-
-            # generate_exercises_with_difficulty가 있다고 가정
-            new_exercises = await self.content_generator.generate_exercises_with_difficulty(
-                current_topic, new_difficulty
-            )
-
-            self.session_manager.sessions[user_id]["last_problem"] = 0
-            self.session_manager.sessions[user_id]["current_exercises"].extend(new_exercises)
-            return f"📚 {current_topic} 추가 연습문제:\n\n" + self.format_exercises(new_exercises)
-
-    def format_exercises(self, exercises):
-        response = ""
-        for exercise in exercises:
-            response += f"{exercise['number']}. {exercise['question']}\n"
-            for instruction in exercise["instructions"]:
-                response += f"   {instruction}\n"
-            response += f"   입력 예:\n{exercise['input_example']}\n"
-            response += f"   출력 예:\n{exercise['output_example']}\n\n"
-        return response
-
-    async def handle_code_submission(self, code, problem_number, user_id):
-        if not code.strip():
-            return {"success": False, "message": "코드를 입력해주세요."}
-
-        exercise = await self.get_exercise(problem_number, user_id)
-        if not exercise:
-            return {
-                "success": False,
-                "message": f"존재하지 않는 문제 번호이거나 현재 토픽과 맞지 않습니다: {problem_number}"
-            }
-
-        try:
-            verifier = CodeVerifier(api_key=self.api_key)
-            is_correct, compare_msg = await verifier.compare_code(
-                code,
-                exercise["correct_answer"],
-                exercise["input_example"],
-                exercise["output_example"]
-            )
-            if is_correct:
-                exercise["solved"] = True
-                submission_data = {
-                    "user_id": user_id,
-                    "code": code,
-                    "problem_number": problem_number,
-                    "is_correct": True,
-                    "feedback": "정답"
-                }
-                await self.api_client.save_submission(submission_data)
-                self.session_manager.sessions[user_id]["interaction_count"] += 1
-                await self.session_manager.save_user_state(user_id, self.session_manager.sessions[user_id])
-                return {
-                    "success": True,
-                    "is_correct": True,
-                    "message": "정답입니다! 다음 문제에 도전해보세요.",
-                    "feedback": await self.session_manager.update_dashboard(user_id)
-                }
-
-            error_type = await verifier.classify_error(code)
-            suggestion = await verifier.review_error_and_suggest_correction(code, exercise, error_type)
-
-            submission_data = {
-                "user_id": user_id,
-                "code": code,
-                "problem_number": problem_number,
-                "is_correct": False,
-                "feedback": suggestion
-            }
-            await self.api_client.save_submission(submission_data)
-            self.session_manager.sessions[user_id]["interaction_count"] += 1
-            await self.session_manager.save_user_state(user_id, self.session_manager.sessions[user_id])
-            return {
-                "success": True,
-                "is_correct": False,
-                "message": f"오답입니다.\n\n{suggestion}",
-                "feedback": await self.session_manager.update_dashboard(user_id)
-            }
-
-        except Exception as e:
-            logging.error(f"코드 검증/저장 중 오류 발생: {str(e)}", exc_info=True)
-            return {
-                "success": False,
-                "message": f"시스템 오류: {str(e)}",
-                "feedback": "문제가 지속되면 관리자에게 문의해주세요."
-            }
-
-    def train_intent_classifier(self):
-        X = [
-            "파이썬 이론 설명해줘", "리스트 자료형에 대해 알려줘",
-            "연습문제 풀고 싶어", "문제 좀 내줘",
-            "힌트 주세요", "001번 문제 힌트",
-            "정답이 뭐야", "답 알려줘",
-            "더 풀고 싶어", "추가 문제 주세요"
-        ]
-        y = [
-            'theory', 'theory',
-            'exercise', 'exercise',
-            'hint', 'hint',
-            'answer', 'answer',
-            'more_exercises', 'more_exercises'
-        ]
-        model = make_pipeline(TfidfVectorizer(), MultinomialNB())
-        model.fit(X, y)
-        return model
-
-    async def intent_recognition(self, user_input):
-        pattern_map = {
-            'theory': r'(이론)',
-            'exercise': r'(연습문제)',
-            'hint': r'^힌트',
-            'more_exercises': r'^더\s*풀기$'
-        }
-        for intent, pattern in pattern_map.items():
-            if re.search(pattern, user_input):
-                return intent
-        predicted_intent = self.intent_classifier.predict([user_input])[0]
-        return predicted_intent
-
-    async def get_intent_handler(self, intent):
-        handlers = {
-            'theory': self.handle_theory_request,
-            'exercise': self.handle_exercise_request,
-            'hint': self.handle_hint_request,
-            'more_exercises': self.handle_more_exercise_request,
-        }
-        return handlers.get(intent, self.handle_unknown_intent)
-
-    async def handle_unknown_intent(self, user_input, user_id):
-        return "죄송합니다. 이해하지 못했습니다. 다시 말씀해주세요."
-
-    async def handle_user_input(self, user_input, user_id):
-        try:
-            if user_input.strip().lower() == "더 풀기":
-                response = await self.handle_more_exercise_request(user_input, user_id)
-            else:
-                intent = await self.intent_recognition(user_input)
-                handler = await self.get_intent_handler(intent)
-                response = await handler(user_input, user_id)
-
-            self.session_manager.sessions[user_id]["interaction_count"] += 1
-            await self.session_manager.save_user_state(user_id, self.session_manager.sessions[user_id])
-            feedback = await self.session_manager.update_dashboard(user_id)
-            if feedback:
-                response += f"\n\n{feedback}"
-            return response
-        except Exception as e:
-            logging.error(f"입력 처리 오류: {e}", exc_info=True)
-            return f"❌ 오류 발생: {e}"
-
-    async def handle_error(self, error):
-        error_message = f"❌ 요청 처리 중 오류 발생: {str(error)}"
-        logging.error(error_message, exc_info=True)
-        return error_message
-
-
-logging.basicConfig(
-    level=logging.INFO,
-    encoding='utf-8',
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("python_tutor.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
-
-
-async def start_conversation():
-    # USER_ID 환경변수 사용 (없으면 uuid로)
-    user_id = os.getenv("USER_ID")
-    if not user_id:
-        user_id = str(uuid.uuid4())
-
-    tutor = PythonTutor(os.getenv("OPENAI_API_KEY"))
-    await tutor.session_manager.load_user_state(user_id)
-    logging.info(f"새로운 사용자 세션 시작: {user_id}")
-
-    print("🤖 챗봇: 안녕하세요! 파이썬 학습 챗봇입니다. 다음과 같은 명령어를 사용할 수 있습니다:")
-    print("   1. '[주제] 이론' - 해당 주제의 이론을 제공합니다. 예: '파이썬이란? 이론'")
-    print("   2. '[주제] 연습문제' - 해당 주제의 연습문제를 제공합니다. 예: 'while문 연습문제'")
-    print("   3. '힌트 [문제번호]' - 특정 문제에 대한 힌트를 제공합니다. 예: '힌트 001'")
-    print("   4. '더 풀기' - 추가 연습문제를 요청합니다.")
-    print("   5. '종료' - 세션을 종료합니다.")
-    print("\n사용 가능한 주제:")
-    for topic in tutor.python_topics:
-        print(f"   - {topic}")
-
-    while True:
-        user_input = await asyncio.get_event_loop().run_in_executor(None, input, "사용자: ")
-        if user_input.lower() == "종료":
-            logging.info(f"사용자 {user_id} 세션 종료")
-            print("🤖 챗봇: 학습을 종료합니다. 수고하셨습니다!")
-            break
-
-        response = await tutor.handle_user_input(user_input, user_id)
-        print(response)
-
-        if "코드를 입력해주세요" in response:
-            print("여러 줄의 코드를 입력하세요. 입력 종료는 빈 줄로 하세요.")
-            code = await read_multiline_input()
-            problem_number = await asyncio.get_event_loop().run_in_executor(None, input, "문제 번호를 입력하세요: ")
-            result = await tutor.handle_code_submission(code, problem_number, user_id)
-            print(result["message"])
-            if result.get("feedback"):
-                print(result["feedback"])
-
-
-async def read_multiline_input():
-    lines = []
-    while True:
-        line = await asyncio.get_event_loop().run_in_executor(None, input)
-        if line.strip() == "":
-            break
-        lines.append(line)
-    return "\n".join(lines)
-
-
-if __name__ == "__main__":
-    asyncio.run(start_conversation())
+import logging
+import os
+import asyncio
+import contextvars
+import json
+import uuid
+import time
+import hashlib
+from dotenv import load_dotenv
+import io
+import sys
+import py_compile
+import re
+import dataclasses
+import contextlib
+import weakref
+import threading
+import aiohttp
+from classifier import get_error_classifier, get_inference_engine
+from generation_cache import GenerationCache, get_generation_cache
+from http_pool import get_http_pool
+from answer_cache import get_answer_cache
+from write_behind import get_write_behind_queue
+from sandbox import get_sandbox_pool
+from similarity import get_similarity_engine
+from prefetch import TopicPrefetcher
+from intent_router import get_intent_router
+from log_config import setup_logging
+from tracing import current_span, get_tracer, traced
+from metrics import (
+    ACTIVE_SESSIONS, BACKEND_IN_FLIGHT, CACHE_HITS, CACHE_MISSES, INTENTS, track_gemini, track_stage,
+)
+from session_store import BoundedStore, ExerciseSetCache, UserProgress, UserSession
+
+load_dotenv()
+
+
+def load_genai():
+    """
+    google.generativeai는 임포트에 수 초가 걸리므로 모델을 처음 만들 때 불러옵니다.
+    """
+    import google.generativeai as genai
+    return genai
+
+
+# --------------------------
+# 기준 출력(reference output) 계산
+# --------------------------
+# 샌드박스 실행 방식이 바뀌어 같은 코드의 출력이 달라질 수 있으면 올려서 저장된 기준 출력을 무효화
+# 2: input()이 입력 예 전체 대신 한 줄씩 반환하도록 변경
+REFERENCE_FINGERPRINT_VERSION = 2
+
+
+def get_test_cases(exercise):
+    """
+    문제의 테스트 케이스 목록을 반환합니다. 없으면 입력 예/출력 예 한 쌍으로 만듭니다.
+    """
+    cases = exercise.get("test_cases")
+    if not cases:
+        cases = [{
+            "input": exercise.get("input_example", ""),
+            "output": exercise.get("output_example", "")
+        }]
+        exercise["test_cases"] = cases
+    return cases
+
+
+def reference_fingerprint(answer_code, inputs):
+    payload = json.dumps(
+        [REFERENCE_FINGERPRINT_VERSION, answer_code, list(inputs)], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def compute_reference_output(exercise, sandbox=None):
+    """
+    정답 코드를 테스트 케이스별 입력으로 한 번씩 실행해 기준 출력과 실행 지문을 문제 dict에 기록합니다.
+    정답 코드 실행이 실패한 케이스는 reference_output이 None, 실패 사유는 reference_error에 남깁니다.
+    """
+    sandbox = sandbox or get_sandbox_pool()
+    answer_code = exercise.get("correct_answer", "")
+    cases = get_test_cases(exercise)
+
+    async def run(case):
+        try:
+            case["reference_output"] = await sandbox.run(answer_code, case["input"])
+            case["reference_error"] = None
+        except Exception as e:
+            case["reference_output"] = None
+            case["reference_error"] = f"RestrictedPython 오류: {e}"
+
+    await asyncio.gather(*(run(case) for case in cases))
+    # 단일 기준 출력 필드는 첫 번째 케이스(입력 예/출력 예)를 그대로 유지
+    exercise["reference_output"] = cases[0]["reference_output"]
+    exercise["reference_error"] = next(
+        (case["reference_error"] for case in cases if case["reference_error"]), None
+    )
+    exercise["reference_fingerprint"] = reference_fingerprint(
+        answer_code, [case["input"] for case in cases]
+    )
+    return exercise["reference_output"]
+
+
+# --------------------------
+# ContentGenerator 클래스
+# --------------------------
+class ContentGenerator:
+    def __init__(self, cache=None, model=None):
+        self.model_name = "gemini-1.5-flash"
+        self.generation_config = {
+            "temperature": 1,
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_output_tokens": 8192,
+            "response_mime_type": "text/plain",
+        }
+        # 테스트에서는 generate_content(prompt, stream=True)를 흉내 내는 가짜 모델을 넣을 수 있음
+        # (주입하지 않으면 처음 생성할 때 Gemini 모델을 만듦)
+        self._model = model
+        self._model_lock = threading.Lock()
+        # 이론/연습문제/정답/힌트 생성 결과 캐시 (GENERATION_CACHE=0 이면 비활성화)
+        self.cache = cache if cache is not None else get_generation_cache()
+        # 연습문제 한 세트의 정답을 동시에 생성/저장할 최대 개수
+        self.answer_concurrency = int(os.getenv("ANSWER_CONCURRENCY", "4"))
+        self.streams = 0
+        self.stream_errors = 0
+        self.total_first_chunk_latency = 0.0
+        self.max_first_chunk_latency = 0.0
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    genai = load_genai()
+                    genai.configure(api_key=os.getenv("OPENAI_API_KEY"))
+                    self._model = genai.GenerativeModel(
+                        model_name=self.model_name,
+                        generation_config=self.generation_config,
+                    )
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    @property
+    def model_ready(self):
+        return self._model is not None
+
+    async def generate_content_async(self, prompt, kind="content"):
+        loop = asyncio.get_event_loop()
+        with track_gemini(kind):
+            return await loop.run_in_executor(None, self.model.generate_content, prompt)
+
+    @traced("ContentGenerator.generate_text")
+    async def generate_text(self, prompt, kind):
+        """
+        프롬프트 해시와 모델 설정을 키로 캐시를 먼저 조회하고, 없을 때만 Gemini를 호출합니다.
+        """
+        current_span().set("kind", kind)
+        if self.cache is None:
+            response = await self.generate_content_async(prompt, kind)
+            return response.text
+        key = GenerationCache.make_key(
+            kind, prompt, {"model": self.model_name, **self.generation_config}
+        )
+        cached = self.cache.get_memory(key)
+        if cached is None:
+            cached = await asyncio.to_thread(self.cache.get_disk, key)
+        current_span().set("cache_hit", cached is not None)
+        if cached is not None:
+            return cached
+        response = await self.generate_content_async(prompt, kind)
+        text = response.text
+        await asyncio.to_thread(self.cache.set, key, text, kind)
+        return text
+
+    async def stream_content_async(self, prompt):
+        """
+        generate_content(stream=True)를 작업 스레드에서 돌리고, 받은 조각을 asyncio.Queue로 넘겨
+        생성되는 대로 내보냅니다. 호출자가 중간에 멈추면 스레드도 다음 조각에서 중단합니다.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힌 경우
+                stop.set()
+
+        def produce():
+            try:
+                for chunk in self.model.generate_content(prompt, stream=True):
+                    if stop.is_set():
+                        break
+                    if chunk.text:
+                        emit(chunk.text)
+            except Exception as e:
+                emit(e)
+            finally:
+                emit(done)
+
+        start = time.perf_counter()
+        first = True
+        self.streams += 1
+        loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    self.stream_errors += 1
+                    raise item
+                if first:
+                    first = False
+                    latency = time.perf_counter() - start
+                    self.total_first_chunk_latency += latency
+                    self.max_first_chunk_latency = max(self.max_first_chunk_latency, latency)
+                yield item
+        finally:
+            stop.set()
+
+    async def stream_text(self, prompt, kind):
+        """
+        generate_text의 스트리밍 버전. 캐시에 있으면 한 번에 내보내고,
+        없으면 모델 출력을 조각 단위로 내보낸 뒤 끝까지 받은 경우에만 캐시에 저장합니다.
+        """
+        key = None
+        if self.cache is not None:
+            key = GenerationCache.make_key(
+                kind, prompt, {"model": self.model_name, **self.generation_config}
+            )
+            cached = self.cache.get_memory(key)
+            if cached is None:
+                cached = await asyncio.to_thread(self.cache.get_disk, key)
+            if cached is not None:
+                yield cached
+                return
+        parts = []
+        with track_gemini(f"{kind}_stream"):
+            async for chunk in self.stream_content_async(prompt):
+                parts.append(chunk)
+                yield chunk
+        if key is not None:
+            await asyncio.to_thread(self.cache.set, key, "".join(parts), kind)
+
+    def stream_metrics(self):
+        return {
+            "streams": self.streams,
+            "errors": self.stream_errors,
+            "avg_first_chunk_ms": (
+                self.total_first_chunk_latency / self.streams * 1000 if self.streams else 0.0
+            ),
+            "max_first_chunk_ms": self.max_first_chunk_latency * 1000,
+        }
+
+    def theory_prompt(self, topic):
+        return f"""
+        다음 파이썬 주제에 대한 이론을 설명해주세요:
+        {topic}
+
+        다음 지침을 따라주세요:
+        1. 각 개념에 대해 구체적인 예시를 포함해주세요.
+        2. 가능한 경우, 실생활에서의 응용 사례를 들어 설명해주세요.
+        3. 중요한 개념은 강조해주세요.
+        4. 코드 예제를 통해 설명하는 경우, 코드의 각 부분에 대한 설명을 추가해주세요.
+        5. 관련된 다른 주제나 개념과 연결 지어 설명해주세요.
+        6. 답변은 한국어로만 작성해주세요.
+        """
+
+    @traced("ContentGenerator.generate_theory")
+    async def generate_theory(self, topic):
+        return await self.generate_text(self.theory_prompt(topic), "theory")
+
+    async def stream_theory(self, topic):
+        async for chunk in self.stream_text(self.theory_prompt(topic), "theory"):
+            yield chunk
+
+    @traced("ContentGenerator.generate_exercises")
+    async def generate_exercises(self, topic, save=True):
+        prompt = f"""
+        다음 파이썬 주제에 대한 쉬움 난이도의 3개의 연습문제를 생성해주세요:
+        {topic}
+
+        각 문제는 이전에 생성된 문제와 중복되지 않아야 합니다.
+        각 문제는 다음 형식을 정확히 따라야 합니다:
+        문제 번호. 문제 설명 (난이도: 쉬움)
+        - 구체적인 지시사항 (여러 줄 가능)
+        입력 예:
+            (구체적인 사용자 입력 예시)
+        출력 예:
+            (예시 입력에 대한 구체적인 예상 출력)
+
+        각 문제에 대해 반드시 구체적인 입력 예와 출력 예를 제공해주세요.
+        가능하면 서로 다른 입력 예/출력 예 쌍을 2~3개 제공해주세요. 추가 쌍도 같은 형식으로
+        '입력 예:'와 '출력 예:'를 반복해서 작성하고, 입력이 여러 줄이면 input() 한 번에 한 줄씩 읽힙니다.
+        문제는 '---'로 구분해주세요.
+
+        답변은 반드시 한국어로 작성해주세요.
+        """
+        # 문제(연습문제) 생성
+        response_text = await self.generate_text(prompt, "exercises")
+        exercises = await self.parse_exercises(response_text, topic)
+        # 생성된 문제 각각에 대해 정답 코드 생성 & DB 저장을 동시에 진행
+        await self.fill_answers(topic, exercises, save)
+        return exercises
+
+    @traced("ContentGenerator.fill_answers")
+    async def fill_answers(self, topic, exercises, save=True):
+        """
+        문제별 정답 생성, 기준 출력 계산, 저장을 제한된 동시성으로 병렬 실행합니다.
+        한 문제가 실패해도 나머지 문제의 결과는 그대로 유지됩니다.
+        save=False이면 저장은 건너뛰고, 나중에 save_exercise_answers로 저장합니다.
+        """
+        semaphore = asyncio.Semaphore(self.answer_concurrency)
+
+        async def fill(exercise):
+            async with semaphore:
+                # generate_answer()에 문제 instructions, input_example, output_example까지 넘겨줌
+                exercise["correct_answer"] = await self.generate_answer(
+                    topic,
+                    exercise["question"],
+                    exercise["instructions"],
+                    exercise["input_example"],
+                    exercise["output_example"]
+                )
+                # 채점 때마다 정답 코드를 다시 실행하지 않도록 기준 출력을 미리 계산
+                await compute_reference_output(exercise)
+                if save:
+                    await self.save_exercise_answer(exercise)
+
+        results = await asyncio.gather(
+            *(fill(exercise) for exercise in exercises), return_exceptions=True
+        )
+        for exercise, result in zip(exercises, results):
+            if isinstance(result, BaseException):
+                logging.error(f"{exercise['number']}번 문제 정답 생성 실패: {result}")
+
+    async def save_exercise_answer(self, exercise):
+        try:
+            await self.save_answer_to_db(
+                exercise["question"],
+                exercise["correct_answer"],
+                exercise["number"],
+                exercise.get("reference_output"),
+                exercise.get("reference_fingerprint")
+            )
+        except Exception as e:
+            # 저장 실패가 이미 생성된 정답까지 버리지 않도록 기록만 남김
+            logging.error(f"{exercise['number']}번 문제 정답 저장 실패: {e}")
+
+    async def save_exercise_answers(self, exercises):
+        await asyncio.gather(*(
+            self.save_exercise_answer(exercise)
+            for exercise in exercises if exercise.get("correct_answer")
+        ))
+
+    async def parse_exercises(self, response_text, topic):
+        problems = re.split(r'\n\s*---\s*\n', response_text.strip())
+        exercises = []
+        for idx, problem in enumerate(problems, 1):
+            ex = self.parse_single_exercise(problem, idx, topic)
+            if ex:
+                exercises.append(ex)
+        return exercises
+
+    def parse_single_exercise(self, problem_text, idx, topic):
+        lines = [line.strip() for line in problem_text.strip().split('\n')]
+        if len(lines) < 3:
+            return None
+        question = lines[0]
+        instructions = []
+        # '입력 예'/'출력 예' 쌍이 여러 번 나오면 각각을 테스트 케이스로 사용
+        cases = []
+        current_section = "instructions"
+        for line in lines[1:]:
+            if line.startswith("입력 예"):
+                cases.append({"input": "", "output": ""})
+                current_section = "input"
+                continue
+            elif line.startswith("출력 예"):
+                if not cases:
+                    cases.append({"input": "", "output": ""})
+                current_section = "output"
+                continue
+
+            if current_section == "instructions":
+                instructions.append(line)
+            elif current_section == "input":
+                cases[-1]["input"] += line + "\n"
+            elif current_section == "output":
+                cases[-1]["output"] += line + "\n"
+
+        cases = [
+            {"input": case["input"].strip(), "output": case["output"].strip()}
+            for case in cases
+            if case["output"].strip()
+        ]
+        if not (question and instructions and cases and cases[0]["input"]):
+            return None
+        return {
+            "number": f"{idx:03d}",
+            "topic": topic,
+            "question": question,
+            "instructions": instructions,
+            "input_example": cases[0]["input"],
+            "output_example": cases[0]["output"],
+            "test_cases": cases,
+            "correct_answer": ""
+        }
+
+    @traced("ContentGenerator.generate_answer")
+    async def generate_answer(
+        self,
+        topic,
+        question,
+        instructions,
+        input_example,
+        output_example
+    ):
+        """
+        주제에 맞는 로직, 문제의 지시사항/입출력 예시를 정확히 반영하도록 프롬프트 강화
+        """
+        joined_instructions = "\n".join(instructions)
+        prompt = f"""
+        아래는 파이썬 연습문제입니다.
+
+        주제: {topic}
+        문제 설명: {question}
+
+        상세 지시사항:
+        {joined_instructions}
+
+        입력 예:
+        {input_example}
+
+        출력 예:
+        {output_example}
+
+        아래 요구사항을 반드시 충족하여 파이썬 정답 코드를 작성하세요:
+        1) 반드시 위 주제({topic})와 관련된 로직/문법을 활용할 것
+        2) 문제에서 제시한 '입력 예'와 '출력 예'에 맞춰 정확히 동작해야 함
+        3) 불필요한 추가 출력이나 주석은 넣지 말 것
+        4) 문제 지시사항을 충분히 반영할 것
+
+        코드만 작성해주세요.
+        """
+
+        return (await self.generate_text(prompt, "answer")).strip()
+
+    @traced("ContentGenerator.save_answer_to_db")
+    async def save_answer_to_db(self, question, answer_code, problem_number,
+                                reference_output=None, reference_fingerprint=None):
+        api_client = APIClient()
+        # 제출 검증 시 바로 비교할 수 있도록 정답 서명을 미리 계산
+        get_similarity_engine().set_answer(problem_number, answer_code)
+        data = {
+            "question": question,
+            "answer_code": answer_code,
+            "problem_number": problem_number,
+            "reference_output": reference_output,
+            "reference_fingerprint": reference_fingerprint
+        }
+        await api_client.queue_answer(data)
+
+    @traced("ContentGenerator.generate_hint")
+    async def generate_hint(self, question, hint_count):
+        hint_prompts = [
+            f"다음 문제에 대한 첫 번째 힌트를 생성해주세요:\n{question}\n힌트는 문제 해결의 방향을 제시해야 하지만, 직접적인 답은 주지 말고, 한국어로 작성해주세요.",
+            f"다음 문제에 대한 추가 힌트를 생성해주세요. 첫 번째 힌트와는 다른 관점에서 접근하도록 작성하되, 한국어로 작성해주세요:\n{question}",
+            f"다음 문제에 대한 고급 힌트를 생성해주세요. 문제를 해결하기 위한 구체적인 단계를 제안해주세요. 한국어로 작성해주세요:\n{question}",
+            f"다음 문제에 대한 마지막 힌트를 생성해주세요. 가능한 정답에 가까워질 수 있는 방향으로 한국어로 작성해주세요:\n{question}"
+        ]
+        prompt = hint_prompts[min(hint_count, len(hint_prompts) - 1)]
+        return (await self.generate_text(prompt, "hint")).strip()
+
+
+# --------------------------
+# CodeVerifier 클래스
+# --------------------------
+class CodeVerifier:
+    def __init__(self, api_key, inference_engine=None, sandbox=None):
+        # Gemini 모델은 의미 분석/제안 생성에 처음 쓰일 때 만듦 (gemini_model 속성)
+        self._gemini_model = None
+        self._gemini_lock = threading.Lock()
+        # 오류 분류 모델은 프로세스 전역에서 한 번만 로드해 공유하고,
+        # 동시 요청은 배치 추론 엔진이 모아서 워커 스레드에서 처리
+        self.inference_engine = inference_engine or get_inference_engine()
+        self.sandbox = sandbox or get_sandbox_pool()
+        self.api_key = api_key
+        # LLM 의미 분석 실행 조건: off(기본), mismatch(출력이 다를 때만), all(정답도 분석용으로)
+        # 분석 결과를 저장하는 save_validation_result_to_db가 아직 구현되지 않아 켜도 로그에만 남으므로 기본은 끔
+        self.semantic_analysis_mode = os.getenv("GRADING_SEMANTIC_ANALYSIS", "off")
+        # 여러 테스트 케이스 중 첫 실패에서 나머지 실행을 중단할지 여부
+        self.early_exit = os.getenv("GRADING_EARLY_EXIT", "0") == "1"
+        self._background_tasks = set()
+        self.tier_stats = {}
+
+    @property
+    def gemini_model(self):
+        if self._gemini_model is None:
+            with self._gemini_lock:
+                if self._gemini_model is None:
+                    genai = load_genai()
+                    genai.configure(api_key=self.api_key)
+                    self._gemini_model = genai.GenerativeModel('gemini-1.5-flash')
+        return self._gemini_model
+
+    @property
+    def gemini_model_ready(self):
+        return self._gemini_model is not None
+
+    def record_timings(self, timings):
+        for tier, elapsed in timings.items():
+            stats = self.tier_stats.setdefault(tier, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += elapsed
+            stats["max"] = max(stats["max"], elapsed)
+
+    def tier_metrics(self):
+        return {
+            tier: {
+                "count": stats["count"],
+                "avg_ms": stats["total"] / stats["count"] * 1000,
+                "max_ms": stats["max"] * 1000,
+            }
+            for tier, stats in self.tier_stats.items()
+        }
+
+    @traced("CodeVerifier.classify_error")
+    async def classify_error(self, user_code):
+        with track_stage("classify_error"):
+            return await self.inference_engine.classify(user_code)
+
+    async def execute_code_snippet(self, code_snippet, input_example):
+        try:
+            output = await self.execute_code(code_snippet, input_example, restricted=True)
+            return output
+        except Exception as e:
+            return f"오류 발생: {e}"
+
+    async def analyze_error(self, user_code):
+        try:
+            error_type = await self.classify_error(user_code)
+            suggestion = await self.generate_suggestion(user_code, error_type)
+            return suggestion
+        except Exception as e:
+            return f"오류 발생: {e}"
+
+    @traced("CodeVerifier.generate_suggestion")
+    async def generate_suggestion(self, user_code, error_type):
+        prompt = f"""
+        다음 파이썬 코드에서 오류 유형 '{error_type}'가 감지되었습니다.
+        코드:
+        {user_code}
+
+        아래 지침을 따르세요:
+        - 오류 원인과 수정 제안을 한국어로 작성해주세요.
+        - JSON이 아닌 일반 텍스트로만 간단히 제안해도 됩니다.
+        """
+        with track_gemini("suggestion"):
+            response = await self.gemini_model.generate_content(prompt)
+        return response.text.strip()
+
+    @traced("CodeVerifier.execute_code")
+    async def execute_code(self, code, input_example, restricted=True):
+        # RestrictedPython 실행은 시간/메모리 제한이 걸린 샌드박스 워커 프로세스에서 진행
+        try:
+            with track_stage("sandbox_execution"):
+                return await self.sandbox.run(code, input_example)
+        except Exception as e:
+            raise Exception(f"RestrictedPython 오류: {e}")
+
+    @traced("CodeVerifier.additional_validation")
+    async def additional_validation(self, user_code, correct_answer, user_output, correct_output):
+        prompt = f"""
+        다음 두 코드의 의미적 차이를 분석해주세요:
+        사용자 코드:
+        {user_code}
+        정답 코드:
+        {correct_answer}
+        사용자 출력:
+        {user_output}
+        정답 출력:
+        {correct_output}
+
+        분석 결과는 한국어로 작성해주세요.
+        """
+        with track_gemini("semantic_analysis"):
+            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+        return response.text.strip()
+
+    def schedule_semantic_analysis(self, user_code, correct_answer, user_output, correct_output):
+        """
+        LLM 의미 분석을 백그라운드에서 실행해 채점 응답을 기다리게 하지 않습니다.
+        """
+        async def run():
+            start = time.perf_counter()
+            try:
+                result = await self.additional_validation(
+                    user_code, correct_answer, user_output, correct_output
+                )
+                logging.info(f"의미 분석 결과: {result}")
+                await self.save_validation_result_to_db(
+                    user_code, correct_answer, user_output, correct_output, result
+                )
+            except Exception as e:
+                logging.error(f"의미 분석 중 오류 발생: {e}")
+            finally:
+                self.record_timings({"semantic_analysis": time.perf_counter() - start})
+
+        # 채점 응답이 끝난 뒤에도 실행되므로 요청의 트레이스에 스팬이 붙지 않도록 빈 컨텍스트에서 실행
+        task = asyncio.create_task(run(), context=contextvars.Context())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    @traced("CodeVerifier.get_reference_cases")
+    async def get_reference_cases(self, exercise):
+        """
+        기준 출력이 채워진 테스트 케이스 목록을 반환합니다. 정답 코드나 입력이 바뀌어 실행 지문이
+        맞지 않으면 다시 계산하고, 갱신된 기준 출력을 백엔드에도 반영합니다.
+        """
+        cases = get_test_cases(exercise)
+        fingerprint = reference_fingerprint(
+            exercise.get("correct_answer", ""), [case["input"] for case in cases]
+        )
+        if exercise.get("reference_fingerprint") != fingerprint:
+            if exercise.get("reference_fingerprint"):
+                logging.info(f"{exercise.get('number')}번 문제의 기준 출력이 오래되어 다시 계산합니다.")
+            await compute_reference_output(exercise, self.sandbox)
+            await APIClient().queue_answer({
+                "question": exercise.get("question"),
+                "answer_code": exercise.get("correct_answer", ""),
+                "problem_number": exercise.get("number"),
+                "reference_output": exercise["reference_output"],
+                "reference_fingerprint": exercise["reference_fingerprint"]
+            })
+        if any(case.get("reference_output") is None for case in cases):
+            raise Exception(exercise.get("reference_error") or "기준 출력을 계산할 수 없습니다.")
+        return cases
+
+    async def run_test_case(self, user_code, index, case):
+        start = time.perf_counter()
+        result = {"index": index, "passed": False, "skipped": False, "output": None, "error": None}
+        try:
+            output = await self.execute_code(user_code, case["input"], restricted=True)
+            result["output"] = output
+            result["passed"] = (
+                self.normalize_output(output) == self.normalize_output(case["reference_output"])
+            )
+        except Exception as e:
+            result["error"] = str(e)
+        result["time_ms"] = (time.perf_counter() - start) * 1000
+        return result
+
+    @traced("CodeVerifier.run_test_cases")
+    async def run_test_cases(self, user_code, cases, early_exit=None):
+        """
+        테스트 케이스를 샌드박스 워커들에서 병렬로 실행하고 케이스별 판정과 시간을 반환합니다.
+        early_exit이면 첫 실패가 나오는 즉시 남은 케이스를 취소하고 skipped로 표시합니다.
+        """
+        early_exit = self.early_exit if early_exit is None else early_exit
+        tasks = [
+            asyncio.create_task(self.run_test_case(user_code, index, case))
+            for index, case in enumerate(cases)
+        ]
+        results = [None] * len(cases)
+        if not early_exit:
+            for result in await asyncio.gather(*tasks):
+                results[result["index"]] = result
+        else:
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                failed = False
+                for task in done:
+                    result = task.result()
+                    results[result["index"]] = result
+                    failed = failed or not result["passed"]
+                if failed:
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    break
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {
+                    "index": index, "passed": False, "skipped": True,
+                    "output": None, "error": None, "time_ms": 0.0
+                }
+        return results
+
+    @traced("CodeVerifier.compare_code")
+    async def compare_code(self, user_code, correct_answer, input_example, output_example, exercise=None,
+                           timings=None, test_results=None):
+        """
+        단계별 채점: 결정적인 출력 비교가 먼저 판정하고, LLM 의미 분석은 출력이 다를 때만
+        (또는 분석용 설정일 때) 백그라운드에서 실행합니다. 단계별 소요 시간은 timings에,
+        테스트 케이스별 판정은 test_results에 기록합니다.
+        """
+        timings = {} if timings is None else timings
+        try:
+            start = time.perf_counter()
+            if exercise is not None:
+                # 문제 생성 시 미리 계산해 둔 기준 출력을 사용 (정답 코드는 다시 실행하지 않음)
+                cases = await self.get_reference_cases(exercise)
+            else:
+                correct_output = await self.execute_code(correct_answer, input_example, restricted=True)
+                cases = [{"input": input_example, "output": output_example, "reference_output": correct_output}]
+            timings["reference_output"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = await self.run_test_cases(user_code, cases)
+            timings["test_cases"] = time.perf_counter() - start
+            if test_results is not None:
+                test_results.extend(results)
+
+            failed = next((r for r in results if not r["passed"] and not r["skipped"]), None)
+            outputs_match = failed is None
+            checked = failed or results[0]
+            user_output = self.normalize_output(checked["output"] or "")
+            correct_output = self.normalize_output(cases[checked["index"]]["reference_output"])
+
+            if self.semantic_analysis_mode == "all" or (
+                self.semantic_analysis_mode == "mismatch" and not outputs_match
+            ):
+                self.schedule_semantic_analysis(user_code, correct_answer, user_output, correct_output)
+
+            if outputs_match:
+                # 예외: 단순 print('정답') 방지
+                if "print('정답')" in user_code and len(user_code.strip()) < 20:
+                    return False, "오답입니다. 단순한 출력만으로는 정답으로 처리되지 않습니다."
+                else:
+                    return True, "정답입니다."
+            if failed["error"]:
+                return False, f"오류 발생: {failed['error']}"
+            expected = cases[failed["index"]].get("output") or cases[failed["index"]]["reference_output"]
+            prefix = f"테스트 {failed['index'] + 1}/{len(cases)} 실패. " if len(cases) > 1 else ""
+            return False, f"오답입니다. {prefix}예상 출력: {expected}, 실제 출력: {user_output}"
+
+        except Exception as e:
+            logging.error(f"코드 비교 중 오류 발생: {e}")
+            return False, f"오류 발생: {e}"
+
+    def normalize_output(self, output):
+        return re.sub(r'\s+', ' ', output).strip()
+
+    def check_syntax(self, code):
+        try:
+            py_compile.compile(io.StringIO(code).read(), '<string>')
+            return True
+        except py_compile.PyCompileError:
+            return False
+
+    # 여기서 "문제" 대신 exercise['question']을 반영해 보다 직설적이 되도록 수정
+    @traced("CodeVerifier.review_error_and_suggest_correction")
+    async def review_error_and_suggest_correction(self, user_code, exercise, error_type):
+        """
+        - 문법적 오류가 없고
+        - 논리적 오류가 없고
+        - 문제에서 지시한 사항을 정확히 이행
+        - 문제에서 설명한 입력과 출력이 문제의 의도대로 동작
+        - 로직이 오류 없고, 문제에서 의도하는 로직이 잘 반영
+        - 문제에서 지시한 내용과 제공 코드가 무관하지 않아야 함
+        """
+        prompt = f"""
+        다음 Python 코드에서 오류를 검토해주세요.
+
+        문제(실제 문제 내용): {exercise['question']}
+
+        사용자 코드:
+        {user_code}
+
+        오류 유형 (MilkTeaaaaaeee 모델): {error_type}
+
+        아래 조건들을 모두 만족하는지 확인하세요:
+        1) 코드에 문법적 오류가 없는지
+        2) 논리적 오류(예: 잘못된 로직, 불필요한 로직 등)가 없는지
+        3) '{exercise['question']}'에서 지시한 사항을 정확히 이행하여 정상적으로 동작하는지
+        4) '{exercise['question']}'에서 설명한 입력과 출력이 문제의 의도대로 동작해야 함
+        5) 로직이 오류가 없더라도 '{exercise['question']}'에서 의도한 로직이 잘 반영되어야 함
+        6) '{exercise['question']}'에서 지시한 내용과 제공한 코드가 무관하지 않은지
+
+        모두 만족한다면 "수정이 필요하지 않음"만 "correction_suggestion" 값으로 넣어주세요.
+
+        아래 내용을 반드시 JSON 형태(한글)로만 응답해 주세요:
+        {{
+          "error_type": "재검토된 오류 유형",
+          "error_line": "오류가 있는 라인 표시 (예: 3)",
+          "correction_suggestion": "위 조건중 하나라도 만족하지 않으면 구체적인 수정 방안을, 모두 만족하면 '수정이 필요하지 않음' 만 넣어주세요."
+        }}
+        """
+        try:
+            with track_gemini("error_review"):
+                response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            result_text = response.text.strip()
+            if not result_text:
+                logging.error("Gemini 모델 응답이 비어 있습니다.")
+                return "오답입니다.\n오류 분석 응답이 비어 있습니다."
+            start = result_text.find("{")
+            end = result_text.rfind("}")
+            if start == -1 or end == -1:
+                logging.error("응답에 JSON 객체를 찾을 수 없습니다.")
+                return "오답입니다.\n정상적인 JSON 응답을 받지 못했습니다."
+            json_str = result_text[start:end+1]
+            try:
+                result = json.loads(json_str)
+            except Exception as e:
+                logging.exception("JSON 파싱 오류")
+                return "오답입니다.\n오류 분석 JSON 파싱 실패로, 구체적인 수정 제안을 찾을 수 없습니다."
+            error_line = result.get("error_line", "알 수 없음")
+            suggestion = result.get("correction_suggestion", "수정 제안 없음")
+            e_type = result.get("error_type", "알 수 없음")
+            return (
+                f"오류 유형: {e_type}\n"
+                f"오류 라인: {error_line}\n"
+                f"수정 제안: {suggestion}"
+            )
+        except json.JSONDecodeError as e:
+            logging.exception(f"Gemini 모델 응답 JSON 파싱 오류: {e}")
+            return "오답입니다.\n오류 분석 JSON 파싱 실패로, 구체적인 수정 제안을 찾을 수 없습니다."
+        except Exception as e:
+            logging.exception(f"Gemini 모델 오류 발생: {e}")
+            return "오답입니다.\n오류 분석 중 알 수 없는 문제가 발생했습니다."
+
+    @traced("CodeVerifier.save_validation_result_to_db")
+    async def save_validation_result_to_db(self, user_code, correct_answer, user_output, correct_output, analysis):
+        # 필요하다면 구현
+        pass
+
+
+# --------------------------
+# APIClient 클래스
+# --------------------------
+class APIClient:
+    def __init__(self, pool=None):
+        self.backend_url = os.getenv("BACKEND_URL", "http://localhost:8080")
+        self.base_url = f"{self.backend_url}/api/submit-code"
+        # 모든 호출은 프로세스 전역 keep-alive 연결 풀과 공통 재시도 정책을 사용
+        self.pool = pool or get_http_pool()
+
+    @traced("APIClient.save_submission")
+    async def save_submission(self, data):
+        try:
+            return await self.pool.request_json(
+                "POST", self.base_url, json=data, name="save_submission"
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            # 제출 코드/피드백 본문은 로그에 남기지 않음
+            logging.error(
+                f"모든 시도가 실패했습니다. 제출 저장 실패: 사용자 {data.get('user_id')}, "
+                f"문제 {data.get('problem_number')}, 코드 {len(data.get('code') or '')}자"
+            )
+            raise
+
+    @traced("APIClient.save_answer")
+    async def save_answer(self, data):
+        try:
+            result = await self.pool.request_json(
+                "POST", f"{self.backend_url}/api/save-answer", json=data, name="save_answer"
+            )
+        except aiohttp.ClientResponseError as e:
+            logging.error(f"API 요청 실패: {e}")
+            self.invalidate_answer(data)
+            return {"error": str(e)}
+        self.cache_answer(data)
+        return result
+
+    @traced("APIClient.save_submissions")
+    async def save_submissions(self, submissions):
+        return await self.pool.request_json(
+            "POST", f"{self.base_url}/batch", json=submissions, name="save_submissions"
+        )
+
+    @traced("APIClient.save_answers")
+    async def save_answers(self, answers):
+        return await self.pool.request_json(
+            "POST", f"{self.backend_url}/api/save-answer/batch", json=answers, name="save_answers"
+        )
+
+    @traced("APIClient.queue_submission")
+    async def queue_submission(self, data):
+        """
+        제출 저장을 write-behind 큐에 맡기고 바로 반환합니다. 큐를 끄면 즉시 저장합니다.
+        """
+        queue = get_write_behind_queue(APIClient)
+        if queue is None:
+            return await self.save_submission(data)
+        await queue.enqueue("submission", data)
+
+    @traced("APIClient.queue_answer")
+    async def queue_answer(self, data):
+        queue = get_write_behind_queue(APIClient)
+        if queue is None:
+            return await self.save_answer(data)
+        await queue.enqueue("answer", data)
+        # 백엔드 반영 전에 조회해도 이전 정답이 캐시되지 않도록 새 정답으로 바로 교체
+        self.cache_answer(data)
+
+    def cache_answer(self, data):
+        cache = get_answer_cache()
+        if cache is not None and data.get("problem_number") is not None:
+            cache.put(data["problem_number"], data.get("answer_code", ""))
+
+    def invalidate_answer(self, data):
+        cache = get_answer_cache()
+        if cache is not None and data.get("problem_number") is not None:
+            cache.invalidate(data["problem_number"])
+
+    @traced("APIClient.get_submissions")
+    async def get_submissions(self, user_id):
+        return await self.pool.request_json(
+            "GET", f"{self.base_url}/{user_id}", name="get_submissions"
+        )
+
+    @traced("APIClient.get_exercise_sets")
+    async def get_exercise_sets(self, user_id, after_id=0, limit=50):
+        """
+        after_id 이후에 저장된 연습문제 세트를 한 페이지 가져옵니다.
+        응답 형식: {"items": [...], "next_cursor": int, "has_more": bool}
+        """
+        return await self.pool.request_json(
+            "GET", f"{self.base_url}/{user_id}/exercise-sets?afterId={after_id}&limit={limit}",
+            name="get_exercise_sets"
+        )
+
+    @traced("APIClient.get_answer")
+    async def get_answer(self, problem_number):
+        return await self.pool.request_json(
+            "GET", f"{self.backend_url}/api/get-answer/{problem_number}", name="get_answer"
+        )
+
+
+# --------------------------
+# UserSessionManager 클래스
+# --------------------------
+class UserSessionManager:
+    def __init__(self, db_session=None):
+        self.db = db_session
+        # 오래 실행되는 서버에서 사용자 수만큼 메모리가 늘지 않도록 크기 제한 저장소 사용
+        self.sessions = BoundedStore("sessions", UserSession)
+        self.user_progress = BoundedStore("user_progress", UserProgress)
+        self.exercise_sets = BoundedStore("exercise_sets", ExerciseSetCache)
+        self.exercise_page_size = int(os.getenv("EXERCISE_SET_PAGE_SIZE", "50"))
+        self.api_client = APIClient()
+        # 같은 사용자의 요청만 순서대로 처리하고, 다른 사용자끼리는 동시에 처리되도록 사용자별 잠금 사용
+        self._user_locks = weakref.WeakValueDictionary()
+
+    async def save_exercises(self, user_id, exercises):
+        return
+
+    @traced("UserSessionManager.validate_submission")
+    async def validate_submission(self, user_id, user_code, problem_number):
+        answer_code = await self.get_answer_from_db(problem_number)
+        engine = get_similarity_engine()
+        similarity = engine.similarity_to_answer(problem_number, answer_code, user_code)
+        # 이후 제출끼리의 유사도(표절) 검사를 위해 인덱스에 추가
+        engine.index_submission(problem_number, user_id, user_code)
+        return similarity > engine.threshold
+
+    async def find_similar_submissions(self, user_id, user_code, problem_number, threshold=None):
+        """
+        같은 문제에 대한 다른 사용자의 제출 중 비슷한 코드를 (user_id, 유사도) 목록으로 반환합니다.
+        """
+        return get_similarity_engine().find_similar(
+            problem_number, user_code, threshold=threshold, exclude=user_id
+        )
+
+    @traced("UserSessionManager.get_answer_from_db")
+    async def get_answer_from_db(self, problem_number):
+        cache = get_answer_cache()
+        if cache is None:
+            return await self.fetch_latest_answer(problem_number)
+        return await cache.get(problem_number, self.fetch_latest_answer)
+
+    async def fetch_latest_answer(self, problem_number):
+        answers = await self.api_client.get_answer(problem_number)
+        if isinstance(answers, list) and answers:
+            latest_answer = max(answers, key=lambda x: x.get("createdAt", ""))
+            return latest_answer.get("answer_code", "")
+        return answers.get("answer_code", "")
+
+    def parse_exercise_sets(self, submissions):
+        results = []
+        for sub in submissions or []:
+            if sub.get('problem_number', '').startswith('EXERCISE_'):
+                try:
+                    ex = json.loads(sub['code'])
+                    results.append(ex)
+                except:
+                    pass
+        return results
+
+    @traced("UserSessionManager.load_exercises")
+    async def load_exercises(self, user_id):
+        """
+        사용자별로 캐시한 연습문제 세트에, 마지막으로 받은 제출 id 이후의 세트만 이어 받아 붙입니다.
+        페이지 조회 엔드포인트가 없는 백엔드라면 예전처럼 전체 제출 내역을 받아 옵니다.
+        """
+        cached = self.exercise_sets.get(user_id) or ExerciseSetCache()
+        try:
+            while True:
+                page = await self.api_client.get_exercise_sets(
+                    user_id, cached.cursor, self.exercise_page_size
+                )
+                items = page.get("items", [])
+                cached.exercises.extend(self.parse_exercise_sets(items))
+                cached.cursor = page.get("next_cursor", cached.cursor)
+                if not items or not page.get("has_more"):
+                    break
+        except aiohttp.ClientResponseError as e:
+            if e.status != 404:
+                raise
+            submissions = await self.api_client.get_submissions(user_id)
+            cached = ExerciseSetCache(exercises=self.parse_exercise_sets(submissions))
+        self.exercise_sets[user_id] = cached
+        return list(cached.exercises)
+
+    async def analyze_user_profile(self, user_id):
+        if user_id in self.user_progress:
+            records = [dataclasses.asdict(self.user_progress[user_id])]
+            return f"사용자 프로필 분석 결과: {records}"
+        return "프로필 데이터가 없습니다."
+
+    async def is_problem_solved(self, user_id, problem_number):
+        solved = [
+            exercise["number"]
+            for exercise in self.sessions[user_id].get("current_exercises", [])
+            if exercise.get("solved", False)
+        ]
+        return problem_number in solved
+
+    async def save_user_state(self, user_id, state):
+        if user_id not in self.user_progress:
+            self.user_progress[user_id] = UserProgress(
+                user_id=user_id,
+                current_topic=state.get('current_topic', '파이썬이란?'),
+                topic_index=state.get('topic_index', 0),
+                last_problem_number=state.get('last_problem', 0),
+                interaction_count=state.get('interaction_count', 0)
+            )
+        else:
+            self.user_progress[user_id].current_topic = state.get('current_topic', '파이썬이란?')
+            self.user_progress[user_id].topic_index = state.get('topic_index', 0)
+            self.user_progress[user_id].last_problem_number = state.get('last_problem', 0)
+            self.user_progress[user_id].interaction_count = state.get('interaction_count', 0)
+
+    async def load_user_state(self, user_id):
+        if user_id in self.user_progress:
+            progress = self.user_progress[user_id]
+            self.sessions[user_id] = UserSession(
+                current_topic=progress.current_topic,
+                topic_index=progress.topic_index,
+                last_problem=progress.last_problem_number,
+                interaction_count=progress.interaction_count,
+                current_exercises=await self.load_exercises(user_id),
+            )
+        else:
+            self.sessions[user_id] = UserSession()
+            await self.save_user_state(user_id, self.sessions[user_id])
+
+    @contextlib.asynccontextmanager
+    async def user_session(self, user_id):
+        """
+        한 요청 동안 사용자의 세션을 다룹니다.
+        시작할 때 다른 워커가 저장한 최신 상태를 읽어 오고, 끝나면 변경 사항을 백엔드에 저장합니다.
+        세션 저장소의 백엔드 입출력(읽기/저장/내보내기)은 모두 이 시작과 끝에서 워커 스레드로 처리하므로
+        요청 처리 중의 세션 조회는 메모리에서만 이루어집니다.
+        """
+        lock = self._user_locks.get(user_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._user_locks[user_id] = lock
+        async with lock:
+            await asyncio.to_thread(self._acquire, user_id)
+            if user_id not in self.sessions:
+                await self.load_user_state(user_id)
+            try:
+                yield self.sessions[user_id]
+            finally:
+                await asyncio.to_thread(self._release, user_id)
+
+    def _acquire(self, user_id):
+        acquired = []
+        try:
+            for store in (self.sessions, self.user_progress, self.exercise_sets):
+                store.acquire(user_id)
+                acquired.append(store)
+        except Exception:
+            # 일부만 고정된 채로 남지 않도록 되돌림
+            for store in acquired:
+                with contextlib.suppress(Exception):
+                    store.release(user_id)
+            raise
+
+    def _release(self, user_id):
+        # 하나가 저장에 실패해도 나머지의 저장과 고정 해제는 진행
+        error = None
+        for store in (self.sessions, self.user_progress, self.exercise_sets):
+            try:
+                store.release(user_id)
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def close(self):
+        self.sessions.close()
+        self.user_progress.close()
+        self.exercise_sets.close()
+
+    def metrics(self):
+        return {
+            "sessions": self.sessions.stats(),
+            "user_progress": self.user_progress.stats(),
+            "exercise_sets": self.exercise_sets.stats(),
+        }
+
+    async def update_user_progress(self, user_id, problem_number):
+        pass
+
+    async def update_dashboard(self, user_id):
+        state = self.sessions[user_id].get('state', {})
+        current_chapter = self.sessions[user_id].get('current_chapter', '01')
+        last_problem = self.sessions[user_id].get('last_problem', 0)
+        interaction_count = self.sessions[user_id].get('interaction_count', 0)
+        logging.debug(
+            f"사용자 {user_id}의 대시보드 업데이트: 챕터 {current_chapter}, 문제 {last_problem}, 상호작용 {interaction_count}"
+        )
+        if interaction_count % 10 == 0 and interaction_count != 0:
+            feedback = (
+                f"🤖 챗봇: {interaction_count}번의 상호작용을 완료하셨습니다! 잘 하고 계십니다.\n"
+                f"현재 {current_chapter}장을 학습 중이며, {last_problem}번 문제까지 풀어보셨습니다.\n"
+                "계속해서 열심히 학습해 주세요!"
+            )
+            return feedback
+        return ""
+
+
+# --------------------------
+# PythonTutor 클래스
+# --------------------------
+class PythonTutor:
+    def __init__(self, api_key):
+        self.logger = logging.getLogger(__name__)
+        self.content_generator = ContentGenerator()
+        self.prefetcher = TopicPrefetcher(self.content_generator)
+        self.session_manager = UserSessionManager(db_session=None)
+        self.api_client = APIClient()
+        self.verifier = None
+        self._warmup_task = None
+        self.python_topics = [
+            "파이썬이란?",
+            "파이썬의 특징",
+            "파이썬으로 무엇을 할 수 있을까?",
+            "파이썬 설치하기",
+            "파이썬 둘러보기",
+            "파이썬과 에디터",
+            "숫자형",
+            "문자열 자료형",
+            "리스트 자료형",
+            "튜플 자료형",
+            "딕셔너리 자료형",
+            "집합 자료형",
+            "불 자료형",
+            "변수",
+            "if문",
+            "while문",
+            "for문",
+            "함수",
+            "사용자 입출력",
+            "파일 읽고 쓰기",
+            "프로그램의 입출력",
+            "클래스",
+            "모듈",
+            "패키지",
+            "예외 처리",
+            "내장 함수",
+            "표준 라이브러리",
+            "외부 라이브러리"
+        ]
+        self.api_key = api_key
+        self.intent_router = get_intent_router()
+        self.register_metrics()
+
+    def register_metrics(self):
+        """
+        각 구성 요소가 이미 세고 있는 값은 /metrics 조회 시점에 읽어 오도록 연결합니다.
+        """
+        def cache_counts(field):
+            counts = {}
+            generation = self.content_generator.cache
+            if generation is not None:
+                stats = generation.stats()
+                if field == "hits":
+                    counts[("generation_memory",)] = stats["memory_hits"]
+                    counts[("generation_disk",)] = stats["disk_hits"]
+                else:
+                    counts[("generation",)] = stats["misses"]
+            answer = get_answer_cache()
+            if answer is not None:
+                stats = answer.stats()
+                counts[("answer",)] = stats["hits"] if field == "hits" else stats["misses"]
+            prefetch = self.prefetcher.metrics()
+            counts[("prefetch",)] = (
+                prefetch["hits"] + prefetch["in_flight_hits"] if field == "hits"
+                else prefetch["misses"] + prefetch["bypassed"]
+            )
+            intent = self.intent_router.stats()
+            counts[("intent_memo",)] = (
+                intent["memo_hits"] if field == "hits"
+                else intent["pattern_hits"] + intent["model_predictions"]
+            )
+            return counts
+
+        CACHE_HITS.set_function(lambda: cache_counts("hits"))
+        CACHE_MISSES.set_function(lambda: cache_counts("misses"))
+        ACTIVE_SESSIONS.set_function(lambda: len(self.session_manager.sessions))
+        BACKEND_IN_FLIGHT.set_function(lambda: get_http_pool().in_flight)
+
+    def get_verifier(self):
+        if self.verifier is None:
+            self.verifier = CodeVerifier(api_key=self.api_key)
+        return self.verifier
+
+    async def startup(self):
+        """
+        장기 실행 이벤트 루프에서 공유 자원을 준비합니다.
+        무거운 라이브러리와 모델(Gemini SDK, 의도 분류기, 오류 분류 모델)은 서버가 요청을 받기 시작한 뒤
+        백그라운드에서 불러오며, 준비 상태는 readiness()로 확인할 수 있습니다.
+        """
+        self.get_verifier()
+        await get_http_pool().get_session()
+        write_behind = get_write_behind_queue(APIClient)
+        if write_behind is not None:
+            await write_behind.start()
+        get_inference_engine().start()
+        await get_sandbox_pool().start()
+        if os.getenv("BACKGROUND_WARMUP", "1") == "1":
+            self._warmup_task = asyncio.create_task(self.warm_up())
+
+    async def warm_up(self):
+        steps = [
+            ("intent_router", self.intent_router.load),
+            ("generation_model", lambda: self.content_generator.model),
+            ("verifier_model", lambda: self.get_verifier().gemini_model),
+        ]
+        if os.getenv("CLASSIFIER_WARMUP", "1") == "1":
+            steps.append(("error_classifier", get_error_classifier().warm_up))
+        for name, step in steps:
+            try:
+                await asyncio.to_thread(step)
+            except Exception as e:
+                logging.error(f"백그라운드 준비 실패 ({name}): {e}")
+
+    def readiness(self):
+        """
+        각 구성 요소의 로드 여부를 반환합니다.
+        ready는 요청을 처리하는 데 반드시 필요한 공유 자원(HTTP 연결 풀, 샌드박스 워커)이 준비되었는지를 뜻하며,
+        나머지 모델은 아직 로드되지 않았더라도 첫 사용 시 로드됩니다.
+        """
+        write_behind = get_write_behind_queue(APIClient)
+        components = {
+            "http_pool": get_http_pool().connected,
+            "sandbox_pool": get_sandbox_pool().started,
+            "write_behind": write_behind is None or write_behind.running,
+            "inference_engine": get_inference_engine().running,
+            "intent_router": self.intent_router.is_loaded,
+            "generation_model": self.content_generator.model_ready,
+            "verifier_model": self.verifier is not None and self.verifier.gemini_model_ready,
+            "error_classifier": get_error_classifier().is_loaded,
+            "heavy_modules": {
+                name: name in sys.modules
+                for name in ("google.generativeai", "torch", "transformers", "sklearn")
+            },
+        }
+        return {
+            "ready": components["http_pool"] and components["sandbox_pool"],
+            "warming_up": self._warmup_task is not None and not self._warmup_task.done(),
+            "components": components,
+        }
+
+    async def shutdown(self):
+        if self._warmup_task is not None and not self._warmup_task.done():
+            self._warmup_task.cancel()
+        await self.prefetcher.stop()
+        await asyncio.to_thread(get_inference_engine().stop, 5)
+        await get_sandbox_pool().stop()
+        write_behind = get_write_behind_queue(APIClient)
+        if write_behind is not None:
+            await write_behind.stop()
+        await get_http_pool().close()
+        if self.content_generator.cache is not None:
+            self.content_generator.cache.close()
+        await asyncio.to_thread(self.session_manager.close)
+        get_tracer().close()
+
+    def advance_topic(self, user_id):
+        """
+        사용자의 학습 주제를 다음으로 넘기고 그 주제를 반환합니다.
+        모든 주제를 마쳤으면 None을 반환합니다.
+        """
+        session = self.session_manager.sessions[user_id]
+        session["topic_index"] = min(session["topic_index"] + 1, len(self.python_topics))
+        if session["topic_index"] >= len(self.python_topics):
+            return None
+        return self.python_topics[session["topic_index"]]
+
+    def prefetch_next_topic(self, topic):
+        """
+        topic 다음 순서의 이론과 연습문제를 백그라운드에서 미리 생성해 둡니다.
+        """
+        if topic in self.python_topics:
+            next_index = self.python_topics.index(topic) + 1
+            if next_index < len(self.python_topics):
+                self.prefetcher.schedule(self.python_topics[next_index])
+
+    async def topic_exercises(self, topic):
+        """
+        미리 생성된 연습문제 세트가 있으면 정답만 저장해 사용하고, 없으면 새로 생성합니다.
+        """
+        exercises = await self.prefetcher.take("exercises", topic)
+        if exercises is None:
+            return await self.content_generator.generate_exercises(topic)
+        await self.content_generator.save_exercise_answers(exercises)
+        return exercises
+
+    async def handle_user_profile_request(self, user_id):
+        profile_analysis = await self.session_manager.analyze_user_profile(user_id)
+        return f"🤖 챗봇: 사용자 프로필 분석 결과\n\n{profile_analysis}"
+
+    async def get_exercise(self, problem_number, user_id):
+        current_topic = self.session_manager.sessions[user_id]["current_topic"]
+        ex_list = self.session_manager.sessions[user_id]["current_exercises"]
+        for ex in ex_list:
+            if ex['number'] == problem_number and ex['topic'] == current_topic:
+                return ex
+        return None
+
+    async def handle_interactive_problem_request(self, user_input, user_id):
+        topic = self.session_manager.sessions[user_id]["current_topic"]
+        prompt = f"사용자가 '{user_input}'에 대해 더 알고 싶어합니다. 관련된 정보를 한국어로 제공해주세요."
+        response = await self.content_generator.generate_content_async(prompt, "interactive")
+        return f"🤖 챗봇: {response.text}"
+
+    @traced("PythonTutor.handle_exercise_request")
+    async def handle_exercise_request(self, user_input, user_id):
+        topic_match = re.search(r'(.*)\s*연습문제', user_input)
+        if topic_match:
+            topic = topic_match.group(1).strip()
+            exercises = await self.topic_exercises(topic)
+            self.session_manager.sessions[user_id]["current_exercises"] = exercises
+            self.session_manager.sessions[user_id]["current_topic"] = topic
+            self.session_manager.sessions[user_id]["last_problem"] = 0
+            self.prefetch_next_topic(topic)
+
+            response = "\n\n".join([
+                f"{exercise['number']}. {exercise['question']}\n" +
+                "\n".join(exercise['instructions']) + "\n" +
+                f"입력 예:\n{exercise['input_example']}\n출력 예:\n{exercise['output_example']}"
+                for exercise in exercises
+            ])
+            return response
+        else:
+            return "❌ 잘못된 입력입니다. '[주제] 연습문제' 형식으로 입력해주세요."
+
+    async def handle_code_snippet_request(self, code_snippet, user_id):
+        try:
+            verifier = self.get_verifier()
+            output = await verifier.execute_code_snippet(code_snippet, "")
+            if "오류 발생" in output:
+                suggestion = await verifier.analyze_error(code_snippet)
+                error_type = await verifier.classify_error(code_snippet)
+                feedback_message = (
+                    f"🤖 챗봇: {error_type} 오류가 발생했습니다.\n\n{output}\n\n수정 제안: {suggestion}"
+                )
+            else:
+                feedback_message = f"🤖 챗봇: 코드 스니펫 실행 결과\n\n{output}"
+            return feedback_message
+        except Exception as e:
+            return f"🤖 챗봇: 오류 발생\n\n{e}"
+
+    @traced("PythonTutor.handle_theory_request")
+    async def handle_theory_request(self, user_input, user_id):
+        return "".join([
+            chunk async for chunk in self.stream_theory_request(user_input, user_id, stream=False)
+        ])
+
+    async def theory_chunks(self, topic, stream):
+        theory_content = await self.prefetcher.take("theory", topic)
+        if theory_content is not None:
+            yield theory_content
+        elif stream:
+            async for chunk in self.content_generator.stream_theory(topic):
+                yield chunk
+        else:
+            yield await self.content_generator.generate_theory(topic)
+
+    async def stream_theory_request(self, user_input, user_id, stream=True):
+        """
+        이론 요청을 처리하며 응답을 조각 단위로 내보냅니다.
+        stream=False이면 이론 본문을 한 번에 생성합니다 (handle_theory_request에서 사용).
+        """
+        session = self.session_manager.sessions[user_id]
+        if user_input == "다음 주제":
+            topic = self.advance_topic(user_id)
+            if topic is None:
+                yield "🎉 모든 주제를 완료하셨습니다. 축하합니다!"
+                return
+            yield f"🤖 챗봇: {topic}에 대한 이론 설명입니다.\n\n"
+            async for chunk in self.theory_chunks(topic, stream):
+                yield chunk
+            session["current_topic"] = topic
+            self.prefetch_next_topic(topic)
+            yield f"\n\n'{topic} 연습문제'라고 입력하시면 문제를 제공해드립니다."
+            return
+
+        topic_match = re.search(r'(.*)\s*이론', user_input)
+        if not topic_match:
+            yield "❌ 잘못된 입력입니다. '[주제] 이론' 형식으로 입력해주세요."
+            return
+        topic = topic_match.group(1).strip()
+        if topic not in self.python_topics:
+            yield f"❌ 존재하지 않는 주제입니다: {topic}"
+            return
+        if self.python_topics.index(topic) < session["topic_index"]:
+            yield f"❌ 이미 완료한 주제입니다: {topic}"
+            return
+        yield f"🤖 챗봇: {topic}에 대한 이론 설명입니다.\n\n"
+        async for chunk in self.theory_chunks(topic, stream):
+            yield chunk
+        session["current_topic"] = topic
+        session["topic_index"] = self.python_topics.index(topic)
+        self.prefetch_next_topic(topic)
+
+    @traced("PythonTutor.handle_hint_request")
+    async def handle_hint_request(self, user_input, user_id):
+        parts = user_input.split()
+        if len(parts) < 2:
+            return "❌ 잘못된 입력입니다. '힌트 [문제번호]'를 입력해주세요. 예: '힌트 001'"
+        problem_number = parts[1]
+        exercise = await self.get_exercise(problem_number, user_id)
+        if not exercise:
+            return f"❌ 존재하지 않는 문제 번호이거나 현재 토픽과 맞지 않습니다: {problem_number}"
+        hint_count = self.session_manager.sessions[user_id].get("hint_counts", {}).get(problem_number, 0)
+        hint = await self.content_generator.generate_hint(exercise["question"], hint_count)
+        if "hint_counts" not in self.session_manager.sessions[user_id]:
+            self.session_manager.sessions[user_id]["hint_counts"] = {}
+        self.session_manager.sessions[user_id]["hint_counts"][problem_number] = hint_count + 1
+        return f"🤖 챗봇: {problem_number}번 문제 힌트:\n\n{hint}"
+
+    @traced("PythonTutor.handle_more_exercise_request")
+    async def handle_more_exercise_request(self, user_input, user_id):
+        if user_input != "더 풀기":
+            return "❌ 잘못된 입력입니다. '더 풀기'를 입력해주세요."
+        current_topic = self.session_manager.sessions[user_id]["current_topic"]
+        current_difficulty = self.session_manager.sessions[user_id].get("difficulty_level", "쉬움")
+        difficulty_levels = ["쉬움", "보통", "어려움"]
+        current_index = difficulty_levels.index(current_difficulty)
+
+        if current_index == len(difficulty_levels) - 1:
+            next_topic = self.advance_topic(user_id)
+            if next_topic is None:
+                return "🎉 모든 주제를 완료하셨습니다. 축하합니다!"
+            intro = f"🆕 새로운 주제: {next_topic}\n\n"
+            intro += "".join([chunk async for chunk in self.theory_chunks(next_topic, stream=False)])
+            new_exercises = await self.topic_exercises(next_topic)
+            self.session_manager.sessions[user_id]["last_problem"] = 0
+            self.session_manager.sessions[user_id]["current_exercises"] = new_exercises
+            self.session_manager.sessions[user_id]["current_topic"] = next_topic
+            self.session_manager.sessions[user_id]["difficulty_level"] = "쉬움"
+            self.prefetch_next_topic(next_topic)
+            return intro + "\n" + self.format_exercises(new_exercises)
+        else:
+            new_difficulty = difficulty_levels[current_index + 1]
+            self.session_manager.sessions[user_id]["difficulty_level"] = new_difficulty
+
+            # generate_exercises_with_difficulty가 있다고 가정
+            new_exercises = await self.content_generator.generate_exercises_with_difficulty(
+                current_topic, new_difficulty
+            )
+
+            self.session_manager.sessions[user_id]["last_problem"] = 0
+            self.session_manager.sessions[user_id]["current_exercises"].extend(new_exercises)
+            return f"📚 {current_topic} 추가 연습문제:\n\n" + self.format_exercises(new_exercises)
+
+    def format_exercises(self, exercises):
+        response = ""
+        for exercise in exercises:
+            response += f"{exercise['number']}. {exercise['question']}\n"
+            for instruction in exercise["instructions"]:
+                response += f"   {instruction}\n"
+            response += f"   입력 예:\n{exercise['input_example']}\n"
+            response += f"   출력 예:\n{exercise['output_example']}\n\n"
+        return response
+
+    @traced("PythonTutor.handle_code_submission", root=True)
+    async def handle_code_submission(self, code, problem_number, user_id):
+        current_span().set("problem_number", problem_number)
+        if not code.strip():
+            return {"success": False, "message": "코드를 입력해주세요."}
+
+        exercise = await self.get_exercise(problem_number, user_id)
+        if not exercise:
+            return {
+                "success": False,
+                "message": f"존재하지 않는 문제 번호이거나 현재 토픽과 맞지 않습니다: {problem_number}"
+            }
+
+        verifier = self.get_verifier()
+        timings = {}
+        test_results = []
+        try:
+            is_correct, compare_msg = await verifier.compare_code(
+                code,
+                exercise["correct_answer"],
+                exercise["input_example"],
+                exercise["output_example"],
+                exercise,
+                timings,
+                test_results
+            )
+            if is_correct:
+                exercise["solved"] = True
+                submission_data = {
+                    "user_id": user_id,
+                    "code": code,
+                    "problem_number": problem_number,
+                    "is_correct": True,
+                    "feedback": "정답"
+                }
+                await self.api_client.queue_submission(submission_data)
+                self.session_manager.sessions[user_id]["interaction_count"] += 1
+                await self.session_manager.save_user_state(user_id, self.session_manager.sessions[user_id])
+                return {
+                    "success": True,
+                    "is_correct": True,
+                    "message": "정답입니다! 다음 문제에 도전해보세요.",
+                    "feedback": await self.session_manager.update_dashboard(user_id),
+                    "test_results": test_results
+                }
+
+            start = time.perf_counter()
+            error_type = await verifier.classify_error(code)
+            timings["classify_error"] = time.perf_counter() - start
+            start = time.perf_counter()
+            suggestion = await verifier.review_error_and_suggest_correction(code, exercise, error_type)
+            timings["review_error"] = time.perf_counter() - start
+
+            submission_data = {
+                "user_id": user_id,
+                "code": code,
+                "problem_number": problem_number,
+                "is_correct": False,
+                "feedback": suggestion
+            }
+            await self.api_client.queue_submission(submission_data)
+            self.session_manager.sessions[user_id]["interaction_count"] += 1
+            await self.session_manager.save_user_state(user_id, self.session_manager.sessions[user_id])
+            return {
+                "success": True,
+                "is_correct": False,
+                "message": f"오답입니다.\n\n{suggestion}",
+                "feedback": await self.session_manager.update_dashboard(user_id),
+                "test_results": test_results
+            }
+
+        except Exception as e:
+            logging.error(f"코드 검증/저장 중 오류 발생: {str(e)}", exc_info=True)
+            return {
+                "success": False,
+                "message": f"시스템 오류: {str(e)}",
+                "feedback": "문제가 지속되면 관리자에게 문의해주세요."
+            }
+        finally:
+            verifier.record_timings(timings)
+            logging.debug(
+                "채점 단계별 시간(ms): " +
+                ", ".join(f"{tier}={elapsed * 1000:.1f}" for tier, elapsed in timings.items())
+            )
+
+    @traced("PythonTutor.intent_recognition")
+    async def intent_recognition(self, user_input):
+        with track_stage("intent_routing"):
+            intent = self.intent_router.route(user_input)
+        INTENTS.labels(intent).inc()
+        current_span().set("intent", intent)
+        return intent
+
+    async def get_intent_handler(self, intent):
+        handlers = {
+            'theory': self.handle_theory_request,
+            'exercise': self.handle_exercise_request,
+            'hint': self.handle_hint_request,
+            'more_exercises': self.handle_more_exercise_request,
+        }
+        return handlers.get(intent, self.handle_unknown_intent)
+
+    async def handle_unknown_intent(self, user_input, user_id):
+        return "죄송합니다. 이해하지 못했습니다. 다시 말씀해주세요."
+
+    @traced("PythonTutor.handle_user_input", root=True)
+    async def handle_user_input(self, user_input, user_id):
+        try:
+            if user_input.strip().lower() == "더 풀기":
+                response = await self.handle_more_exercise_request(user_input, user_id)
+            else:
+                intent = await self.intent_recognition(user_input)
+                handler = await self.get_intent_handler(intent)
+                response = await handler(user_input, user_id)
+
+            self.session_manager.sessions[user_id]["interaction_count"] += 1
+            await self.session_manager.save_user_state(user_id, self.session_manager.sessions[user_id])
+            feedback = await self.session_manager.update_dashboard(user_id)
+            if feedback:
+                response += f"\n\n{feedback}"
+            self.session_manager.sessions[user_id]["last_response"] = response
+            return response
+        except Exception as e:
+            logging.error(f"입력 처리 오류: {e}", exc_info=True)
+            return f"❌ 오류 발생: {e}"
+
+    async def stream_user_input(self, user_input, user_id):
+        """
+        handle_user_input의 스트리밍 버전. 이론 설명은 모델이 생성하는 대로 조각을 내보내고,
+        그 밖의 요청은 완성된 응답을 한 번에 내보냅니다.
+        클라이언트가 중간에 끊어도 그때까지 보낸 전체 응답은 세션의 last_response에 남깁니다.
+        """
+        parts = []
+        try:
+            if user_input.strip().lower() == "더 풀기":
+                intent = "more_exercises"
+            else:
+                intent = await self.intent_recognition(user_input)
+            if intent == "theory":
+                async for chunk in self.stream_theory_request(user_input, user_id):
+                    parts.append(chunk)
+                    yield chunk
+            else:
+                handler = await self.get_intent_handler(intent)
+                response = await handler(user_input, user_id)
+                parts.append(response)
+                yield response
+
+            self.session_manager.sessions[user_id]["interaction_count"] += 1
+            await self.session_manager.save_user_state(user_id, self.session_manager.sessions[user_id])
+            feedback = await self.session_manager.update_dashboard(user_id)
+            if feedback:
+                parts.append(f"\n\n{feedback}")
+                yield parts[-1]
+        except Exception as e:
+            logging.error(f"입력 처리 오류: {e}", exc_info=True)
+            parts.append(f"❌ 오류 발생: {e}")
+            yield parts[-1]
+        finally:
+            self.session_manager.sessions[user_id]["last_response"] = "".join(parts)
+
+    async def handle_error(self, error):
+        error_message = f"❌ 요청 처리 중 오류 발생: {str(error)}"
+        logging.error(error_message, exc_info=True)
+        return error_message
+
+
+async def start_conversation():
+    setup_logging()
+    # USER_ID 환경변수 사용 (없으면 uuid로)
+    user_id = os.getenv("USER_ID")
+    if not user_id:
+        user_id = str(uuid.uuid4())
+
+    tutor = PythonTutor(os.getenv("OPENAI_API_KEY"))
+    await tutor.startup()
+    await tutor.session_manager.load_user_state(user_id)
+    logging.info(f"새로운 사용자 세션 시작: {user_id}")
+
+    print("🤖 챗봇: 안녕하세요! 파이썬 학습 챗봇입니다. 다음과 같은 명령어를 사용할 수 있습니다:")
+    print("   1. '[주제] 이론' - 해당 주제의 이론을 제공합니다. 예: '파이썬이란? 이론'")
+    print("   2. '[주제] 연습문제' - 해당 주제의 연습문제를 제공합니다. 예: 'while문 연습문제'")
+    print("   3. '힌트 [문제번호]' - 특정 문제에 대한 힌트를 제공합니다. 예: '힌트 001'")
+    print("   4. '더 풀기' - 추가 연습문제를 요청합니다.")
+    print("   5. '종료' - 세션을 종료합니다.")
+    print("\n사용 가능한 주제:")
+    for topic in tutor.python_topics:
+        print(f"   - {topic}")
+
+    while True:
+        user_input = await asyncio.get_event_loop().run_in_executor(None, input, "사용자: ")
+        if user_input.lower() == "종료":
+            logging.info(f"사용자 {user_id} 세션 종료")
+            print("🤖 챗봇: 학습을 종료합니다. 수고하셨습니다!")
+            await tutor.shutdown()
+            break
+
+        async with tutor.session_manager.user_session(user_id):
+            response = await tutor.handle_user_input(user_input, user_id)
+        print(response)
+
+        if "코드를 입력해주세요" in response:
+            print("여러 줄의 코드를 입력하세요. 입력 종료는 빈 줄로 하세요.")
+            code = await read_multiline_input()
+            problem_number = await asyncio.get_event_loop().run_in_executor(None, input, "문제 번호를 입력하세요: ")
+            async with tutor.session_manager.user_session(user_id):
+                result = await tutor.handle_code_submission(code, problem_number, user_id)
+            print(result["message"])
+            if result.get("feedback"):
+                print(result["feedback"])
+
+
+async def read_multiline_input():
+    lines = []
+    while True:
+        line = await asyncio.get_event_loop().run_in_executor(None, input)
+        if line.strip() == "":
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    asyncio.run(start_conversation())
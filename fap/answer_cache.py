@@ -0,0 +1,132 @@
+import asyncio
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+# --------------------------
+# AnswerCache 클래스
+# --------------------------
+class AnswerCache:
+    """
+    문제 번호별 최신 정답 코드를 프로세스 안에 캐시합니다.
+    같은 문제 번호를 동시에 조회하면 백엔드 호출은 한 번만 하고 나머지는 그 결과를 기다립니다(single-flight).
+    정답을 저장하면 해당 문제 번호의 캐시를 새 값으로 바꾸고, 진행 중인 조회 결과는 버립니다.
+    그 조회를 기다리던 요청도 조회 전 값 대신 저장된 새 값을 받습니다(무효화된 경우에는 다시 조회합니다).
+    """
+
+    def __init__(self, ttl=None, max_size=None):
+        self.ttl = ttl or float(os.getenv("ANSWER_CACHE_TTL", "300"))
+        self.max_size = max_size or int(os.getenv("ANSWER_CACHE_SIZE", "2048"))
+        self._entries = OrderedDict()
+        self._inflight = {}
+        # put/invalidate로 결과를 버린 조회 (기다리던 요청이 다시 확인하도록 표시)
+        self._superseded = weakref.WeakSet()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self.load_errors = 0
+
+    def _store(self, problem_number, value):
+        self._entries[problem_number] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(problem_number)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _lookup(self, problem_number):
+        entry = self._entries.get(problem_number)
+        if entry is None:
+            return False, None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[problem_number]
+            return False, None
+        self._entries.move_to_end(problem_number)
+        return True, value
+
+    def _on_loaded(self, problem_number, task):
+        # 조회 도중 정답이 갱신(put/invalidate)되었다면 _inflight에서 이미 빠져 있으므로 저장하지 않음
+        if self._inflight.get(problem_number) is not task:
+            return
+        del self._inflight[problem_number]
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.load_errors += 1
+            return
+        self._store(problem_number, task.result())
+
+    async def get(self, problem_number, loader):
+        """
+        캐시된 정답을 반환하고, 없으면 loader(problem_number)로 불러와 캐시합니다.
+        """
+        while True:
+            found, value = self._lookup(problem_number)
+            if found:
+                self.hits += 1
+                return value
+            task = self._inflight.get(problem_number)
+            if task is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                task = asyncio.ensure_future(loader(problem_number))
+                self._inflight[problem_number] = task
+                task.add_done_callback(lambda t: self._on_loaded(problem_number, t))
+            # 기다리던 요청 하나가 취소되어도 다른 요청이 함께 기다리는 조회는 계속되도록 shield
+            value = await asyncio.shield(task)
+            if task not in self._superseded:
+                return value
+            # 기다리는 사이 정답이 저장/무효화되었으면 조회 전 값은 버리고 캐시를 다시 확인
+
+    def _supersede(self, problem_number):
+        task = self._inflight.pop(problem_number, None)
+        if task is not None:
+            self._superseded.add(task)
+
+    def put(self, problem_number, value):
+        self._supersede(problem_number)
+        self._store(problem_number, value)
+        self.invalidations += 1
+
+    def invalidate(self, problem_number):
+        self._supersede(problem_number)
+        self._entries.pop(problem_number, None)
+        self.invalidations += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_sec": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced_waits": self.coalesced,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "backend_calls_saved": self.hits + self.coalesced,
+            "in_flight": len(self._inflight),
+            "invalidations": self.invalidations,
+            "load_errors": self.load_errors,
+        }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """
+    프로세스 전역 정답 캐시를 반환합니다. ANSWER_CACHE=0 이면 None을 반환합니다.
+    """
+    global _shared_cache
+    if os.getenv("ANSWER_CACHE", "1") == "0":
+        return None
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = AnswerCache()
+    return _shared_cache
@@ -1,94 +1,223 @@
-import logging
-import os
-import asyncio
-import uuid
-from functools import wraps
-
-from flask import Flask, request, jsonify
-from flask_cors import CORS
-
-# 두 번째 버전의 PythonTutor가 정의된 ai.py를 불러옵니다.
-from ai import PythonTutor
-
-logging.basicConfig(
-    level=logging.INFO,
-    encoding='utf-8',
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("python_tutor.log", encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
-
-app = Flask(__name__)
-CORS(app)
-
-def run_async(func):
-    """
-    Flask 엔드포인트에서 비동기 함수를 호출하기 위한 헬퍼 데코레이터.
-    내부적으로 새로운 이벤트 루프를 생성하여 실행한 뒤 종료합니다.
-    """
-    @wraps(func)
-    def wrapper(*args, **kwargs):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            result = loop.run_until_complete(func(*args, **kwargs))
-        finally:
-            loop.close()
-        return result
-    return wrapper
-
-# 환경변수 OPENAI_API_KEY를 사용해 PythonTutor 인스턴스를 생성합니다.
-API_KEY = os.getenv("OPENAI_API_KEY", "")
-tutor = PythonTutor(API_KEY)
-
-@app.route("/api/chat", methods=["POST"])
-@run_async
-async def chat():
-    """
-    클라이언트로부터 메시지를 받아 챗봇 응답을 생성합니다.
-    예시 요청 JSON:
-    {
-      "message": "파이썬이란? 이론",
-      "user_id": "abc123"
-    }
-    """
-    data = request.get_json()
-    user_input = data.get("message", "")
-    user_id = data.get("user_id", str(uuid.uuid4()))
-    
-    if user_id not in tutor.session_manager.sessions:
-        await tutor.session_manager.load_user_state(user_id)
-    
-    response_text = await tutor.handle_user_input(user_input, user_id)
-    return jsonify({"response": response_text, "user_id": user_id})
-
-@app.route("/api/submit-code", methods=["POST"])
-@run_async
-async def submit_code():
-    """
-    클라이언트로부터 코드 제출을 받아 채점 및 피드백을 제공합니다.
-    예시 POST body:
-    {
-      "user_id": "abc123",
-      "problem_number": "001",
-      "code": "print('Hello, World!')"
-    }
-    """
-    data = request.get_json()
-    user_id = data.get("user_id")
-    code = data.get("code", "")
-    problem_number = data.get("problem_number", "")
-    
-    if not user_id:
-        return jsonify({"error": "user_id required"}), 400
-    
-    if user_id not in tutor.session_manager.sessions:
-        await tutor.session_manager.load_user_state(user_id)
-    
-    result = await tutor.handle_code_submission(code, problem_number, user_id)
-    return jsonify(result)
-
-if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=False)
+import os
+import asyncio
+import json
+import uuid
+
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+from quart import Quart, Response, request, jsonify
+from quart_cors import cors
+
+# 두 번째 버전의 PythonTutor가 정의된 ai.py를 불러옵니다.
+from ai import APIClient, PythonTutor
+from classifier import get_error_classifier, get_inference_engine
+from generation_cache import get_generation_cache
+from answer_cache import get_answer_cache
+from http_pool import get_http_pool
+from log_config import logging_stats, request_id_var, setup_logging
+from metrics import CONTENT_TYPE, render_metrics
+from write_behind import get_write_behind_queue
+from sandbox import get_sandbox_pool
+from similarity import get_similarity_engine
+from tracing import get_tracer, trace
+
+# 로그는 큐에 넣기만 하고 파일/콘솔 기록은 백그라운드 스레드에서 처리
+setup_logging()
+
+# Flask와 같은 API를 제공하는 ASGI 프레임워크(Quart)로 하나의 이벤트 루프에서 요청을 처리합니다.
+app = Quart(__name__)
+app = cors(app)
+
+# 환경변수 OPENAI_API_KEY를 사용해 PythonTutor 인스턴스를 생성합니다.
+API_KEY = os.getenv("OPENAI_API_KEY", "")
+tutor = PythonTutor(API_KEY)
+
+@app.before_serving
+async def startup():
+    """
+    서버가 요청을 받기 전에 HTTP 세션, 분류 모델, 캐시 등 공유 자원을 준비합니다.
+    """
+    await tutor.startup()
+
+@app.after_serving
+async def shutdown():
+    """
+    서버 종료 시 공유 자원을 정리합니다.
+    """
+    await tutor.shutdown()
+
+@app.before_request
+async def assign_request_id():
+    """
+    요청마다 ID를 정해 이 요청에서 남기는 모든 로그에 붙입니다. 클라이언트가 X-Request-ID를 보내면 그대로 씁니다.
+    """
+    request_id_var.set(request.headers.get("X-Request-ID") or uuid.uuid4().hex)
+
+@app.after_request
+async def add_request_id_header(response):
+    response.headers["X-Request-ID"] = request_id_var.get() or ""
+    return response
+
+@app.route("/api/chat", methods=["POST"])
+async def chat():
+    """
+    클라이언트로부터 메시지를 받아 챗봇 응답을 생성합니다.
+    예시 요청 JSON:
+    {
+      "message": "파이썬이란? 이론",
+      "user_id": "abc123"
+    }
+    """
+    data = await request.get_json()
+    user_input = data.get("message", "")
+    user_id = data.get("user_id", str(uuid.uuid4()))
+    
+    async with tutor.session_manager.user_session(user_id):
+        response_text = await tutor.handle_user_input(user_input, user_id)
+    return jsonify({"response": response_text, "user_id": user_id})
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.route("/api/chat/stream", methods=["POST"])
+async def chat_stream():
+    """
+    /api/chat의 스트리밍 버전 (Server-Sent Events).
+    응답 조각은 `event: message` / `data: {"delta": "..."}`로, 마지막에 `event: done`을 보냅니다.
+    요청 JSON 형식은 /api/chat과 같습니다.
+    """
+    data = await request.get_json()
+    user_input = data.get("message", "")
+    user_id = data.get("user_id", str(uuid.uuid4()))
+
+    async def events():
+        yield sse_event("start", {"user_id": user_id})
+        # 응답 본문은 핸들러가 반환된 뒤에 만들어지므로 루트 스팬도 생성기 안에서 열고 닫음
+        with trace("PythonTutor.stream_user_input", user_id=user_id):
+            async with tutor.session_manager.user_session(user_id):
+                async for chunk in tutor.stream_user_input(user_input, user_id):
+                    yield sse_event("message", {"delta": chunk})
+        yield sse_event("done", {"user_id": user_id})
+
+    response = Response(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # 긴 이론 설명도 끝까지 보낼 수 있도록 응답 시간 제한 해제
+    response.timeout = None
+    return response
+
+@app.route("/api/submit-code", methods=["POST"])
+async def submit_code():
+    """
+    클라이언트로부터 코드 제출을 받아 채점 및 피드백을 제공합니다.
+    예시 POST body:
+    {
+      "user_id": "abc123",
+      "problem_number": "001",
+      "code": "print('Hello, World!')"
+    }
+    """
+    data = await request.get_json()
+    user_id = data.get("user_id")
+    code = data.get("code", "")
+    problem_number = data.get("problem_number", "")
+    
+    if not user_id:
+        return jsonify({"error": "user_id required"}), 400
+    
+    async with tutor.session_manager.user_session(user_id):
+        result = await tutor.handle_code_submission(code, problem_number, user_id)
+    return jsonify(result)
+
+@app.route("/api/ready", methods=["GET"])
+async def ready():
+    """
+    서버가 요청을 처리할 준비가 되었는지와 구성 요소별 로드 여부를 반환합니다.
+    필수 자원이 준비되지 않았으면 503을 반환합니다.
+    """
+    status = tutor.readiness()
+    return jsonify(status), 200 if status["ready"] else 503
+
+@app.route("/debug/traces", methods=["GET"])
+async def list_traces():
+    """
+    tail sampling으로 남긴 느린/실패한 요청의 트레이스 목록을 최신순으로 반환합니다.
+    쿼리 파라미터: limit(기본 50), min_ms(최소 소요 시간), name(루트 스팬 이름)
+    """
+    tracer = get_tracer()
+    traces = tracer.recent(
+        limit=request.args.get("limit", 50, type=int),
+        min_ms=request.args.get("min_ms", 0.0, type=float),
+        name=request.args.get("name"),
+    )
+    return jsonify({"stats": tracer.stats(), "traces": traces})
+
+@app.route("/debug/traces/<trace_id>", methods=["GET"])
+async def get_trace(trace_id):
+    """
+    트레이스 하나의 전체 스팬 목록(시작 시점, 소요 시간, 부모 스팬, 오류)을 반환합니다.
+    """
+    trace = get_tracer().get(trace_id)
+    if trace is None:
+        return jsonify({"error": "트레이스를 찾을 수 없습니다."}), 404
+    return jsonify(trace)
+
+@app.route("/metrics", methods=["GET"])
+async def prometheus_metrics():
+    """
+    단계별 지연 시간 히스토그램, 캐시 적중/재시도/오류 카운터, 활성 세션 게이지를 Prometheus 텍스트 형식으로 반환합니다.
+    """
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
+
+def collect_stats():
+    """
+    세션 저장소를 뺀 구성 요소별 상세 통계를 모읍니다.
+    """
+    classifier = get_error_classifier().metrics()
+    classifier["batching"] = get_inference_engine().metrics()
+    generation_cache = get_generation_cache()
+    answer_cache = get_answer_cache()
+    write_behind = get_write_behind_queue(APIClient)
+    return {
+        "classifier": classifier,
+        "generation_cache": {"enabled": False} if generation_cache is None
+        else {"enabled": True, **generation_cache.stats()},
+        "answer_cache": {"enabled": False} if answer_cache is None
+        else {"enabled": True, **answer_cache.stats()},
+        "http": get_http_pool().metrics(),
+        "write_behind": {"enabled": False} if write_behind is None
+        else {"enabled": True, **write_behind.metrics()},
+        "sandbox": get_sandbox_pool().metrics(),
+        "grading": tutor.get_verifier().tier_metrics(),
+        "similarity": get_similarity_engine().stats(),
+        "prefetch": tutor.prefetcher.metrics(),
+        "stream": tutor.content_generator.stream_metrics(),
+        "intent": tutor.intent_router.stats(),
+        "logging": logging_stats(),
+        "tracing": get_tracer().stats(),
+    }
+
+@app.route("/debug/stats", methods=["GET"])
+async def debug_stats():
+    """
+    /metrics에 없는 구성 요소별 상세 통계(캐시, 연결 풀, write-behind 큐, 샌드박스, 채점 단계, 프리페치,
+    스트리밍, 의도 판별, 세션 저장소, 로그 큐 등)를 한 번에 JSON으로 반환합니다.
+    ?component=이름 으로 하나만 조회할 수 있습니다.
+    """
+    stats = collect_stats()
+    # 세션 저장소의 메모리 추정은 상주 레코드를 모두 훑으므로 작업 스레드에서 계산
+    stats["sessions"] = await asyncio.to_thread(tutor.session_manager.metrics)
+    component = request.args.get("component")
+    if component is not None:
+        if component not in stats:
+            return jsonify({"error": f"알 수 없는 구성 요소입니다: {component}"}), 404
+        return jsonify(stats[component])
+    return jsonify(stats)
+
+if __name__ == "__main__":
+    # 운영 환경에서는 `hypercorn app:app --bind 0.0.0.0:5000` 으로 실행해도 됩니다.
+    config = Config()
+    config.bind = [os.getenv("BIND", "0.0.0.0:5000")]
+    asyncio.run(serve(app, config))
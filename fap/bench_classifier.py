@@ -0,0 +1,172 @@
+"""
+오류 분류기 백엔드 벤치마크.
+
+각 백엔드(torch, quantized, onnx)를 별도 프로세스에서 실행해 로드 시간,
+지연 시간(p50/p95), 처리량, RSS를 측정하고 torch 백엔드와의 라벨 일치율을 비교합니다.
+
+사용 예:
+    python bench_classifier.py
+    python bench_classifier.py --backends torch onnx --batch-size 8 --rounds 5
+    python bench_classifier.py --corpus submissions.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+SAMPLE_SUBMISSIONS = [
+    "print('Hello, World!')",
+    "name = input()\nprint('안녕하세요, ' + name)",
+    "a, b = map(int, input().split())\nprint(a + b)",
+    "numbers = [1, 2, 3, 4, 5]\nprint(sum(numbers) / len(numbers))",
+    "for i in range(1, 10):\n    print(f'2 x {i} = {2 * i}')",
+    "n = int(input())\nif n % 2 == 0:\n    print('짝수')\nelse:\n    print('홀수')",
+    "def add(a, b):\n    return a + b\nprint(add(3, 4)",
+    "while True\n    print('loop')",
+    "x = [1, 2, 3]\nprint(x[3])",
+    "d = {'a': 1}\nprint(d['b'])",
+    "print(undefined_variable)",
+    "s = '123'\nprint(s + 1)",
+    "class Dog:\n    def __init__(self, name):\n        self.name = name\n    def bark(self):\n        print(self.name + ' 멍멍')\nDog('바둑이').bark()",
+    "t = (1, 2, 3)\nt[0] = 10\nprint(t)",
+    "words = input().split()\nprint(len(set(words)))",
+    "total = 0\nfor i in range(1, 101):\n    total += i\nprint(total)",
+    "def fact(n):\n    if n == 0:\n        return 1\n    return n * fact(n - 1)\nprint(fact(5))",
+    "num = int('abc')\nprint(num)",
+    "import math\nprint(math.sqrt(16))",
+    "lst = [3, 1, 2]\nlst.sort()\nprint(lst)",
+    "if x = 3:\n    print(x)",
+    "print(10 / 0)",
+    "text = 'python'\nprint(text.upper())",
+    "items = {'apple': 3, 'banana': 5}\nfor k, v in items.items():\n    print(k, v)",
+]
+
+
+def load_corpus(path):
+    if not path:
+        return SAMPLE_SUBMISSIONS
+    if os.path.isdir(path):
+        corpus = []
+        for name in sorted(os.listdir(path)):
+            if name.endswith(".py"):
+                with open(os.path.join(path, name), encoding="utf-8") as f:
+                    corpus.append(f.read())
+        return corpus
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    # 문자열 리스트 또는 {"code": ...} 형태의 제출 기록 리스트를 모두 허용
+    return [item["code"] if isinstance(item, dict) else item for item in data]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_worker(args):
+    from classifier import ErrorClassifier, current_rss_bytes
+
+    corpus = load_corpus(args.corpus)
+    classifier = ErrorClassifier(backend=args.worker)
+    classifier.load()
+    classifier.classify(corpus[0])
+
+    labels = [classifier.classify(code) for code in corpus]
+
+    single_latencies = []
+    for _ in range(args.rounds):
+        for code in corpus:
+            start = time.perf_counter()
+            classifier.classify(code)
+            single_latencies.append(time.perf_counter() - start)
+
+    batches = [corpus[i:i + args.batch_size] for i in range(0, len(corpus), args.batch_size)]
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for batch in batches:
+            classifier.classify_batch(batch)
+    batch_elapsed = time.perf_counter() - start
+
+    result = {
+        "backend": args.worker,
+        "load_time_sec": classifier.load_time,
+        "rss_bytes": current_rss_bytes(),
+        "model_bytes": classifier.model_bytes(),
+        "p50_ms": percentile(single_latencies, 50) * 1000,
+        "p95_ms": percentile(single_latencies, 95) * 1000,
+        "single_throughput": len(single_latencies) / sum(single_latencies),
+        "batch_throughput": len(corpus) * args.rounds / batch_elapsed,
+        "labels": labels,
+    }
+    print(json.dumps(result))
+
+
+def run_backend(backend, args):
+    cmd = [
+        sys.executable, os.path.abspath(__file__),
+        "--worker", backend,
+        "--rounds", str(args.rounds),
+        "--batch-size", str(args.batch_size),
+    ]
+    if args.corpus:
+        cmd += ["--corpus", args.corpus]
+    proc = subprocess.run(
+        cmd, capture_output=True, text=True, encoding="utf-8",
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if proc.returncode != 0:
+        print(f"[{backend}] 실행 실패:\n{proc.stderr}", file=sys.stderr)
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오류 분류기 백엔드 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=["torch", "quantized", "onnx"])
+    parser.add_argument("--corpus", help="제출 코드 JSON 파일 또는 .py 파일 디렉터리")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    backends = list(args.backends)
+    if "torch" not in backends:
+        backends.insert(0, "torch")
+    results = {}
+    for backend in backends:
+        result = run_backend(backend, args)
+        if result:
+            results[backend] = result
+
+    baseline = results.get("torch")
+    header = (
+        f"{'backend':<10} {'load(s)':>8} {'p50(ms)':>8} {'p95(ms)':>8} "
+        f"{'1건/s':>8} {'배치/s':>8} {'RSS(MB)':>8} {'모델(MB)':>9} {'일치율':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for backend, r in results.items():
+        agreement = "-"
+        if baseline:
+            same = sum(a == b for a, b in zip(r["labels"], baseline["labels"]))
+            agreement = f"{same / len(baseline['labels']) * 100:.1f}%"
+        rss_mb = r["rss_bytes"] / 2**20 if r["rss_bytes"] else float("nan")
+        print(
+            f"{backend:<10} {r['load_time_sec']:>8.2f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+            f"{r['single_throughput']:>8.1f} {r['batch_throughput']:>8.1f} "
+            f"{rss_mb:>8.1f} {r['model_bytes'] / 2**20:>9.1f} {agreement:>7}"
+        )
+    if baseline:
+        print(f"\n코퍼스 크기: {len(baseline['labels'])}, 반복: {args.rounds}, "
+              f"배치 크기: {args.batch_size}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+서버 모듈 임포트 시간 측정 (`python -X importtime`).
+
+새 인터프리터에서 대상 모듈을 여러 번 임포트해 누적 임포트 시간의 중앙값을 구하고,
+가장 오래 걸린 모듈과 함께 출력합니다. 중앙값이 예산(--budget-ms)을 넘거나
+임포트 시점에 불러오면 안 되는 무거운 모듈(torch, transformers 등)이 로드되면 종료 코드 1을 반환합니다.
+
+사용 예:
+    python bench_import.py
+    python bench_import.py --module ai --budget-ms 800 --runs 5
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+FAP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FORBIDDEN = ["torch", "transformers", "sklearn", "pandas", "google.generativeai"]
+IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module):
+    """
+    한 번 임포트하고 {모듈 이름: (self_us, cumulative_us)}를 반환합니다.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=FAP_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} 임포트 실패:\n{result.stderr[-2000:]}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            timings[name] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임포트 시간 측정")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "1500")))
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN)
+    args = parser.parse_args()
+
+    # 첫 실행은 .pyc 생성 비용이 섞이므로 버림
+    measure(args.module)
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals = [run[args.module][1] / 1000 for run in runs if args.module in run]
+    median_ms = statistics.median(totals)
+    last = runs[-1]
+
+    print(f"{args.module} 임포트 {args.runs}회: 중앙값 {median_ms:.1f}ms "
+          f"(최소 {min(totals):.1f} / 최대 {max(totals):.1f}), 예산 {args.budget_ms:.0f}ms")
+    print(f"\n누적 시간 상위 {args.top}개 모듈:")
+    slowest = sorted(last.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {cumulative_us / 1000:9.1f}ms  (self {self_us / 1000:7.1f}ms)  {name}")
+
+    failed = False
+    loaded = [name for name in args.forbid if name in last]
+    if loaded:
+        failed = True
+        print(f"\n실패: 임포트 시점에 무거운 모듈이 로드되었습니다: {', '.join(loaded)}")
+    if median_ms > args.budget_ms:
+        failed = True
+        print(f"\n실패: 임포트 시간 {median_ms:.1f}ms가 예산 {args.budget_ms:.0f}ms를 넘었습니다.")
+    if not failed:
+        print("\n통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
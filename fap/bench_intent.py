@@ -0,0 +1,109 @@
+"""
+의도 판별 지연 시간 측정.
+
+메시지 한 건당 평균 시간을 다음 경로별로 출력합니다.
+  - 저장된 분류 모델 파일 로드 (첫 실행이면 학습 후 저장)
+  - 메모 없이 한 건씩 판별 (규칙 + 모델)
+  - 메모에 있는 메시지 판별
+  - route_batch로 한 번에 판별
+scikit-learn이 설치되어 있으면 기존 TfidfVectorizer + MultinomialNB 파이프라인과 판별 결과가 같은지도 확인합니다.
+
+사용 예:
+    python bench_intent.py
+    python bench_intent.py --messages 5000 --artifact /tmp/intent_router.json
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from intent_router import TRAINING_DATA, IntentModel, IntentRouter
+
+SAMPLE_MESSAGES = [
+    "더 풀기", "힌트 001", "힌트 002", "변수 이론", "리스트 연습문제", "정답이 뭐야",
+    "답 알려줘", "문제 좀 더 내줘", "반복문 설명해줘", "추가 문제 주세요", "001번 정답 알려줘",
+    "함수 이론 알려줘", "조건문 연습문제 풀래", "다음 문제", "딕셔너리 자료형에 대해 알려줘",
+]
+
+
+def make_messages(count, seed):
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(SAMPLE_MESSAGES)} {i}" if rng.random() < 0.5 else rng.choice(SAMPLE_MESSAGES)
+        for i in range(count)
+    ]
+
+
+def per_message_us(elapsed, count):
+    return elapsed / count * 1_000_000
+
+
+def compare_with_sklearn(messages):
+    try:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.pipeline import make_pipeline
+    except ImportError:
+        print("scikit-learn이 없어 기존 분류기와의 비교는 건너뜁니다.")
+        return
+    pipeline = make_pipeline(TfidfVectorizer(), MultinomialNB())
+    pipeline.fit([text for text, _ in TRAINING_DATA], [label for _, label in TRAINING_DATA])
+    expected = list(pipeline.predict(messages))
+    actual = IntentModel.fit(TRAINING_DATA).predict(messages)
+    agree = sum(1 for a, b in zip(expected, actual) if a == b)
+    print(f"scikit-learn 파이프라인과 일치: {agree}/{len(messages)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의도 판별 지연 시간 측정")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--artifact", default=None)
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages, args.seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        artifact = args.artifact or os.path.join(tmp_dir, "intent_router.json")
+
+        router = IntentRouter(artifact_path=artifact)
+        router.load()
+        first = "학습 후 저장" if router.trained else "파일 로드"
+        print(f"첫 로드 ({first}): {router.load_time * 1000:.2f}ms")
+
+        router = IntentRouter(artifact_path=artifact)
+        router.load()
+        print(f"저장된 모델 로드: {router.load_time * 1000:.2f}ms")
+
+        # 메모 크기를 1로 두어 매번 규칙/모델을 거치게 함
+        uncached = IntentRouter(artifact_path=artifact, memo_size=1)
+        uncached.load()
+        start = time.perf_counter()
+        for message in messages:
+            uncached._memo.clear()
+            uncached.route(message)
+        print(f"메모 없이 한 건씩: {per_message_us(time.perf_counter() - start, len(messages)):.1f}us/건 "
+              f"(규칙 {uncached.pattern_hits}, 모델 {uncached.model_predictions})")
+
+        start = time.perf_counter()
+        for message in messages:
+            router.route(message)
+        print(f"메모 채우며 한 건씩: {per_message_us(time.perf_counter() - start, len(messages)):.1f}us/건")
+
+        start = time.perf_counter()
+        for message in messages:
+            router.route(message)
+        print(f"메모 적중: {per_message_us(time.perf_counter() - start, len(messages)):.1f}us/건")
+
+        batch_router = IntentRouter(artifact_path=artifact, memo_size=1)
+        batch_router.load()
+        start = time.perf_counter()
+        batch_router.route_batch(messages)
+        print(f"route_batch {len(messages)}건: "
+              f"{per_message_us(time.perf_counter() - start, len(messages)):.1f}us/건")
+
+    compare_with_sklearn(messages)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+/api/chat 부하 테스트.
+
+지정한 동시성으로 일정 시간 동안 요청을 보내 초당 요청 수(RPS)와 지연 시간 분포를 측정합니다.
+기본 메시지('힌트')는 LLM을 호출하지 않는 경로라 서버 자체의 처리 능력을 비교하기에 적합합니다.
+
+전/후 비교 예:
+    # 1) 이전 버전(요청마다 이벤트 루프를 새로 만드는 Flask 서버)을 띄운 뒤
+    python bench_load.py --label before
+    # 2) 현재 버전(ASGI, 단일 이벤트 루프)을 `hypercorn app:app --bind 0.0.0.0:5000`으로 띄운 뒤
+    python bench_load.py --label after
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def worker(session, url, payload, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            async with session.post(url, json=payload) as resp:
+                await resp.read()
+                if resp.status >= 400:
+                    errors.append(resp.status)
+                    continue
+        except aiohttp.ClientError as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    url = args.url.rstrip("/") + "/api/chat"
+    latencies = []
+    errors = []
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        # 사용자 세션을 미리 만들어 두어 첫 요청의 세션 로드 비용이 측정에 섞이지 않게 함
+        for i in range(args.concurrency):
+            async with session.post(url, json={"message": args.message, "user_id": f"load-{i}"}) as resp:
+                await resp.read()
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            worker(
+                session, url,
+                {"message": args.message, "user_id": f"load-{i}"},
+                deadline, latencies, errors,
+            )
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    label = f"[{args.label}] " if args.label else ""
+    print(f"{label}동시성 {args.concurrency}, {elapsed:.1f}초")
+    print(f"  성공 {len(latencies)}건, 실패 {len(errors)}건")
+    print(f"  RPS: {len(latencies) / elapsed:.1f}")
+    print(
+        f"  지연(ms) p50 {percentile(latencies, 50) * 1000:.1f} / "
+        f"p95 {percentile(latencies, 95) * 1000:.1f} / "
+        f"p99 {percentile(latencies, 99) * 1000:.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/chat 부하 테스트")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--message", default="힌트")
+    parser.add_argument("--label", default="")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
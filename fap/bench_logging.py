@@ -0,0 +1,120 @@
+"""
+로그 기록 방식에 따른 요청 지연 시간 비교.
+
+느린 디스크를 흉내 내기 위해 기록/flush마다 --write-delay-ms만큼 멈추는 파일에 로그를 쓰면서,
+이벤트 루프에서 동시에 처리되는 가짜 요청(로그 몇 줄 + 짧은 비동기 대기)의 지연 시간을 잽니다.
+  - sync : 기존 basicConfig처럼 이벤트 루프 스레드에서 바로 파일에 기록
+  - queue: log_config의 큐 핸들러 + 백그라운드 기록 스레드
+두 방식의 p50/p99/최대 지연 시간을 출력합니다.
+
+사용 예:
+    python bench_logging.py
+    python bench_logging.py --requests 500 --concurrency 50 --write-delay-ms 5
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from log_config import JsonFormatter, TEXT_FORMAT, create_queue_logging, request_id_var
+
+
+class SlowFile:
+    """
+    write/flush마다 delay초 멈추는 파일.
+    """
+
+    def __init__(self, path, delay):
+        self.file = open(path, "a", encoding="utf-8")
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return self.file.write(text)
+
+    def flush(self):
+        time.sleep(self.delay)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+async def fake_request(logger, index, lines, work):
+    request_id_var.set(f"bench-{index}")
+    start = time.perf_counter()
+    for line in range(lines):
+        logger.info(f"요청 {index} 처리 단계 {line}: 사용자 입력을 처리했습니다.")
+        await asyncio.sleep(work)
+    return time.perf_counter() - start
+
+
+async def run_requests(logger, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one(index):
+        async with semaphore:
+            return await fake_request(logger, index, args.lines, args.work_ms / 1000)
+
+    return await asyncio.gather(*(one(i) for i in range(args.requests)))
+
+
+def percentile(values, ratio):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def report(name, latencies, elapsed):
+    ms = [latency * 1000 for latency in latencies]
+    print(f"{name:6s} p50 {statistics.median(ms):8.1f}ms  p99 {percentile(ms, 0.99):8.1f}ms  "
+          f"최대 {max(ms):8.1f}ms  (전체 {elapsed:.2f}s)")
+
+
+def run_mode(mode, path, args):
+    logger = logging.getLogger(f"bench_logging.{mode}")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.StreamHandler(SlowFile(path, args.write_delay_ms / 1000))
+    listener = None
+    if mode == "sync":
+        handler.setFormatter(logging.Formatter(TEXT_FORMAT.replace(" [%(request_id)s]", "")))
+        logger.addHandler(handler)
+    else:
+        handler.setFormatter(JsonFormatter())
+        queue_handler, listener = create_queue_logging([handler])
+        logger.addHandler(queue_handler)
+        listener.start()
+
+    start = time.perf_counter()
+    latencies = asyncio.run(run_requests(logger, args))
+    elapsed = time.perf_counter() - start
+    if listener is not None:
+        # 큐에 남은 기록이 끝날 때까지 기다림 (요청 지연 시간에는 포함되지 않음)
+        listener.stop()
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+    handler.stream.close()
+    report(mode, latencies, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로그 기록 방식별 요청 지연 시간 비교")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=4, help="요청 하나가 남기는 로그 줄 수")
+    parser.add_argument("--work-ms", type=float, default=2, help="로그 사이의 비동기 대기 시간")
+    parser.add_argument("--write-delay-ms", type=float, default=2)
+    args = parser.parse_args()
+
+    print(f"요청 {args.requests}개, 동시 {args.concurrency}, 요청당 로그 {args.lines}줄, "
+          f"기록 지연 {args.write_delay_ms}ms")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for mode in ("sync", "queue"):
+            run_mode(mode, os.path.join(tmp_dir, f"{mode}.log"), args)
+
+
+if __name__ == "__main__":
+    main()
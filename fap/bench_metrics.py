@@ -0,0 +1,99 @@
+"""
+지표 기록 비용 측정.
+
+빈 루프와 비교해 호출 한 번당 추가되는 시간을 출력합니다.
+  - Counter.labels(...).inc()
+  - Histogram.labels(...).observe()
+  - track_stage(...) with 블록 (핫패스에서 실제로 쓰는 형태)
+  - 가장 짧은 계측 구간인 의도 판별(메모 적중)에 track_stage를 씌웠을 때의 증가율
+  - /metrics 출력 한 번
+가장 비싼 핫패스 기록이 예산(--budget-us)을 넘으면 종료 코드 1을 반환합니다.
+
+사용 예:
+    python bench_metrics.py
+    python bench_metrics.py --iterations 500000 --budget-us 1
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from intent_router import IntentRouter
+from metrics import Registry, render_metrics, track_stage
+
+
+def per_call_ns(function, iterations):
+    start = time.perf_counter()
+    function(iterations)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def baseline(iterations):
+    for _ in range(iterations):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지표 기록 비용 측정")
+    parser.add_argument("--iterations", type=int, default=200000)
+    parser.add_argument("--budget-us", type=float, default=float(os.getenv("METRICS_BUDGET_US", "5")))
+    args = parser.parse_args()
+
+    registry = Registry()
+    counter = registry.counter("bench_total", "bench", ["stage"])
+    histogram = registry.histogram("bench_seconds", "bench", ["stage"])
+
+    def counter_inc(n):
+        for _ in range(n):
+            counter.labels("intent_routing").inc()
+
+    def histogram_observe(n):
+        for _ in range(n):
+            histogram.labels("intent_routing").observe(0.0012)
+
+    def stage_timer(n):
+        for _ in range(n):
+            with track_stage("bench"):
+                pass
+
+    base = per_call_ns(baseline, args.iterations)
+    results = {
+        "Counter.inc": per_call_ns(counter_inc, args.iterations) - base,
+        "Histogram.observe": per_call_ns(histogram_observe, args.iterations) - base,
+        "track_stage": per_call_ns(stage_timer, args.iterations) - base,
+    }
+    for name, ns in results.items():
+        print(f"{name:18s} {ns:8.0f}ns/회")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        router = IntentRouter(artifact_path=os.path.join(tmp_dir, "intent_router.json"))
+        router.route("더 풀기")
+
+        def plain_route(n):
+            for _ in range(n):
+                router.route("더 풀기")
+
+        def tracked_route(n):
+            for _ in range(n):
+                with track_stage("bench"):
+                    router.route("더 풀기")
+
+        plain = per_call_ns(plain_route, args.iterations) - base
+        tracked = per_call_ns(tracked_route, args.iterations) - base
+    print(f"의도 판별(메모 적중) {plain:.0f}ns → 계측 포함 {tracked:.0f}ns "
+          f"(+{(tracked - plain) / plain * 100:.0f}%)")
+
+    start = time.perf_counter()
+    text = render_metrics()
+    print(f"/metrics 출력: {(time.perf_counter() - start) * 1000:.2f}ms ({len(text)} bytes)")
+
+    worst_us = max(results.values()) / 1000
+    if worst_us > args.budget_us:
+        print(f"\n실패: 핫패스 기록 비용 {worst_us:.2f}us가 예산 {args.budget_us:.2f}us를 넘었습니다.")
+        sys.exit(1)
+    print("\n통과")
+
+
+if __name__ == "__main__":
+    main()
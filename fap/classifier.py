@@ -0,0 +1,456 @@
+import asyncio
+import inspect
+import logging
+import os
+import queue
+import threading
+import time
+
+ERROR_MODEL_NAME = "MilkTeaaaaaeee/1235657"
+# 내보내기 방식이 바뀌면 올려서 예전 방식으로 만든 .onnx 파일을 다시 쓰지 않도록 함
+ONNX_EXPORT_VERSION = 2
+
+
+def current_rss_bytes():
+    """
+    현재 프로세스의 RSS(바이트)를 반환합니다. 측정할 수 없으면 None.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+# --------------------------
+# 추론 백엔드
+# --------------------------
+class TorchBackend:
+    """
+    원본 full-precision PyTorch 모델로 추론하는 기본 백엔드.
+    """
+    name = "torch"
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self.model = None
+        self.tokenizer = None
+        self.id2label = None
+
+    def load(self):
+        # torch/transformers는 임포트 비용이 커서 모델을 실제로 로드할 때 불러옴
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            self.model_name, use_auth_token=True
+        )
+        model = AutoModelForSequenceClassification.from_pretrained(
+            self.model_name, use_auth_token=True
+        )
+        model.eval()
+        self.id2label = model.config.id2label
+        self.model = self.prepare_model(model)
+
+    def prepare_model(self, model):
+        return model
+
+    def predict(self, codes):
+        import torch
+
+        inputs = self.tokenizer(list(codes), return_tensors="pt", truncation=True, padding=True)
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+        return torch.argmax(outputs.logits, dim=1).tolist()
+
+    def model_bytes(self):
+        if self.model is None:
+            return 0
+        import torch
+
+        total = sum(p.numel() * p.element_size() for p in self.model.parameters())
+        # 동적 양자화된 Linear 가중치는 parameters()에 잡히지 않으므로 state_dict로 보정
+        for value in self.model.state_dict().values():
+            if isinstance(value, torch.Tensor) and value.is_quantized:
+                total += value.numel() * value.element_size()
+        return total
+
+
+class QuantizedTorchBackend(TorchBackend):
+    """
+    Linear 계층을 int8로 동적 양자화한 PyTorch 백엔드.
+    """
+    name = "quantized"
+
+    def prepare_model(self, model):
+        import torch
+
+        return torch.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+class OnnxBackend:
+    """
+    ONNX로 내보낸 모델을 onnxruntime으로 실행하는 백엔드.
+    내보낸 파일이 없으면 처음 로드할 때 PyTorch 모델에서 한 번 생성합니다.
+    """
+    name = "onnx"
+
+    def __init__(self, model_name, onnx_path=None):
+        self.model_name = model_name
+        default_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            "models",
+            f"{model_name.replace('/', '__')}.v{ONNX_EXPORT_VERSION}.onnx",
+        )
+        self.onnx_path = onnx_path or os.getenv("CLASSIFIER_ONNX_PATH", default_path)
+        self.tokenizer = None
+        self.session = None
+        self.input_names = None
+        self.id2label = None
+
+    def export(self):
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        model = AutoModelForSequenceClassification.from_pretrained(
+            self.model_name, use_auth_token=True
+        )
+        model.eval()
+        sample = self.tokenizer(
+            ["print('hello')", "for i in range(3):\n    print(i)"],
+            return_tensors="pt", truncation=True, padding=True
+        )
+        # 그래프 입력은 forward 시그니처 순서로 만들어지므로 이름도 같은 순서로 맞추고,
+        # 값은 키워드 인자로 넘겨 attention_mask/token_type_ids가 서로 바뀌어 묶이지 않도록 함
+        forward_params = inspect.signature(model.forward).parameters
+        input_names = [name for name in forward_params if name in sample]
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+        os.makedirs(os.path.dirname(self.onnx_path), exist_ok=True)
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                ({name: sample[name] for name in input_names},),
+                self.onnx_path,
+                input_names=input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14,
+            )
+        logging.info(f"오류 분류 모델 ONNX 내보내기 완료: {self.onnx_path}")
+        return model.config.id2label
+
+    def load(self):
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(
+            self.model_name, use_auth_token=True
+        )
+        if not os.path.exists(self.onnx_path):
+            self.export()
+        self.id2label = AutoConfig.from_pretrained(
+            self.model_name, use_auth_token=True
+        ).id2label
+        options = ort.SessionOptions()
+        threads = int(os.getenv("CLASSIFIER_ORT_THREADS", "0"))
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            self.onnx_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def predict(self, codes):
+        inputs = self.tokenizer(list(codes), return_tensors="np", truncation=True, padding=True)
+        feed = {name: inputs[name].astype("int64") for name in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        return logits.argmax(axis=1).tolist()
+
+    def model_bytes(self):
+        if self.session is None:
+            return 0
+        return os.path.getsize(self.onnx_path)
+
+
+CLASSIFIER_BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    QuantizedTorchBackend.name: QuantizedTorchBackend,
+    OnnxBackend.name: OnnxBackend,
+}
+
+
+def create_backend(name, model_name=ERROR_MODEL_NAME):
+    try:
+        backend_cls = CLASSIFIER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(
+            f"지원하지 않는 분류기 백엔드입니다: {name} "
+            f"(가능한 값: {', '.join(CLASSIFIER_BACKENDS)})"
+        )
+    return backend_cls(model_name)
+
+
+# --------------------------
+# ErrorClassifier 클래스
+# --------------------------
+class ErrorClassifier:
+    """
+    오류 유형 분류 모델을 프로세스당 한 번만 로드해 공유하는 서비스.
+    백엔드는 CLASSIFIER_BACKEND 환경변수(torch, quantized, onnx)로 선택합니다.
+    """
+
+    def __init__(self, model_name=ERROR_MODEL_NAME, backend=None):
+        self.model_name = model_name
+        self.backend = create_backend(
+            backend or os.getenv("CLASSIFIER_BACKEND", TorchBackend.name), model_name
+        )
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_count = 0
+        self.load_time = None
+        self.warmup_time = None
+        self.rss_before_load = None
+        self.rss_after_load = None
+        self.loaded_at = None
+
+    @property
+    def is_loaded(self):
+        return self._loaded
+
+    def load(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            hf_token = os.getenv("HF_TOKEN")
+            if hf_token:
+                from huggingface_hub import login
+                login(hf_token)
+            self.rss_before_load = current_rss_bytes()
+            start = time.perf_counter()
+            self.backend.load()
+            self.load_time = time.perf_counter() - start
+            self.rss_after_load = current_rss_bytes()
+            self._loaded = True
+            self.load_count += 1
+            self.loaded_at = time.time()
+            logging.info(
+                f"오류 분류 모델 로드 완료: {self.model_name} [{self.backend.name}] "
+                f"({self.load_time:.2f}초, 누적 로드 {self.load_count}회)"
+            )
+
+    def warm_up(self):
+        """
+        모델을 로드하고 더미 입력으로 한 번 추론해 첫 요청의 지연을 없앱니다.
+        """
+        self.load()
+        if self.warmup_time is not None:
+            return
+        start = time.perf_counter()
+        self.classify("print('hello')")
+        self.warmup_time = time.perf_counter() - start
+
+    def classify(self, code):
+        return self.classify_batch([code])[0]
+
+    def classify_batch(self, codes):
+        """
+        여러 코드를 패딩해 한 번의 forward pass로 분류합니다.
+        """
+        self.load()
+        predicted = self.backend.predict(codes)
+        id2label = self.backend.id2label
+        return [id2label[i] for i in predicted]
+
+    def model_bytes(self):
+        return self.backend.model_bytes()
+
+    def metrics(self):
+        rss_delta = None
+        if self.rss_before_load is not None and self.rss_after_load is not None:
+            rss_delta = self.rss_after_load - self.rss_before_load
+        return {
+            "model_name": self.model_name,
+            "backend": self.backend.name,
+            "loaded": self.is_loaded,
+            "load_count": self.load_count,
+            "load_time_sec": self.load_time,
+            "warmup_time_sec": self.warmup_time,
+            "loaded_at": self.loaded_at,
+            "model_param_bytes": self.model_bytes(),
+            "rss_load_delta_bytes": rss_delta,
+            "rss_bytes": current_rss_bytes(),
+        }
+
+
+_shared_classifier = None
+_shared_lock = threading.Lock()
+
+
+def get_error_classifier():
+    """
+    프로세스 전역에서 공유되는 ErrorClassifier 인스턴스를 반환합니다.
+    """
+    global _shared_classifier
+    if _shared_classifier is None:
+        with _shared_lock:
+            if _shared_classifier is None:
+                _shared_classifier = ErrorClassifier()
+    return _shared_classifier
+
+
+# --------------------------
+# BatchedInferenceEngine 클래스
+# --------------------------
+_STOP = object()
+
+
+def _resolve_future(loop, future, result=None, error=None):
+    def _set():
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    try:
+        loop.call_soon_threadsafe(_set)
+    except RuntimeError:
+        # 요청을 보낸 이벤트 루프가 이미 닫힌 경우
+        pass
+
+
+class BatchedInferenceEngine:
+    """
+    동시에 들어온 분류 요청을 짧은 시간 모아 하나의 배치로 추론하는 엔진.
+    추론은 전용 워커 스레드에서 실행되므로 이벤트 루프를 막지 않습니다.
+    """
+
+    def __init__(self, classifier, max_batch_size=None, max_wait_ms=None, torch_threads=None):
+        self.classifier = classifier
+        self.max_batch_size = max_batch_size or int(os.getenv("CLASSIFIER_MAX_BATCH", "16"))
+        if max_wait_ms is None:
+            max_wait_ms = float(os.getenv("CLASSIFIER_MAX_WAIT_MS", "5"))
+        self.max_wait = max_wait_ms / 1000
+        if torch_threads is None:
+            torch_threads = int(os.getenv("CLASSIFIER_TORCH_THREADS", "0"))
+        self.torch_threads = torch_threads
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batch_count = 0
+        self.item_count = 0
+        self.max_batch_seen = 0
+        self.inference_time = 0.0
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="error-classifier-worker", daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=None):
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    async def classify(self, code):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.start()
+        self._queue.put((code, loop, future))
+        return await future
+
+    def _collect_batch(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        if self.torch_threads > 0:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = self._collect_batch(item)
+            codes = [code for code, _, _ in batch]
+            start = time.perf_counter()
+            try:
+                labels = self.classifier.classify_batch(codes)
+            except Exception as e:
+                logging.exception("오류 분류 배치 추론 실패")
+                for _, loop, future in batch:
+                    _resolve_future(loop, future, error=e)
+                continue
+            self.inference_time += time.perf_counter() - start
+            self.batch_count += 1
+            self.item_count += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            for (_, loop, future), label in zip(batch, labels):
+                _resolve_future(loop, future, result=label)
+
+    def metrics(self):
+        avg_batch = self.item_count / self.batch_count if self.batch_count else 0
+        return {
+            "running": self.running,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "torch_threads": self.torch_threads,
+            "queue_depth": self._queue.qsize(),
+            "batch_count": self.batch_count,
+            "item_count": self.item_count,
+            "avg_batch_size": avg_batch,
+            "max_batch_seen": self.max_batch_seen,
+            "inference_time_sec": self.inference_time,
+        }
+
+
+_shared_engine = None
+
+
+def get_inference_engine():
+    """
+    공유 ErrorClassifier 위에서 동작하는 프로세스 전역 배치 추론 엔진을 반환합니다.
+    """
+    global _shared_engine
+    if _shared_engine is None:
+        # get_error_classifier도 _shared_lock을 쓰므로 잠금을 잡기 전에 먼저 가져옴
+        classifier = get_error_classifier()
+        with _shared_lock:
+            if _shared_engine is None:
+                _shared_engine = BatchedInferenceEngine(classifier)
+    return _shared_engine
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "generation_cache.db"
+)
+
+
+# --------------------------
+# GenerationCache 클래스
+# --------------------------
+class GenerationCache:
+    """
+    Gemini 생성 결과를 프롬프트 해시와 모델 설정으로 저장하는 2단 캐시.
+    메모리 LRU 계층 뒤에 SQLite 디스크 계층이 있으며, 둘 다 TTL과 크기 제한을 가집니다.
+    """
+
+    def __init__(self, path=None, max_memory_entries=None, max_disk_entries=None, ttl=None):
+        self.path = path or os.getenv("GENERATION_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.max_memory_entries = max_memory_entries or int(
+            os.getenv("GENERATION_CACHE_MEMORY_SIZE", "512")
+        )
+        self.max_disk_entries = max_disk_entries or int(
+            os.getenv("GENERATION_CACHE_DISK_SIZE", "10000")
+        )
+        self.ttl = ttl or float(os.getenv("GENERATION_CACHE_TTL", str(7 * 24 * 3600)))
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def make_key(kind, prompt, model_config):
+        payload = json.dumps(
+            {"kind": kind, "model": model_config, "prompt": prompt},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS generations (
+                    key TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_generations_last_access ON generations(last_access)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    # ---- 메모리 계층 ----
+    def get_memory(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.time():
+                del self._memory[key]
+                self.expirations += 1
+                return None
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return value
+
+    def _put_memory(self, key, value, expires_at):
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+                self.evictions += 1
+
+    # ---- 디스크 계층 ----
+    def get_disk(self, key):
+        """
+        디스크 계층을 조회하고, 적중하면 메모리 계층으로 승격합니다.
+        """
+        now = time.time()
+        try:
+            with self._db_lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT value, expires_at FROM generations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                value, expires_at = row
+                if expires_at < now:
+                    conn.execute("DELETE FROM generations WHERE key = ?", (key,))
+                    conn.commit()
+                    self.expirations += 1
+                    self.misses += 1
+                    return None
+                conn.execute(
+                    "UPDATE generations SET last_access = ? WHERE key = ?", (now, key)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logging.error(f"생성 캐시 조회 실패: {e}")
+            self.misses += 1
+            return None
+        self.disk_hits += 1
+        self._put_memory(key, value, expires_at)
+        return value
+
+    def get(self, key):
+        value = self.get_memory(key)
+        if value is not None:
+            return value
+        return self.get_disk(key)
+
+    def set(self, key, value, kind=""):
+        now = time.time()
+        expires_at = now + self.ttl
+        self._put_memory(key, value, expires_at)
+        self.stores += 1
+        try:
+            with self._db_lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO generations "
+                    "(key, kind, value, created_at, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, value, now, expires_at, now)
+                )
+                count = conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+                overflow = count - self.max_disk_entries
+                if overflow > 0:
+                    conn.execute(
+                        "DELETE FROM generations WHERE key IN "
+                        "(SELECT key FROM generations ORDER BY last_access LIMIT ?)",
+                        (overflow,)
+                    )
+                    self.evictions += overflow
+                conn.commit()
+        except sqlite3.Error as e:
+            logging.error(f"생성 캐시 저장 실패: {e}")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM generations")
+            conn.commit()
+
+    def close(self):
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "ttl_sec": self.ttl,
+            "max_memory_entries": self.max_memory_entries,
+            "max_disk_entries": self.max_disk_entries,
+        }
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_generation_cache():
+    """
+    프로세스 전역에서 공유되는 GenerationCache를 반환합니다.
+    GENERATION_CACHE=0 이면 캐시를 사용하지 않고 None을 반환합니다.
+    """
+    global _shared_cache
+    if os.getenv("GENERATION_CACHE", "1") == "0":
+        return None
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = GenerationCache()
+    return _shared_cache
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import aiohttp
+
+from metrics import BACKEND_ERRORS, BACKEND_RETRIES, BACKEND_SECONDS
+
+
+# --------------------------
+# RetryPolicy 클래스
+# --------------------------
+class RetryPolicy:
+    """
+    백엔드 호출에 공통으로 쓰는 재시도/백오프 정책.
+    연결 오류, 타임아웃, 5xx/429 응답만 재시도하고 나머지 4xx는 바로 실패로 처리합니다.
+    max_retries는 첫 시도를 뺀 재시도 횟수이며, 0이면 재시도하지 않습니다.
+    """
+
+    def __init__(self, max_retries=None, base_delay=None, max_delay=None):
+        self.max_retries = max_retries if max_retries is not None else int(
+            os.getenv("HTTP_MAX_RETRIES", "2")
+        )
+        self.base_delay = base_delay if base_delay is not None else float(
+            os.getenv("HTTP_RETRY_DELAY", "1")
+        )
+        self.max_delay = max_delay if max_delay is not None else float(
+            os.getenv("HTTP_RETRY_MAX_DELAY", "8")
+        )
+
+    def delay(self, attempt):
+        # 지수 백오프 + 지터: 동시에 실패한 요청들이 같은 시점에 몰리지 않도록 함
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return backoff * random.uniform(0.5, 1.0)
+
+    def is_retryable(self, error):
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500 or error.status == 429
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+
+# --------------------------
+# HTTPPool 클래스
+# --------------------------
+class HTTPPool:
+    """
+    프로세스 전역에서 공유하는 keep-alive aiohttp 세션과 연결 풀.
+    모든 Spring Boot 백엔드 호출이 이 풀을 거치며, 호출별 지연 시간과 풀 사용량을 기록합니다.
+    """
+
+    def __init__(self, limit=None, limit_per_host=None, keepalive_timeout=None, timeout=None,
+                 retry_policy=None):
+        self.limit = limit or int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.limit_per_host = limit_per_host or int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "32"))
+        self.keepalive_timeout = keepalive_timeout or float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+        self.timeout = timeout or float(os.getenv("HTTP_TIMEOUT", "10"))
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._session = None
+        self._loop = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.sessions_created = 0
+        self.retries = 0
+        self.failures = 0
+        self._calls = {}
+
+    @staticmethod
+    async def _discard_session(session, loop):
+        """
+        다른 이벤트 루프에서 만든 세션을 닫습니다. 그 루프가 아직 돌고 있으면 그 루프에서 닫습니다.
+        """
+        if session.closed:
+            return
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # 멈춘 루프의 연결은 더 정리할 수 없으므로 커넥터를 닫힌 상태로 표시하는 데서 그침
+        # (루프가 닫혔다면 aiohttp가 연결 정리를 건너뛰고 바로 끝남)
+        try:
+            await session.close()
+        except RuntimeError as e:
+            logging.warning(f"이전 이벤트 루프의 HTTP 세션을 정리하지 못했습니다: {e}")
+
+    async def get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            if self._session is not None and self._loop is not loop:
+                await self._discard_session(self._session, self._loop)
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    @property
+    def connected(self):
+        return self._session is not None and not self._session.closed
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+    def _record(self, name, elapsed, ok):
+        stats = self._calls.get(name)
+        if stats is None:
+            stats = {"count": 0, "errors": 0, "total": 0.0, "max": 0.0, "recent": deque(maxlen=1024)}
+            self._calls[name] = stats
+        stats["count"] += 1
+        if not ok:
+            stats["errors"] += 1
+        stats["total"] += elapsed
+        stats["max"] = max(stats["max"], elapsed)
+        stats["recent"].append(elapsed)
+        BACKEND_SECONDS.labels(name).observe(elapsed)
+
+    async def _send(self, method, url, name, json):
+        session = await self.get_session()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        ok = False
+        try:
+            async with session.request(method, url, json=json) as resp:
+                resp.raise_for_status()
+                result = await resp.json()
+                ok = True
+                return result
+        finally:
+            self.in_flight -= 1
+            self._record(name, time.perf_counter() - start, ok)
+
+    async def request_json(self, method, url, json=None, name=None):
+        """
+        공통 재시도 정책으로 요청을 보내고 JSON 응답을 반환합니다.
+        재시도할 수 없는 오류이거나 모든 시도가 실패하면 마지막 예외를 그대로 올립니다.
+        """
+        name = name or f"{method} {url}"
+        attempts = self.retry_policy.max_retries + 1
+        for attempt in range(attempts):
+            try:
+                return await self._send(method, url, name, json)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                retryable = self.retry_policy.is_retryable(e)
+                if not retryable or attempt == attempts - 1:
+                    self.failures += 1
+                    BACKEND_ERRORS.labels(name).inc()
+                    raise
+                self.retries += 1
+                BACKEND_RETRIES.labels(name).inc()
+                logging.error(f"API 호출 실패 ({name}, 시도 {attempt + 1}/{attempts}): {e}")
+                await asyncio.sleep(self.retry_policy.delay(attempt))
+        return None
+
+    def metrics(self):
+        calls = {}
+        for name, stats in self._calls.items():
+            recent = sorted(stats["recent"])
+            calls[name] = {
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "avg_ms": stats["total"] / stats["count"] * 1000 if stats["count"] else 0.0,
+                "p50_ms": recent[len(recent) // 2] * 1000 if recent else 0.0,
+                "p95_ms": recent[min(len(recent) - 1, int(len(recent) * 0.95))] * 1000 if recent else 0.0,
+                "max_ms": stats["max"] * 1000,
+            }
+        return {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "utilization": self.in_flight / self.limit if self.limit else 0.0,
+            "sessions_created": self.sessions_created,
+            "retries": self.retries,
+            "failures": self.failures,
+            "calls": calls,
+        }
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_http_pool():
+    """
+    프로세스 전역에서 공유되는 HTTPPool을 반환합니다.
+    """
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_lock:
+            if _shared_pool is None:
+                _shared_pool = HTTPPool()
+    return _shared_pool
@@ -0,0 +1,277 @@
+"""
+사용자 메시지의 의도(theory, exercise, hint, more_exercises, answer)를 판별하는 라우터.
+
+1) 같은 메시지에 대한 최근 결과를 LRU 메모에서 찾고,
+2) 미리 컴파일한 정규식 규칙을 순서대로 확인한 뒤,
+3) 규칙에 걸리지 않은 메시지만 TF-IDF + 다항 나이브 베이즈 모델로 분류합니다.
+
+모델은 scikit-learn의 TfidfVectorizer + MultinomialNB(기본 설정)와 같은 계산을 numpy로 구현한 것으로,
+학습 결과(어휘, idf, 클래스별 로그 확률)는 버전이 붙은 JSON 파일로 저장해 다음 실행부터 바로 읽어 옵니다.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+ARTIFACT_VERSION = 1
+# 학습 결과는 소스 트리가 아니라 사용자 캐시 디렉터리에 저장 (INTENT_ROUTER_PATH로 바꿀 수 있음)
+DEFAULT_ARTIFACT_PATH = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "fap", "intent_router.json"
+)
+
+# 규칙은 위에서부터 순서대로 확인
+INTENT_PATTERNS = [
+    ("theory", re.compile(r"(이론)")),
+    ("exercise", re.compile(r"(연습문제)")),
+    ("hint", re.compile(r"^힌트")),
+    ("more_exercises", re.compile(r"^더\s*풀기$")),
+]
+
+TRAINING_DATA = [
+    ("파이썬 이론 설명해줘", "theory"),
+    ("리스트 자료형에 대해 알려줘", "theory"),
+    ("연습문제 풀고 싶어", "exercise"),
+    ("문제 좀 내줘", "exercise"),
+    ("힌트 주세요", "hint"),
+    ("001번 문제 힌트", "hint"),
+    ("정답이 뭐야", "answer"),
+    ("답 알려줘", "answer"),
+    ("더 풀고 싶어", "more_exercises"),
+    ("추가 문제 주세요", "more_exercises"),
+]
+
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def training_fingerprint(samples):
+    return hashlib.sha256(
+        json.dumps([ARTIFACT_VERSION, samples], ensure_ascii=False).encode("utf-8")
+    ).hexdigest()
+
+
+# --------------------------
+# IntentModel 클래스
+# --------------------------
+class IntentModel:
+    """
+    TF-IDF(smooth idf, l2 정규화) + MultinomialNB(alpha=1) 분류기.
+    """
+
+    def __init__(self, vocabulary, idf, classes, feature_log_prob, class_log_prior):
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.classes = list(classes)
+        self.feature_log_prob = np.asarray(feature_log_prob, dtype=np.float64)
+        self.class_log_prior = np.asarray(class_log_prior, dtype=np.float64)
+
+    @classmethod
+    def fit(cls, samples, alpha=1.0):
+        texts = [text for text, _ in samples]
+        labels = [label for _, label in samples]
+        vocabulary = {
+            token: i for i, token in enumerate(sorted({t for text in texts for t in tokenize(text)}))
+        }
+        counts = cls._counts(texts, vocabulary)
+        df = (counts > 0).sum(axis=0)
+        idf = np.log((1 + len(texts)) / (1 + df)) + 1
+        tfidf = cls._normalize(counts * idf)
+
+        classes = sorted(set(labels))
+        onehot = np.array([[label == c for c in classes] for label in labels], dtype=np.float64)
+        feature_count = onehot.T @ tfidf + alpha
+        feature_log_prob = np.log(feature_count) - np.log(feature_count.sum(axis=1, keepdims=True))
+        class_count = onehot.sum(axis=0)
+        class_log_prior = np.log(class_count) - np.log(class_count.sum())
+        return cls(vocabulary, idf, classes, feature_log_prob, class_log_prior)
+
+    @staticmethod
+    def _counts(texts, vocabulary):
+        counts = np.zeros((len(texts), len(vocabulary)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                col = vocabulary.get(token)
+                if col is not None:
+                    counts[row, col] += 1
+        return counts
+
+    @staticmethod
+    def _normalize(matrix):
+        norms = np.sqrt((matrix ** 2).sum(axis=1, keepdims=True))
+        norms[norms == 0] = 1
+        return matrix / norms
+
+    def predict(self, texts):
+        """
+        여러 메시지를 한 번의 행렬 연산으로 분류합니다.
+        """
+        if not texts:
+            return []
+        tfidf = self._normalize(self._counts(texts, self.vocabulary) * self.idf)
+        scores = tfidf @ self.feature_log_prob.T + self.class_log_prior
+        return [self.classes[i] for i in scores.argmax(axis=1)]
+
+    def to_dict(self):
+        return {
+            "vocabulary": self.vocabulary,
+            "idf": self.idf.tolist(),
+            "classes": self.classes,
+            "feature_log_prob": self.feature_log_prob.tolist(),
+            "class_log_prior": self.class_log_prior.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            data["vocabulary"], data["idf"], data["classes"],
+            data["feature_log_prob"], data["class_log_prior"],
+        )
+
+
+# --------------------------
+# IntentRouter 클래스
+# --------------------------
+class IntentRouter:
+    """
+    메모 → 정규식 규칙 → 분류 모델 순서로 의도를 판별합니다.
+    모델은 artifact_path의 JSON에서 읽어 오며, 파일이 없거나 버전/학습 데이터가 바뀌었으면
+    다시 학습해 저장합니다.
+    """
+
+    def __init__(self, artifact_path=None, memo_size=None, samples=None):
+        self.artifact_path = artifact_path or os.getenv("INTENT_ROUTER_PATH", DEFAULT_ARTIFACT_PATH)
+        self.memo_size = memo_size or int(os.getenv("INTENT_MEMO_SIZE", "4096"))
+        self.samples = samples or TRAINING_DATA
+        self.fingerprint = training_fingerprint(self.samples)
+        self.model = None
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.load_time = None
+        self.trained = False
+        self.memo_hits = 0
+        self.pattern_hits = 0
+        self.model_predictions = 0
+
+    @property
+    def is_loaded(self):
+        return self.model is not None
+
+    def _read_artifact(self):
+        try:
+            with open(self.artifact_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != ARTIFACT_VERSION or data.get("fingerprint") != self.fingerprint:
+            return None
+        return IntentModel.from_dict(data["model"])
+
+    def _write_artifact(self, model):
+        data = {"version": ARTIFACT_VERSION, "fingerprint": self.fingerprint, "model": model.to_dict()}
+        try:
+            os.makedirs(os.path.dirname(self.artifact_path), exist_ok=True)
+            tmp_path = f"{self.artifact_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.artifact_path)
+        except OSError as e:
+            logging.error(f"의도 분류 모델 저장 실패: {e}")
+
+    def load(self):
+        if self.model is not None:
+            return self.model
+        with self._lock:
+            if self.model is None:
+                start = time.perf_counter()
+                model = self._read_artifact()
+                if model is None:
+                    model = IntentModel.fit(self.samples)
+                    self._write_artifact(model)
+                    self.trained = True
+                self.model = model
+                self.load_time = time.perf_counter() - start
+        return self.model
+
+    def _remember(self, message, intent):
+        self._memo[message] = intent
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def _match_pattern(self, message):
+        for intent, pattern in INTENT_PATTERNS:
+            if pattern.search(message):
+                return intent
+        return None
+
+    def route(self, message):
+        return self.route_batch([message])[0]
+
+    def route_batch(self, messages):
+        """
+        여러 메시지의 의도를 한 번에 판별합니다. 규칙에 걸리지 않은 메시지는 모아서 한 번에 모델로 분류합니다.
+        """
+        results = [None] * len(messages)
+        pending = []
+        with self._lock:
+            for i, message in enumerate(messages):
+                intent = self._memo.get(message)
+                if intent is not None:
+                    self._memo.move_to_end(message)
+                    self.memo_hits += 1
+                    results[i] = intent
+                    continue
+                intent = self._match_pattern(message)
+                if intent is not None:
+                    self.pattern_hits += 1
+                    self._remember(message, intent)
+                    results[i] = intent
+                else:
+                    pending.append(i)
+        if pending:
+            predicted = self.load().predict([messages[i] for i in pending])
+            with self._lock:
+                self.model_predictions += len(pending)
+                for i, intent in zip(pending, predicted):
+                    self._remember(messages[i], intent)
+                    results[i] = intent
+        return results
+
+    def stats(self):
+        routed = self.memo_hits + self.pattern_hits + self.model_predictions
+        return {
+            "loaded": self.is_loaded,
+            "trained_at_load": self.trained,
+            "load_time_ms": self.load_time * 1000 if self.load_time is not None else None,
+            "artifact_version": ARTIFACT_VERSION,
+            "memo_size": len(self._memo),
+            "memo_hits": self.memo_hits,
+            "pattern_hits": self.pattern_hits,
+            "model_predictions": self.model_predictions,
+            "memo_hit_rate": self.memo_hits / routed if routed else 0.0,
+        }
+
+
+_shared_router = None
+_shared_lock = threading.Lock()
+
+
+def get_intent_router():
+    """
+    프로세스 전역에서 공유되는 IntentRouter를 반환합니다.
+    """
+    global _shared_router
+    if _shared_router is None:
+        with _shared_lock:
+            if _shared_router is None:
+                _shared_router = IntentRouter()
+    return _shared_router
@@ -0,0 +1,216 @@
+"""
+로그 설정.
+
+로그 호출은 레코드를 큐에 넣기만 하고, 파일/콘솔 기록은 QueueListener의 백그라운드 스레드가 합니다.
+파일에는 요청 ID가 붙은 JSON 한 줄씩 기록하며 크기 기준으로 회전합니다.
+DEBUG 로그는 호출 위치별로 LOG_DEBUG_SAMPLE 비율만 남깁니다.
+
+환경 변수:
+    LOG_LEVEL          기본 INFO
+    LOG_FILE           기본 python_tutor.log
+    LOG_MAX_BYTES      회전 기준 크기, 기본 10MB
+    LOG_BACKUP_COUNT   보관할 회전 파일 수, 기본 5
+    LOG_QUEUE_SIZE     큐 최대 길이, 넘치면 버리고 dropped로 집계 (기본 10000)
+    LOG_DEBUG_SAMPLE   DEBUG 로그를 남길 비율 (기본 0.01)
+    LOG_CONSOLE        0이면 콘솔 출력 끔
+"""
+import atexit
+import contextvars
+import copy
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+_RESERVED_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", None, None)).keys()
+) | {"message", "asctime", "request_id"}
+
+
+# --------------------------
+# 필터 클래스
+# --------------------------
+class RequestIdFilter(logging.Filter):
+    """
+    현재 컨텍스트의 요청 ID를 레코드에 붙입니다. 큐에 넣기 전에 붙여야 백그라운드 스레드에서도 유지됩니다.
+    """
+
+    def filter(self, record):
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """
+    DEBUG 레코드는 호출 위치(파일, 줄)마다 첫 번째와 그 뒤 every번째마다 하나씩만 통과시킵니다.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counts = {}
+        self.sampled_out = 0
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.every == 0:
+            self.sampled_out += 1
+            return False
+        key = (record.pathname, record.lineno)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        if count % self.every == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+# --------------------------
+# JsonFormatter 클래스
+# --------------------------
+class JsonFormatter(logging.Formatter):
+    """
+    레코드를 JSON 한 줄로 바꿉니다. extra로 넘긴 필드도 함께 기록합니다.
+    """
+
+    def format(self, record):
+        data = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+# --------------------------
+# DroppingQueueHandler 클래스
+# --------------------------
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    큐가 가득 차면 기다리지 않고 레코드를 버립니다. 로그 때문에 요청 처리가 멈추지 않도록 하기 위함입니다.
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 메시지 인자와 예외 정보만 여기서 문자열로 바꿔 두고(이후 객체가 바뀌어도 로그 내용이 달라지지 않도록),
+        # 포매터 적용과 파일 기록은 백그라운드 스레드에서 함
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+def create_queue_logging(handlers, queue_size=None, debug_sample=None):
+    """
+    handlers에 대한 기록을 백그라운드 스레드로 넘기는 (QueueHandler, QueueListener)를 만듭니다.
+    listener.start()는 호출자가 합니다.
+    """
+    queue_size = queue_size or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    debug_sample = debug_sample if debug_sample is not None else float(
+        os.getenv("LOG_DEBUG_SAMPLE", "0.01")
+    )
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    queue_handler.addFilter(DebugSampler(debug_sample))
+    queue_handler.addFilter(RequestIdFilter())
+    listener = logging.handlers.QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    return queue_handler, listener
+
+
+_listener = None
+_queue_handler = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(log_file=None, level=None):
+    """
+    루트 로거에 큐 핸들러를 달고 백그라운드 기록 스레드를 시작합니다. 여러 번 호출해도 한 번만 설정합니다.
+    """
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is not None:
+            return _queue_handler
+        log_file = log_file or os.getenv("LOG_FILE", "python_tutor.log")
+        level = level or os.getenv("LOG_LEVEL", "INFO").upper()
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file,
+            maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers = [file_handler]
+        if os.getenv("LOG_CONSOLE", "1") != "0":
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+            handlers.append(console_handler)
+
+        _queue_handler, _listener = create_queue_logging(handlers)
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(_queue_handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _queue_handler
+
+
+def shutdown_logging():
+    """
+    큐에 남은 레코드를 모두 기록하고 백그라운드 스레드를 멈춥니다.
+    """
+    global _listener, _queue_handler
+    with _setup_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger().removeHandler(_queue_handler)
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+
+
+def logging_stats():
+    if _queue_handler is None:
+        return {"configured": False}
+    sampler = next(f for f in _queue_handler.filters if isinstance(f, DebugSampler))
+    return {
+        "configured": True,
+        "queue_depth": _queue_handler.queue.qsize(),
+        "queue_size": _queue_handler.queue.maxsize,
+        "enqueued": _queue_handler.enqueued,
+        "dropped": _queue_handler.dropped,
+        "debug_sampled_out": sampler.sampled_out,
+    }
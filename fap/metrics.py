@@ -0,0 +1,316 @@
+"""
+프로세스 안에서 집계하는 Prometheus 형식 지표(Counter, Gauge, Histogram)와 /metrics 출력.
+
+핫패스에서는 값 증가/관측만 하고(라벨별 자식 객체 조회 + 잠금 한 번),
+문자열 변환은 /metrics를 조회할 때만 합니다. 다른 모듈이 이미 세고 있는 값(캐시 적중 수 등)은
+set_function으로 조회 시점에 읽어 오므로 핫패스 비용이 없습니다.
+"""
+import bisect
+import logging
+import threading
+import time
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# --------------------------
+# 지표 값 클래스
+# --------------------------
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+
+class _Timer:
+    """
+    with 블록의 실행 시간을 히스토그램에 기록하고, 예외가 나면 errors 카운터를 올립니다.
+    """
+    __slots__ = ("histogram", "errors", "start")
+
+    def __init__(self, histogram, errors):
+        self.histogram = histogram
+        self.errors = errors
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start)
+        # 취소(CancelledError)나 스트림 중단(GeneratorExit)은 실패로 세지 않음
+        if exc_type is not None and issubclass(exc_type, Exception) and self.errors is not None:
+            self.errors.inc()
+        return False
+
+
+class _HistogramValue:
+    __slots__ = ("buckets", "counts", "sum", "count", "_lock")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self, errors=None):
+        return _Timer(self, errors)
+
+
+# --------------------------
+# Metric 클래스
+# --------------------------
+class Metric:
+    """
+    라벨 값 튜플별로 자식 값을 가지는 지표의 공통 부분.
+    라벨이 없는 지표는 inc/set/observe를 바로 호출할 수 있습니다.
+    """
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        self._function = None
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        return _Value()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 라벨 {self.labelnames}에 맞는 값이 필요합니다: {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def set_function(self, function):
+        """
+        조회 시점에 function()의 값을 보고합니다. 라벨이 있는 지표는 {라벨 값 튜플: 값}을 반환해야 합니다.
+        """
+        self._function = function
+
+    def samples(self):
+        """
+        (이름 접미사, 라벨 값 튜플, 추가 라벨, 값) 목록을 반환합니다.
+        """
+        if self._function is not None:
+            value = self._function()
+            items = value.items() if self.labelnames else [((), value)]
+            return [("", tuple(labels), None, v) for labels, v in items]
+        return [("", labels, None, child.value) for labels, child in list(self._children.items())]
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, labels, extra, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(self.labelnames, labels, extra)} {_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def dec(self, amount=1):
+        self._default.dec(amount)
+
+    def set(self, value):
+        self._default.set(value)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self, errors=None):
+        return self._default.time(errors)
+
+    def samples(self):
+        samples = []
+        for labels, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total, count = child.sum, child.count
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append(("_bucket", labels, ("le", _format_value(bound)), cumulative))
+            samples.append(("_sum", labels, None, total))
+            samples.append(("_count", labels, None, count))
+        return samples
+
+
+# --------------------------
+# Registry 클래스
+# --------------------------
+class Registry:
+    """
+    이름별 지표 목록. 같은 이름으로 다시 등록하면 기존 지표를 그대로 돌려줍니다.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"{name} 지표가 다른 형식으로 이미 등록되어 있습니다.")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        lines = []
+        for metric in list(self._metrics.values()):
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                logging.error(f"{metric.name} 지표 수집 실패: {e}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "tutor_stage_seconds", "튜터 처리 단계별 소요 시간(초)", ["stage"]
+)
+STAGE_ERRORS = REGISTRY.counter(
+    "tutor_stage_errors_total", "튜터 처리 단계별 예외 수", ["stage"]
+)
+GEMINI_SECONDS = REGISTRY.histogram(
+    "tutor_gemini_request_seconds", "Gemini 호출 종류별 소요 시간(초)", ["kind"]
+)
+GEMINI_ERRORS = REGISTRY.counter(
+    "tutor_gemini_errors_total", "Gemini 호출 종류별 실패 수", ["kind"]
+)
+BACKEND_SECONDS = REGISTRY.histogram(
+    "tutor_backend_request_seconds", "백엔드 API 호출별 시도 한 번의 소요 시간(초)", ["call"]
+)
+BACKEND_RETRIES = REGISTRY.counter(
+    "tutor_backend_retries_total", "백엔드 API 호출별 재시도 수", ["call"]
+)
+BACKEND_ERRORS = REGISTRY.counter(
+    "tutor_backend_errors_total", "재시도 후에도 실패한 백엔드 API 호출 수", ["call"]
+)
+INTENTS = REGISTRY.counter(
+    "tutor_intents_total", "판별된 의도별 요청 수", ["intent"]
+)
+CACHE_HITS = REGISTRY.counter(
+    "tutor_cache_hits_total", "캐시별 적중 수", ["cache"]
+)
+CACHE_MISSES = REGISTRY.counter(
+    "tutor_cache_misses_total", "캐시별 미적중 수", ["cache"]
+)
+ACTIVE_SESSIONS = REGISTRY.gauge(
+    "tutor_active_sessions", "메모리에 올라와 있는 사용자 세션 수"
+)
+BACKEND_IN_FLIGHT = REGISTRY.gauge(
+    "tutor_backend_in_flight", "진행 중인 백엔드 API 호출 수"
+)
+
+
+_tracked = {}
+
+
+def _track(histogram, errors, label):
+    # 라벨별 (히스토그램, 오류 카운터) 쌍을 한 번만 찾아 두어 호출마다 조회를 한 번으로 줄임
+    key = (histogram.name, label)
+    pair = _tracked.get(key)
+    if pair is None:
+        pair = _tracked.setdefault(key, (histogram.labels(label), errors.labels(label)))
+    return _Timer(*pair)
+
+
+def track_stage(stage):
+    return _track(STAGE_SECONDS, STAGE_ERRORS, stage)
+
+
+def track_gemini(kind):
+    return _track(GEMINI_SECONDS, GEMINI_ERRORS, kind)
+
+
+def render_metrics():
+    return REGISTRY.render()
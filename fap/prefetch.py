@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+import copy
+import logging
+import os
+import time
+from collections import OrderedDict
+
+
+# --------------------------
+# TopicPrefetcher 클래스
+# --------------------------
+class TopicPrefetcher:
+    """
+    사용자가 N번째 주제를 시작하면 N+1번째 주제의 이론과 연습문제 세트를 미리 생성해 두는 프리페처.
+    생성은 프로세스 전체에서 concurrency개까지만 동시에 실행하며, 결과는 주제별로 공유해
+    같은 주제로 넘어가는 모든 사용자가 사용합니다.
+    한 번도 쓰이지 않고 만료/축출된 생성 결과는 낭비(wasted)로 집계합니다.
+    """
+    KINDS = ("theory", "exercises")
+
+    def __init__(self, content_generator, concurrency=None, ttl=None, max_topics=None):
+        self.content_generator = content_generator
+        self.enabled = os.getenv("PREFETCH", "1") != "0"
+        self.concurrency = concurrency or int(os.getenv("PREFETCH_CONCURRENCY", "2"))
+        self.ttl = ttl or float(os.getenv("PREFETCH_TTL", "1800"))
+        self.max_topics = max_topics or int(os.getenv("PREFETCH_MAX_TOPICS", "8"))
+        self._semaphore = None
+        self._entries = OrderedDict()
+        self.scheduled = 0
+        self.hits = 0
+        self.in_flight_hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.wasted = 0
+        self.bypassed = 0
+
+    async def _generate(self, kind, topic, entry):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            entry["started"] = True
+            if kind == "theory":
+                return await self.content_generator.generate_theory(topic)
+            # 정답 저장은 실제로 이 세트를 사용자에게 줄 때 하므로 여기서는 생성만 함
+            return await self.content_generator.generate_exercises(topic, save=False)
+
+    def _discard(self, key):
+        entry = self._entries.pop(key)
+        task = entry["task"]
+        if entry["used"]:
+            return
+        if entry["waiters"]:
+            # take()에서 결과를 기다리는 요청이 있으면 목록에서만 빼고 생성은 끝까지 진행
+            return
+        if not task.done():
+            task.cancel()
+            self.wasted += 1
+        elif not task.cancelled() and task.exception() is None:
+            self.wasted += 1
+
+    def _prune(self):
+        now = time.monotonic()
+        for key in [k for k, entry in self._entries.items() if now - entry["created"] >= self.ttl]:
+            self._discard(key)
+        while len(self._entries) > self.max_topics * len(self.KINDS):
+            self._discard(next(iter(self._entries)))
+
+    def _on_done(self, key, task):
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            self.failures += 1
+            logging.error(f"{key[1]} {key[0]} 미리 생성 실패: {task.exception()}")
+            # 실패한 항목은 다음 요청 때 다시 예약될 수 있도록 제거
+            if self._entries.get(key, {}).get("task") is task:
+                del self._entries[key]
+
+    def schedule(self, topic):
+        """
+        topic의 이론과 연습문제를 백그라운드에서 생성하도록 예약합니다.
+        이미 예약되었거나 생성된 주제는 다시 예약하지 않습니다.
+        """
+        if not self.enabled or topic is None:
+            return
+        self._prune()
+        for kind in self.KINDS:
+            key = (kind, topic)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                continue
+            entry = {"created": time.monotonic(), "used": 0, "started": False, "waiters": 0}
+            # 여러 사용자가 함께 쓰는 백그라운드 작업이므로 예약한 요청의 트레이스/요청 ID를 물려받지 않도록
+            # 빈 컨텍스트에서 실행
+            task = asyncio.create_task(self._generate(kind, topic, entry), context=contextvars.Context())
+            task.add_done_callback(lambda t, key=key: self._on_done(key, t))
+            entry["task"] = task
+            self._entries[key] = entry
+            self.scheduled += 1
+        self._prune()
+
+    async def take(self, kind, topic):
+        """
+        미리 생성된 결과를 반환합니다. 아직 생성 중이면 끝날 때까지 기다리고,
+        예약된 적이 없거나 생성에 실패했으면 None을 반환합니다.
+        동시 생성 수 제한 때문에 아직 시작하지 못한 예약은 취소하고 None을 반환해
+        호출자가 다른 예약들 뒤에서 기다리지 않고 바로 생성하게 합니다.
+        """
+        if not self.enabled:
+            return None
+        self._prune()
+        entry = self._entries.get((kind, topic))
+        if entry is None:
+            self.misses += 1
+            return None
+        task = entry["task"]
+        if not task.done() and not entry["started"]:
+            task.cancel()
+            del self._entries[(kind, topic)]
+            self.bypassed += 1
+            return None
+        if task.done():
+            self.hits += 1
+        else:
+            self.in_flight_hits += 1
+        entry["waiters"] += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # 기다리던 생성 작업이 취소된 경우만 미스로 처리하고, 이 요청 자체가 취소된 경우는 그대로 전파
+            if not task.cancelled() or asyncio.current_task().cancelling():
+                raise
+            self.misses += 1
+            return None
+        except Exception:
+            self.misses += 1
+            return None
+        finally:
+            entry["waiters"] -= 1
+        entry["used"] += 1
+        # 연습문제는 사용자별로 solved 등을 기록하므로 복사본을 줌
+        return copy.deepcopy(result) if kind == "exercises" else result
+
+    async def stop(self):
+        tasks = [entry["task"] for entry in self._entries.values() if not entry["task"].done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._entries.clear()
+
+    def metrics(self):
+        served = self.hits + self.in_flight_hits
+        lookups = served + self.misses + self.bypassed
+        completed = [entry for entry in self._entries.values() if entry["task"].done()]
+        return {
+            "enabled": self.enabled,
+            "concurrency": self.concurrency,
+            "scheduled": self.scheduled,
+            "pending": sum(1 for entry in self._entries.values() if not entry["task"].done()),
+            "ready": len(completed),
+            "hits": self.hits,
+            "in_flight_hits": self.in_flight_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": served / lookups if lookups else 0.0,
+            "failures": self.failures,
+            "wasted": self.wasted,
+        }
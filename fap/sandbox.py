@@ -0,0 +1,350 @@
+"""
+사용자 코드를 별도 프로세스에서 실행하는 샌드박스 워커 풀.
+
+서버 프로세스는 SandboxPool로 미리 띄워 둔 워커들에게 작업을 나눠 주고,
+각 워커(`python sandbox.py --worker ...`)는 RestrictedPython으로 코드를 실행한 결과를
+한 줄짜리 JSON으로 돌려줍니다. 워커마다 CPU/메모리 rlimit이 걸려 있고, 실행 시간이
+제한을 넘거나 워커가 죽으면 해당 워커를 버리고 새로 띄웁니다.
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import warnings
+
+SANDBOX_SCRIPT = os.path.abspath(__file__)
+
+
+# --------------------------
+# 커스텀 출력 콜렉터 정의
+# --------------------------
+class OutputLimitExceeded(Exception):
+    pass
+
+
+class MyPrintCollector:
+    def __init__(self, max_output_bytes=None):
+        self.outputs = []
+        self.max_output_bytes = max_output_bytes
+        self.output_bytes = 0
+
+    def __call__(self, *args, **kwargs):
+        line = " ".join(map(str, args))
+        if self.max_output_bytes is not None:
+            self.output_bytes += len(line.encode("utf-8")) + 1
+            if self.output_bytes > self.max_output_bytes:
+                raise OutputLimitExceeded(
+                    f"출력 크기 제한({self.max_output_bytes}바이트)을 초과했습니다."
+                )
+        self.outputs.append(line)
+
+    # RestrictedPython은 print(...)를 `_print_(_getattr_)._call_print(...)`로 변환하므로
+    # 같은 콜렉터가 그대로 출력을 모으도록 연결
+    _call_print = __call__
+
+
+class SandboxError(Exception):
+    pass
+
+
+# --------------------------
+# 워커 프로세스 (python sandbox.py --worker)
+# --------------------------
+def _apply_memory_limit(memory_mb):
+    try:
+        import resource
+    except ImportError:
+        # Windows 등 rlimit을 지원하지 않는 환경에서는 시간 제한만 적용
+        return
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _apply_cpu_limit(cpu_seconds):
+    try:
+        import resource
+    except ImportError:
+        return
+    if cpu_seconds <= 0:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = int(usage.ru_utime + usage.ru_stime)
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = used + cpu_seconds + 1
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def run_restricted(code, input_example, max_output_bytes=None):
+    from RestrictedPython import compile_restricted, safe_globals
+
+    collector = MyPrintCollector(max_output_bytes)
+    stdin_lines = iter(input_example.splitlines())
+
+    def read_line(prompt=''):
+        # input()을 호출할 때마다 입력 예를 한 줄씩 넘겨줌
+        try:
+            return next(stdin_lines)
+        except StopIteration:
+            raise EOFError("더 이상 읽을 입력이 없습니다.")
+
+    restricted_globals = {
+        "__builtins__": safe_globals["__builtins__"],
+        "_print_": lambda _getattr=None: collector,
+        "_getattr_": getattr,
+        "_getitem_": lambda obj, key: obj[key],
+        "_getiter_": iter,
+        "input": read_line,
+    }
+    compiled_code = compile_restricted(code, "<string>", "exec")
+    locals_dict = {}
+    exec(compiled_code, restricted_globals, locals_dict)
+    return "\n".join(collector.outputs)
+
+
+def worker_main(args):
+    protocol_out = sys.stdout
+    # "printed 변수를 읽지 않는다"는 RestrictedPython 컴파일 경고는 무시
+    warnings.filterwarnings("ignore", category=SyntaxWarning)
+    _apply_memory_limit(args.memory_mb)
+    # 임포트와 컴파일 경로를 미리 데워 첫 작업의 지연을 줄임
+    run_restricted("x = 1", "")
+    for line in sys.stdin:
+        job = json.loads(line)
+        _apply_cpu_limit(args.cpu_seconds)
+        # 제출 코드가 sys.stdout을 건드려도 응답 프로토콜이 깨지지 않도록 분리
+        sys.stdout = io.StringIO()
+        try:
+            output = run_restricted(job["code"], job["input"], args.max_output)
+            result = {"ok": True, "output": output}
+        except MemoryError:
+            result = {"ok": False, "error": "메모리 제한을 초과했습니다."}
+        except Exception as e:
+            result = {"ok": False, "error": str(e)}
+        finally:
+            sys.stdout = protocol_out
+        protocol_out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        protocol_out.flush()
+
+
+# --------------------------
+# SandboxWorker / SandboxPool 클래스
+# --------------------------
+class SandboxWorker:
+    def __init__(self, process):
+        self.process = process
+        self.jobs = 0
+
+    @classmethod
+    async def spawn(cls, cpu_seconds, memory_mb, max_output):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, SANDBOX_SCRIPT, "--worker",
+            "--cpu-seconds", str(cpu_seconds),
+            "--memory-mb", str(memory_mb),
+            "--max-output", str(max_output),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=max_output * 2 + 4096,
+        )
+        return cls(process)
+
+    @property
+    def alive(self):
+        return self.process.returncode is None
+
+    async def execute(self, code, input_example, timeout):
+        self.jobs += 1
+        job = json.dumps({"code": code, "input": input_example}, ensure_ascii=False)
+        self.process.stdin.write(job.encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        if not line:
+            raise ConnectionResetError("샌드박스 워커가 종료되었습니다.")
+        return json.loads(line)
+
+    async def kill(self):
+        if self.alive:
+            self.process.kill()
+        try:
+            await self.process.wait()
+        except ProcessLookupError:
+            pass
+
+
+class SandboxPool:
+    """
+    미리 띄워 둔 샌드박스 워커 프로세스 풀.
+    작업마다 실행 시간 제한, CPU/메모리 rlimit, 출력 크기 제한을 적용하며
+    워커는 max_jobs_per_worker번 사용하거나 비정상 종료되면 새로 교체됩니다.
+    교체할 워커를 띄우지 못하면 그 자리를 비워 두고 다음 run()에서 다시 띄웁니다.
+    """
+
+    def __init__(self, size=None, max_jobs_per_worker=None, timeout=None, cpu_seconds=None,
+                 memory_mb=None, max_output_bytes=None):
+        self.size = size or int(os.getenv("SANDBOX_WORKERS", str(os.cpu_count() or 2)))
+        self.max_jobs_per_worker = max_jobs_per_worker or int(os.getenv("SANDBOX_MAX_JOBS", "50"))
+        self.timeout = timeout or float(os.getenv("SANDBOX_TIMEOUT", "5"))
+        self.cpu_seconds = cpu_seconds or int(os.getenv("SANDBOX_CPU_SECONDS", "5"))
+        self.memory_mb = memory_mb or int(os.getenv("SANDBOX_MEMORY_MB", "512"))
+        self.max_output_bytes = max_output_bytes or int(os.getenv("SANDBOX_MAX_OUTPUT", "65536"))
+        self._idle = None
+        self._workers = set()
+        self._start_lock = None
+        # 교체 워커를 띄우지 못해 비어 있는 자리 수
+        self._missing = 0
+        self.jobs = 0
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+        self.spawned = 0
+        self.spawn_failures = 0
+        self.busy = 0
+
+    async def _spawn(self):
+        worker = await SandboxWorker.spawn(self.cpu_seconds, self.memory_mb, self.max_output_bytes)
+        self._workers.add(worker)
+        self.spawned += 1
+        return worker
+
+    async def _replace(self):
+        """
+        새 워커를 띄워 반환합니다. 실패하면 자리를 비워 두고 None을 반환합니다.
+        """
+        try:
+            return await self._spawn()
+        except Exception as e:
+            self.spawn_failures += 1
+            self._missing += 1
+            logging.error(f"샌드박스 워커 교체 실패 (비어 있는 자리 {self._missing}개): {e}")
+            return None
+
+    async def _replenish(self):
+        # 여러 요청이 같은 자리를 채우지 않도록 먼저 자리를 가져간 뒤 띄움
+        missing, self._missing = self._missing, 0
+        for _ in range(missing):
+            worker = await self._replace()
+            if worker is not None and self._idle is not None:
+                self._idle.put_nowait(worker)
+        if not self._workers:
+            raise SandboxError("샌드박스 워커를 시작하지 못했습니다.")
+
+    async def _retire(self, worker):
+        self._workers.discard(worker)
+        await worker.kill()
+
+    async def start(self):
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._idle is not None:
+                return
+            idle = asyncio.Queue()
+            workers = await asyncio.gather(*(self._spawn() for _ in range(self.size)))
+            for worker in workers:
+                idle.put_nowait(worker)
+            self._idle = idle
+            logging.info(f"샌드박스 워커 {self.size}개를 시작했습니다.")
+
+    @property
+    def started(self):
+        return self._idle is not None
+
+    async def stop(self):
+        workers = list(self._workers)
+        self._workers.clear()
+        self._idle = None
+        self._missing = 0
+        await asyncio.gather(*(worker.kill() for worker in workers), return_exceptions=True)
+
+    async def run(self, code, input_example):
+        """
+        코드를 워커에서 실행하고 출력 문자열을 반환합니다.
+        실행 오류, 시간 초과, 워커 비정상 종료는 SandboxError로 올립니다.
+        """
+        if self._idle is None:
+            await self.start()
+        if self._missing:
+            await self._replenish()
+        worker = await self._idle.get()
+        self.busy += 1
+        self.jobs += 1
+        replace = False
+        try:
+            try:
+                result = await worker.execute(code, input_example, self.timeout)
+            except asyncio.CancelledError:
+                # 응답을 읽기 전에 취소되면 워커와의 요청/응답 순서가 어긋나므로 교체
+                replace = True
+                raise
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                replace = True
+                raise SandboxError(f"실행 시간 제한({self.timeout:g}초)을 초과했습니다.")
+            except (ConnectionResetError, BrokenPipeError, ValueError):
+                self.crashes += 1
+                replace = True
+                raise SandboxError("실행 중 자원 제한을 초과해 프로세스가 종료되었습니다.")
+            if not result["ok"]:
+                raise SandboxError(result["error"])
+            return result["output"]
+        finally:
+            self.busy -= 1
+            if not replace and worker.jobs >= self.max_jobs_per_worker:
+                self.recycled += 1
+                replace = True
+            if replace or not worker.alive:
+                await self._retire(worker)
+                # 풀이 이미 종료되었다면 새 워커를 띄우지 않음. 띄우지 못해도 원래 오류를 그대로 올림
+                worker = await self._replace() if self._idle is not None else None
+            if worker is not None and self._idle is not None:
+                self._idle.put_nowait(worker)
+
+    def metrics(self):
+        return {
+            "size": self.size,
+            "busy": self.busy,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "jobs": self.jobs,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "recycled": self.recycled,
+            "spawned": self.spawned,
+            "spawn_failures": self.spawn_failures,
+            "missing": self._missing,
+            "timeout_sec": self.timeout,
+            "cpu_seconds": self.cpu_seconds,
+            "memory_mb": self.memory_mb,
+            "max_output_bytes": self.max_output_bytes,
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+        }
+
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_sandbox_pool():
+    """
+    프로세스 전역에서 공유되는 SandboxPool을 반환합니다.
+    """
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_lock:
+            if _shared_pool is None:
+                _shared_pool = SandboxPool()
+    return _shared_pool
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="샌드박스 워커")
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--cpu-seconds", type=int, default=5)
+    parser.add_argument("--memory-mb", type=int, default=512)
+    parser.add_argument("--max-output", type=int, default=65536)
+    worker_main(parser.parse_args())
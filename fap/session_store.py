@@ -0,0 +1,693 @@
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field, fields
+
+DEFAULT_SPILL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "sessions.db"
+)
+
+
+# --------------------------
+# UserSession / UserProgress 레코드
+# --------------------------
+@dataclass(slots=True)
+class UserSession:
+    """
+    사용자 세션 상태. 기존 코드와의 호환을 위해 dict처럼 session["key"]로도 접근할 수 있고,
+    정의되지 않은 키는 extra에 저장됩니다.
+    """
+    current_topic: str = "파이썬이란?"
+    topic_index: int = 0
+    last_problem: int = 0
+    feedback: list = field(default_factory=list, metadata={"merge": "append"})
+    last_feedback_time: float = field(default_factory=time.time)
+    feedback_count: int = field(default=0, metadata={"merge": "counter"})
+    interaction_count: int = field(default=0, metadata={"merge": "counter"})
+    current_exercises: list = field(default_factory=list, metadata={"merge": "items"})
+    state: dict = field(default_factory=dict)
+    hint_counts: dict = field(default_factory=dict, metadata={"merge": "counter"})
+    difficulty_level: str = "쉬움"
+    last_response: str = ""
+    extra: dict = field(default_factory=dict)
+
+    def __getitem__(self, key):
+        if key in _SESSION_FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key, value):
+        if key in _SESSION_FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return key in _SESSION_FIELDS or key in self.extra
+
+    def get(self, key, default=None):
+        if key in _SESSION_FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {k: v for k, v in data.items() if k in _SESSION_FIELDS and k != "extra"}
+        extra = dict(data.get("extra", {}))
+        extra.update({k: v for k, v in data.items() if k not in _SESSION_FIELDS})
+        return cls(**known, extra=extra)
+
+
+_SESSION_FIELDS = frozenset(f.name for f in fields(UserSession))
+
+
+@dataclass(slots=True)
+class UserProgress:
+    user_id: str = None
+    current_topic: str = None
+    topic_index: int = 0
+    last_problem_number: int = 0
+    interaction_count: int = field(default=0, metadata={"merge": "counter"})
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+@dataclass(slots=True)
+class ExerciseSetCache:
+    """
+    사용자별로 이미 받아 온 연습문제 세트와, 다음에 이어서 받을 위치(마지막 제출 id).
+    """
+    cursor: int = field(default=0, metadata={"merge": "max"})
+    exercises: list = field(default_factory=list, metadata={"merge": "append"})
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    객체와 그 안의 컨테이너/문자열이 차지하는 메모리를 대략적으로 합산합니다.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__slots__"):
+        size += sum(
+            deep_sizeof(getattr(obj, name), seen)
+            for name in obj.__slots__ if hasattr(obj, name)
+        )
+    return size
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _merge_dict(base, local, remote, rule=None):
+    merged = dict(remote)
+    for key, value in local.items():
+        if key not in base:
+            if rule == "counter" and _is_number(value) and _is_number(remote.get(key)):
+                # 두 워커가 같은 키를 새로 만들었으면 0에서 시작한 카운터로 보고 더함
+                merged[key] = remote[key] + value
+            else:
+                merged[key] = value
+        elif base[key] != value:
+            merged[key] = _merge_field(base[key], value, remote.get(key), rule)
+    for key in base:
+        if key not in local:
+            merged.pop(key, None)
+    return merged
+
+
+def _merge_field(base, local, remote, rule=None):
+    """
+    base(마지막으로 동기화한 값)에서 이 워커가 local로 바꾼 내용을 remote(다른 워커가 저장한 최신 값)에 적용합니다.
+    필드 메타데이터의 merge 규칙:
+        counter  증가분을 더함 (dict면 키마다)
+        append   base 뒤에 붙인 항목만 remote 뒤에 붙임
+        items    길이가 같으면 바뀐 위치의 항목만 반영 (풀이 여부 표시 등)
+        max      큰 값을 사용
+    규칙이 없거나 적용할 수 없으면 이 워커의 값을 사용합니다.
+    """
+    if local == base:
+        return remote
+    if remote == base:
+        return local
+    if rule == "counter" and _is_number(base) and _is_number(local) and _is_number(remote):
+        return remote + (local - base)
+    if rule == "max" and _is_number(local) and _is_number(remote):
+        return max(local, remote)
+    if isinstance(base, dict) and isinstance(local, dict) and isinstance(remote, dict):
+        return _merge_dict(base, local, remote, rule)
+    if isinstance(base, list) and isinstance(local, list) and isinstance(remote, list):
+        if rule == "append" and local[:len(base)] == base:
+            return remote + local[len(base):]
+        if rule == "items" and len(local) == len(base):
+            if len(remote) != len(base):
+                # 다른 워커가 목록을 새로 만들었으면 이전 목록에 한 변경은 버림
+                return remote
+            return [
+                _merge_field(b, l, r) for b, l, r in zip(base, local, remote)
+            ]
+    return local
+
+
+# --------------------------
+# 세션 백엔드
+# --------------------------
+class VersionConflict(Exception):
+    """
+    저장하려는 레코드의 버전이 백엔드의 현재 버전과 다를 때 발생합니다.
+    (다른 워커가 먼저 같은 사용자의 상태를 갱신한 경우)
+    """
+
+    def __init__(self, user_id, expected_version, actual_version):
+        super().__init__(
+            f"세션 버전 충돌 ({user_id}): 예상 {expected_version}, 실제 {actual_version}"
+        )
+        self.user_id = user_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
+class InMemorySessionBackend:
+    """
+    프로세스 메모리에만 보관하는 백엔드 (단일 프로세스 실행/개발용).
+    레코드는 JSON 문자열과 버전 번호로 저장하며, 버전 0은 레코드가 없다는 뜻입니다.
+    """
+    kind = "memory"
+
+    def __init__(self):
+        self._rows = {}
+        self._lock = threading.Lock()
+
+    def load(self, user_id):
+        with self._lock:
+            return self._rows.get(user_id)
+
+    def version(self, user_id):
+        with self._lock:
+            row = self._rows.get(user_id)
+            return row[1] if row else 0
+
+    def save(self, user_id, data, expected_version):
+        with self._lock:
+            current = self._rows.get(user_id)
+            current_version = current[1] if current else 0
+            if current_version != expected_version:
+                raise VersionConflict(user_id, expected_version, current_version)
+            self._rows[user_id] = (data, current_version + 1)
+            return current_version + 1
+
+    def delete(self, user_id):
+        with self._lock:
+            return self._rows.pop(user_id, None) is not None
+
+    def close(self):
+        pass
+
+
+class SQLiteSessionBackend:
+    """
+    SQLite 파일에 저장하는 백엔드. 같은 파일을 여러 워커 프로세스가 함께 쓸 수 있으며,
+    갱신은 `WHERE version = ?` 조건부 UPDATE로 처리해 낙관적 동시성을 보장합니다.
+    """
+    kind = "sqlite"
+
+    def __init__(self, table, path=None):
+        self.table = table
+        self.path = path or os.getenv("SESSION_SPILL_PATH", DEFAULT_SPILL_PATH)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(user_id TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL, "
+                "version INTEGER NOT NULL DEFAULT 1)"
+            )
+            columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({self.table})")]
+            if "version" not in columns:
+                # 버전 컬럼이 없던 이전 스필 파일도 그대로 사용
+                self._conn.execute(
+                    f"ALTER TABLE {self.table} ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+                )
+            self._conn.commit()
+        return self._conn
+
+    def load(self, user_id):
+        with self._lock:
+            return self._connect().execute(
+                f"SELECT data, version FROM {self.table} WHERE user_id = ?", (user_id,)
+            ).fetchone()
+
+    def version(self, user_id):
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT version FROM {self.table} WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def save(self, user_id, data, expected_version):
+        with self._lock:
+            conn = self._connect()
+            try:
+                if expected_version == 0:
+                    conn.execute(
+                        f"INSERT INTO {self.table} (user_id, data, updated_at, version) "
+                        "VALUES (?, ?, ?, 1)",
+                        (user_id, data, time.time())
+                    )
+                    updated = 1
+                else:
+                    updated = conn.execute(
+                        f"UPDATE {self.table} SET data = ?, updated_at = ?, version = version + 1 "
+                        "WHERE user_id = ? AND version = ?",
+                        (data, time.time(), user_id, expected_version)
+                    ).rowcount
+                conn.commit()
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                updated = 0
+            if updated:
+                return expected_version + 1
+            row = conn.execute(
+                f"SELECT version FROM {self.table} WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        raise VersionConflict(user_id, expected_version, row[0] if row else 0)
+
+    def delete(self, user_id):
+        with self._lock:
+            conn = self._connect()
+            deleted = conn.execute(
+                f"DELETE FROM {self.table} WHERE user_id = ?", (user_id,)
+            ).rowcount
+            conn.commit()
+        return deleted > 0
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+SESSION_BACKENDS = {
+    "memory": lambda table: InMemorySessionBackend(),
+    "sqlite": lambda table: SQLiteSessionBackend(table),
+}
+
+
+def create_session_backend(table, name=None):
+    """
+    SESSION_BACKEND 환경변수(memory/sqlite)에 맞는 백엔드를 만듭니다.
+    여러 워커 프로세스를 띄울 때는 모두 같은 SESSION_SPILL_PATH의 sqlite 백엔드를 써야 합니다.
+    """
+    name = name or os.getenv("SESSION_BACKEND", "sqlite")
+    if name not in SESSION_BACKENDS:
+        raise ValueError(f"지원하지 않는 세션 백엔드입니다: {name}")
+    return SESSION_BACKENDS[name](table)
+
+
+# --------------------------
+# BoundedStore 클래스
+# --------------------------
+class _UserIOLock:
+    """
+    한 사용자의 백엔드 입출력을 순서대로 처리하기 위한 잠금 (WeakValueDictionary에 넣을 수 있도록 감쌈).
+    """
+    __slots__ = ("_lock", "__weakref__")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._lock.release()
+        return False
+
+
+class BoundedStore:
+    """
+    user_id -> 레코드를 보관하는 크기 제한 저장소.
+    메모리에는 최근에 쓰인 레코드만 LRU로 두고, 원본은 세션 백엔드에 버전과 함께 저장합니다.
+    capacity를 넘거나 idle_ttl 동안 쓰이지 않은 레코드는 백엔드에 기록한 뒤 내보냅니다.
+
+    여러 워커가 같은 백엔드를 공유할 때는 요청 시작에 acquire()(또는 refresh()), 끝에 release()(또는 commit())를 호출합니다.
+    commit 중 버전 충돌이 나면 이 워커가 바꾼 내용만 최신 레코드 위에 적용해 다시 저장합니다.
+
+    백엔드 입출력은 acquire()/release()/refresh()/commit()/flush()에서만 하며, 이벤트 루프에서는 이들을
+    워커 스레드에서 호출합니다. dict 방식의 조회/저장(in, [], get)은 메모리에 있는 레코드만 다루므로
+    메모리에 없는 사용자의 레코드는 먼저 acquire()로 읽어 와야 합니다.
+    acquire()한 사용자는 release()까지 내보내지 않고(pin), 내보내기는 release() 때 한꺼번에 합니다.
+
+    공용 잠금(_lock)은 메모리 상태를 읽고 쓰는 동안만 잡고, 백엔드 입출력은 사용자별 잠금만 잡고 하므로
+    한 사용자의 저장이 느려도 다른 사용자의 조회나 저장을 막지 않습니다.
+    """
+    MAX_MERGE_ATTEMPTS = 5
+
+    def __init__(self, name, record_type, capacity=None, idle_ttl=None, backend=None):
+        self.name = name
+        self.record_type = record_type
+        self.capacity = capacity or int(os.getenv("SESSION_CAPACITY", "10000"))
+        self.idle_ttl = idle_ttl or float(os.getenv("SESSION_IDLE_TTL", "1800"))
+        self.backend = backend or create_session_backend(name)
+        self._merge_rules = {f.name: f.metadata.get("merge") for f in fields(record_type)}
+        self._resident = OrderedDict()
+        self._last_access = {}
+        # 백엔드에서 마지막으로 읽거나 쓴 버전과 그때의 JSON (변경 감지와 충돌 병합에 사용)
+        self._versions = {}
+        self._synced = {}
+        # acquire()로 사용 중인 사용자별 횟수 (0보다 크면 내보내지 않음)
+        self._pins = {}
+        self._lock = threading.Lock()
+        self._io_locks = weakref.WeakValueDictionary()
+        self._last_sweep = time.monotonic()
+        self.evictions = 0
+        self.idle_evictions = 0
+        self.rehydrations = 0
+        self.writes = 0
+        self.conflicts = 0
+        self.reloads = 0
+
+    def _coerce(self, record):
+        if isinstance(record, self.record_type):
+            return record
+        return self.record_type.from_dict(record)
+
+    def _encode(self, record):
+        return json.dumps(record.to_dict(), ensure_ascii=False, sort_keys=True)
+
+    def _io_lock(self, user_id):
+        with self._lock:
+            lock = self._io_locks.get(user_id)
+            if lock is None:
+                lock = _UserIOLock()
+                self._io_locks[user_id] = lock
+            return lock
+
+    def _read(self, user_id):
+        row = self.backend.load(user_id)
+        if row is None:
+            return None
+        data, version = row
+        return self.record_type.from_dict(json.loads(data)), data, version
+
+    def _install(self, user_id, loaded):
+        record, data, version = loaded
+        self._resident[user_id] = record
+        self._versions[user_id] = version
+        self._synced[user_id] = data
+
+    def _merge(self, user_id, record, local_data, synced):
+        """
+        버전 충돌 시 최신 레코드를 읽어 와 이 워커가 바꾼 내용만 그 위에 적용합니다.
+        카운터는 증가분을 더하고 목록은 새로 붙인 항목만 붙이는 등 필드별 merge 규칙을 따릅니다.
+        새 기준 (버전, JSON)을 반환합니다.
+        """
+        row = self.backend.load(user_id)
+        if row is None:
+            # 그사이 레코드가 삭제되었다면 이 워커의 레코드를 그대로 다시 저장
+            remote_data, remote_version = None, 0
+            merged = json.loads(local_data)
+        else:
+            remote_data, remote_version = row
+            base = json.loads(synced or "{}")
+            merged = json.loads(remote_data)
+            for key, value in json.loads(local_data).items():
+                if key not in base:
+                    merged[key] = value
+                elif base[key] != value:
+                    merged[key] = _merge_field(
+                        base[key], value, merged.get(key), self._merge_rules.get(key)
+                    )
+        merged_record = self.record_type.from_dict(merged)
+        # 요청 처리 중인 코드가 같은 객체를 참조하고 있으므로 필드를 제자리에서 갱신
+        for f in fields(record):
+            setattr(record, f.name, getattr(merged_record, f.name))
+        with self._lock:
+            self._versions[user_id] = remote_version
+            self._synced[user_id] = remote_data
+        return remote_version, remote_data
+
+    def _sync(self, user_id):
+        # 호출하는 쪽이 사용자별 잠금을 잡고 있어야 함
+        with self._lock:
+            record = self._resident.get(user_id)
+            if record is None:
+                return
+            version = self._versions.get(user_id, 0)
+            synced = self._synced.get(user_id)
+        for _ in range(self.MAX_MERGE_ATTEMPTS):
+            data = self._encode(record)
+            if data == synced:
+                return
+            try:
+                version = self.backend.save(user_id, data, version)
+            except VersionConflict:
+                with self._lock:
+                    self.conflicts += 1
+                version, synced = self._merge(user_id, record, data, synced)
+                continue
+            with self._lock:
+                self._versions[user_id] = version
+                self._synced[user_id] = data
+                self.writes += 1
+            return
+        raise VersionConflict(user_id, version, self.backend.version(user_id))
+
+    def _forget(self, user_id):
+        self._resident.pop(user_id, None)
+        self._last_access.pop(user_id, None)
+        self._versions.pop(user_id, None)
+        self._synced.pop(user_id, None)
+
+    def _evict(self, user_id):
+        with self._io_lock(user_id):
+            with self._lock:
+                if user_id in self._pins or user_id not in self._resident:
+                    # 고르는 사이 다른 요청이 사용하기 시작했거나 이미 내보낸 경우
+                    return False
+            try:
+                self._sync(user_id)
+            except (sqlite3.Error, VersionConflict) as e:
+                logging.error(f"{self.name} 레코드 저장 실패 ({user_id}): {e}")
+            with self._lock:
+                if user_id in self._pins:
+                    return False
+                self._forget(user_id)
+            return True
+
+    def _select_evictions(self):
+        # 공용 잠금을 잡은 채로 내보낼 사용자만 고르고, 실제 기록은 잠금 밖에서 함
+        now = time.monotonic()
+        idle, overflow = [], []
+        # 유휴 레코드 정리는 접근 순서(LRU) 앞쪽부터 만료되지 않은 항목을 만날 때까지만 확인
+        if now - self._last_sweep >= min(self.idle_ttl / 10, 60):
+            self._last_sweep = now
+            for user_id in self._resident:
+                if now - self._last_access[user_id] < self.idle_ttl:
+                    break
+                if user_id not in self._pins:
+                    idle.append(user_id)
+        excess = len(self._resident) - len(idle) - self.capacity
+        if excess > 0:
+            chosen = set(idle)
+            for user_id in self._resident:
+                if len(overflow) >= excess:
+                    break
+                if user_id not in self._pins and user_id not in chosen:
+                    overflow.append(user_id)
+        return idle, overflow
+
+    def _maintain(self):
+        with self._lock:
+            idle, overflow = self._select_evictions()
+        for user_id in idle:
+            if self._evict(user_id):
+                with self._lock:
+                    self.idle_evictions += 1
+        for user_id in overflow:
+            if self._evict(user_id):
+                with self._lock:
+                    self.evictions += 1
+
+    def _touch(self, user_id):
+        self._resident.move_to_end(user_id)
+        self._last_access[user_id] = time.monotonic()
+
+    def __contains__(self, user_id):
+        with self._lock:
+            return user_id in self._resident
+
+    def __getitem__(self, user_id):
+        with self._lock:
+            record = self._resident[user_id]
+            self._touch(user_id)
+            return record
+
+    def __setitem__(self, user_id, record):
+        with self._lock:
+            self._resident[user_id] = self._coerce(record)
+            self._touch(user_id)
+
+    def __delitem__(self, user_id):
+        with self._io_lock(user_id):
+            with self._lock:
+                found = user_id in self._resident
+                self._forget(user_id)
+            if not self.backend.delete(user_id) and not found:
+                raise KeyError(user_id)
+
+    def get(self, user_id, default=None):
+        try:
+            return self[user_id]
+        except KeyError:
+            return default
+
+    def __len__(self):
+        return len(self._resident)
+
+    def acquire(self, user_id):
+        """
+        요청을 시작할 때 (워커 스레드에서) 호출합니다. 레코드를 백엔드에서 읽어 와 메모리에 두고
+        release()까지 내보내지 않도록 고정합니다. 다른 워커가 저장한 최신 상태도 반영합니다.
+        """
+        with self._lock:
+            self._pins[user_id] = self._pins.get(user_id, 0) + 1
+        try:
+            with self._io_lock(user_id):
+                if user_id in self:
+                    self._refresh(user_id)
+                else:
+                    loaded = self._read(user_id)
+                    if loaded is not None:
+                        with self._lock:
+                            self._install(user_id, loaded)
+                            self.rehydrations += 1
+        except Exception:
+            with self._lock:
+                self._unpin(user_id)
+            raise
+        with self._lock:
+            if user_id in self._resident:
+                self._touch(user_id)
+
+    def release(self, user_id):
+        """
+        요청이 끝날 때 (워커 스레드에서) 호출합니다. 변경 사항을 저장하고 고정을 풀며,
+        용량을 넘었거나 오래 쓰이지 않은 레코드를 이때 내보냅니다.
+        """
+        try:
+            self.commit(user_id)
+        finally:
+            with self._lock:
+                self._unpin(user_id)
+            self._maintain()
+
+    def _unpin(self, user_id):
+        count = self._pins.get(user_id, 0) - 1
+        if count > 0:
+            self._pins[user_id] = count
+        else:
+            self._pins.pop(user_id, None)
+
+    def _refresh(self, user_id):
+        self._sync(user_id)
+        version = self.backend.version(user_id)
+        with self._lock:
+            if user_id not in self._resident or version == self._versions.get(user_id, 0):
+                return
+        loaded = self._read(user_id)
+        with self._lock:
+            if loaded is None:
+                self._forget(user_id)
+            else:
+                self._install(user_id, loaded)
+            self.reloads += 1
+
+    def refresh(self, user_id):
+        """
+        다른 워커가 더 새 버전을 저장했다면 메모리의 레코드를 최신 상태로 바꿉니다.
+        아직 저장하지 않은 변경이 있으면 먼저 병합해 저장합니다.
+        """
+        with self._io_lock(user_id):
+            self._refresh(user_id)
+
+    def commit(self, user_id):
+        """
+        레코드가 바뀌었으면 백엔드에 저장합니다.
+        """
+        with self._io_lock(user_id):
+            self._sync(user_id)
+
+    def flush(self):
+        """
+        상주 중인 레코드를 모두 백엔드에 기록합니다 (종료 시 호출).
+        """
+        with self._lock:
+            user_ids = list(self._resident)
+        for user_id in user_ids:
+            try:
+                self.commit(user_id)
+            except (sqlite3.Error, VersionConflict) as e:
+                logging.error(f"{self.name} 레코드 저장 실패 ({user_id}): {e}")
+
+    def close(self):
+        self.flush()
+        self.backend.close()
+
+    def memory_estimate(self):
+        with self._lock:
+            records = [
+                (record, self._synced.get(user_id, "")) for user_id, record in self._resident.items()
+            ]
+        return sum(deep_sizeof(record) + sys.getsizeof(synced) for record, synced in records)
+
+    def stats(self):
+        return {
+            "backend": self.backend.kind,
+            "resident": len(self._resident),
+            "pinned": len(self._pins),
+            "capacity": self.capacity,
+            "idle_ttl_sec": self.idle_ttl,
+            "evictions": self.evictions,
+            "idle_evictions": self.idle_evictions,
+            "rehydrations": self.rehydrations,
+            "writes": self.writes,
+            "version_conflicts": self.conflicts,
+            "reloads": self.reloads,
+            "resident_bytes_estimate": self.memory_estimate(),
+        }
@@ -0,0 +1,306 @@
+"""
+제출 코드와 정답(또는 다른 제출) 사이의 유사도를 토큰 단위로 계산합니다.
+
+코드를 tokenize로 나눈 뒤 주석/공백을 버리고 사용자 정의 식별자를 ID로 바꿔 k-gram(shingle) 집합을
+만들고, 이를 MinHash 서명으로 요약합니다. 정답 비교에서는 숫자/문자열 리터럴 값을 그대로 남겨
+출력값만 다른 코드가 통과하지 않게 하고, 제출끼리의 표절 검사에서는 리터럴도 NUM/STR로 바꿔
+값만 고친 복사도 찾아냅니다.
+서명끼리의 비교는 코드 길이와 관계없이 NUM_PERM번의 정수 비교로 끝나며,
+LSH 밴드 인덱스로 한 문제의 과거 제출 전체에서 비슷한 코드를 바로 찾을 수 있습니다.
+"""
+import ast
+import builtins
+import hashlib
+import io
+import keyword
+import os
+import random
+import re
+import threading
+import tokenize
+import zlib
+from collections import OrderedDict, deque
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_BUILTIN_NAMES = frozenset(dir(builtins))
+_SKIP_TOKENS = {
+    tokenize.COMMENT, tokenize.NL, tokenize.NEWLINE, tokenize.ENCODING, tokenize.ENDMARKER,
+}
+_FALLBACK_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def _literal_token(text):
+    # 따옴표 종류나 숫자 표기(1_000, 0x10 등)가 달라도 같은 값이면 같은 토큰이 되도록 값으로 바꿈
+    try:
+        return repr(ast.literal_eval(text))
+    except (ValueError, SyntaxError):
+        return text
+
+
+def normalize_tokens(code, keep_literals=False):
+    """
+    코드를 이름/공백에 둔감한 토큰 목록으로 바꿉니다.
+    키워드, 내장 함수 이름, 연산자는 그대로 두고 나머지 식별자는 ID로 바꿉니다.
+    리터럴은 keep_literals가 참이면 값 그대로, 아니면 NUM/STR로 바꿉니다.
+    """
+    tokens = []
+    try:
+        for tok in tokenize.generate_tokens(io.StringIO(code).readline):
+            if tok.type in _SKIP_TOKENS:
+                continue
+            if tok.type == tokenize.NAME:
+                if keyword.iskeyword(tok.string) or tok.string in _BUILTIN_NAMES:
+                    tokens.append(tok.string)
+                else:
+                    tokens.append("ID")
+            elif tok.type in (tokenize.NUMBER, tokenize.STRING) and keep_literals:
+                tokens.append(_literal_token(tok.string))
+            elif tok.type == tokenize.NUMBER:
+                tokens.append("NUM")
+            elif tok.type == tokenize.STRING:
+                tokens.append("STR")
+            elif tok.type == tokenize.INDENT:
+                tokens.append("INDENT")
+            elif tok.type == tokenize.DEDENT:
+                tokens.append("DEDENT")
+            else:
+                tokens.append(tok.string)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        # 문법 오류가 있는 제출도 비교할 수 있도록 단순 정규식 분할로 대체
+        tokens = [
+            "ID" if t.isidentifier() and not keyword.iskeyword(t) and t not in _BUILTIN_NAMES
+            else "NUM" if t.isdigit() and not keep_literals else t
+            for t in _FALLBACK_TOKEN.findall(code)
+        ]
+    return tokens
+
+
+def shingles(tokens, k):
+    """
+    토큰 k-gram을 32비트 정수 해시 집합으로 만듭니다.
+    """
+    if len(tokens) < k:
+        return {zlib.crc32(" ".join(tokens).encode("utf-8"))} if tokens else set()
+    return {
+        zlib.crc32("\x1f".join(tokens[i:i + k]).encode("utf-8"))
+        for i in range(len(tokens) - k + 1)
+    }
+
+
+# --------------------------
+# MinHasher 클래스
+# --------------------------
+class MinHasher:
+    """
+    shingle 집합을 길이 num_perm의 MinHash 서명으로 바꿉니다.
+    같은 seed를 쓰면 프로세스가 달라도 같은 서명이 나옵니다.
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self._params = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set):
+        if not shingle_set:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min((a * s + b) % _MERSENNE_PRIME for s in shingle_set) & _MAX_HASH
+            for a, b in self._params
+        )
+
+    @staticmethod
+    def similarity(sig_a, sig_b):
+        """
+        두 서명이 일치하는 비율 = shingle 집합 Jaccard 유사도의 추정값.
+        """
+        if not sig_a or len(sig_a) != len(sig_b):
+            return 0.0
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+# --------------------------
+# LSHIndex 클래스
+# --------------------------
+class LSHIndex:
+    """
+    MinHash 서명을 bands개의 구간으로 나눠 버킷에 넣는 인덱스.
+    한 구간이라도 같은 버킷에 들어간 서명만 후보로 비교하므로 저장된 제출 수와 거의 관계없이 조회됩니다.
+    max_items를 넘으면 가장 오래된 항목부터 지웁니다.
+    """
+
+    def __init__(self, num_perm, bands, max_items):
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_items = max_items
+        self._buckets = [{} for _ in range(bands)]
+        self._signatures = {}
+        self._order = deque()
+
+    def _band_keys(self, signature):
+        return [
+            signature[band * self.rows:(band + 1) * self.rows]
+            for band in range(self.bands)
+        ]
+
+    def remove(self, key):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            members = buckets.get(band_key)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del buckets[band_key]
+
+    def add(self, key, signature):
+        if key in self._signatures:
+            self.remove(key)
+        else:
+            self._order.append(key)
+        self._signatures[key] = signature
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(band_key, set()).add(key)
+        while len(self._signatures) > self.max_items and self._order:
+            self.remove(self._order.popleft())
+
+    def query(self, signature, threshold, exclude=None):
+        candidates = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates |= buckets.get(band_key, set())
+        candidates.discard(exclude)
+        results = []
+        for key in candidates:
+            score = MinHasher.similarity(signature, self._signatures[key])
+            if score >= threshold:
+                results.append((key, score))
+        results.sort(key=lambda item: item[1], reverse=True)
+        return results
+
+    def __len__(self):
+        return len(self._signatures)
+
+
+# --------------------------
+# SimilarityEngine 클래스
+# --------------------------
+class SimilarityEngine:
+    """
+    문제별 정답 서명과 과거 제출 LSH 인덱스를 관리합니다.
+    정답 서명은 정답이 저장될 때 미리 계산해 두고, 정답 코드가 바뀌면 다시 계산합니다.
+    정답 비교용 서명(answer_signature)은 리터럴 값을 남기고, 표절 검사용 서명(signature)은 리터럴도 정규화합니다.
+
+    기본값(shingle 4개, 기준 0.8)은 식별자 이름/따옴표/주석/빈 줄만 다른 코드는 1.0, 출력 문자열이나
+    상수만 바꾼 코드, 연산자 하나를 바꾼 코드는 0.6 이하가 나오도록 맞춘 값입니다.
+    """
+
+    def __init__(self, shingle_size=None, num_perm=None, bands=None, threshold=None,
+                 max_problems=None, max_submissions=None):
+        self.shingle_size = shingle_size or int(os.getenv("SIMILARITY_SHINGLE_SIZE", "4"))
+        num_perm = num_perm or int(os.getenv("SIMILARITY_NUM_PERM", "64"))
+        self.bands = bands or int(os.getenv("SIMILARITY_BANDS", "16"))
+        self.threshold = threshold or float(os.getenv("SIMILARITY_THRESHOLD", "0.8"))
+        self.max_problems = max_problems or int(os.getenv("SIMILARITY_MAX_PROBLEMS", "2048"))
+        self.max_submissions = max_submissions or int(
+            os.getenv("SIMILARITY_MAX_SUBMISSIONS", "1000")
+        )
+        self.hasher = MinHasher(num_perm)
+        self._lock = threading.Lock()
+        self._answers = OrderedDict()
+        self._indexes = OrderedDict()
+        self.answer_signatures_computed = 0
+        self.comparisons = 0
+
+    def signature(self, code):
+        return self.hasher.signature(shingles(normalize_tokens(code), self.shingle_size))
+
+    def answer_signature(self, code):
+        return self.hasher.signature(
+            shingles(normalize_tokens(code, keep_literals=True), self.shingle_size)
+        )
+
+    def _remember(self, table, key, value, limit):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > limit:
+            table.popitem(last=False)
+
+    def set_answer(self, problem_number, answer_code):
+        """
+        정답 서명을 계산해 둡니다. 같은 코드라면 다시 계산하지 않습니다.
+        """
+        digest = hashlib.sha256(answer_code.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._answers.get(problem_number)
+            if cached is not None and cached[0] == digest:
+                self._answers.move_to_end(problem_number)
+                return cached[1]
+        signature = self.answer_signature(answer_code)
+        with self._lock:
+            self._remember(self._answers, problem_number, (digest, signature), self.max_problems)
+            self.answer_signatures_computed += 1
+        return signature
+
+    def similarity_to_answer(self, problem_number, answer_code, user_code, signature=None):
+        """
+        signature를 넘길 때는 answer_signature()로 만든 서명이어야 합니다.
+        """
+        answer_signature = self.set_answer(problem_number, answer_code)
+        self.comparisons += 1
+        return MinHasher.similarity(answer_signature, signature or self.answer_signature(user_code))
+
+    def index_submission(self, problem_number, key, user_code, signature=None):
+        signature = signature or self.signature(user_code)
+        with self._lock:
+            index = self._indexes.get(problem_number)
+            if index is None:
+                index = LSHIndex(self.hasher.num_perm, self.bands, self.max_submissions)
+            self._remember(self._indexes, problem_number, index, self.max_problems)
+            index.add(key, signature)
+        return signature
+
+    def find_similar(self, problem_number, user_code, threshold=None, exclude=None, signature=None):
+        """
+        같은 문제의 과거 제출 중 threshold 이상 비슷한 것을 (key, 유사도) 목록으로 반환합니다.
+        """
+        signature = signature or self.signature(user_code)
+        with self._lock:
+            index = self._indexes.get(problem_number)
+            if index is None:
+                return []
+            return index.query(signature, threshold or self.threshold, exclude=exclude)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "answers": len(self._answers),
+                "indexed_problems": len(self._indexes),
+                "indexed_submissions": sum(len(index) for index in self._indexes.values()),
+                "answer_signatures_computed": self.answer_signatures_computed,
+                "comparisons": self.comparisons,
+                "shingle_size": self.shingle_size,
+                "num_perm": self.hasher.num_perm,
+                "bands": self.bands,
+                "threshold": self.threshold,
+            }
+
+
+_shared_engine = None
+_shared_lock = threading.Lock()
+
+
+def get_similarity_engine():
+    """
+    프로세스 전역에서 공유되는 SimilarityEngine을 반환합니다.
+    """
+    global _shared_engine
+    if _shared_engine is None:
+        with _shared_lock:
+            if _shared_engine is None:
+                _shared_engine = SimilarityEngine()
+    return _shared_engine
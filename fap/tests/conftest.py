@@ -0,0 +1,21 @@
+import os
+import sys
+import tempfile
+
+# fap/ 모듈은 패키지가 아니라 같은 디렉터리에서 서로 임포트하므로 경로에 추가
+FAP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if FAP_DIR not in sys.path:
+    sys.path.insert(0, FAP_DIR)
+
+# 로그, 캐시, 스풀 파일이 저장소 안에 만들어지지 않도록 임시 디렉터리 사용
+_TMP_DIR = tempfile.mkdtemp(prefix="fap-tests-")
+for name, filename in (
+    ("LOG_FILE", "python_tutor.log"),
+    ("SESSION_SPILL_PATH", "sessions.db"),
+    ("GENERATION_CACHE_PATH", "generation_cache.db"),
+    ("WRITE_BEHIND_SPOOL", "write_behind.db"),
+    ("INTENT_ROUTER_PATH", "intent_router.json"),
+):
+    os.environ.setdefault(name, os.path.join(_TMP_DIR, filename))
+os.environ.setdefault("LOG_CONSOLE", "0")
+os.environ.setdefault("BACKGROUND_WARMUP", "0")
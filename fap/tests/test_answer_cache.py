@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from answer_cache import AnswerCache
+
+
+class FakeLoader:
+    """
+    gate가 열릴 때까지 기다렸다가 answers의 값을 돌려주는 정답 조회 대역.
+    """
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self, problem_number):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        answer = self.answers[problem_number]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def test_concurrent_gets_share_one_load():
+    cache = AnswerCache()
+    loader = FakeLoader({"001": "print(1)"})
+
+    async def scenario():
+        loader.gate = asyncio.Event()
+        waiting = [asyncio.create_task(cache.get("001", loader)) for _ in range(10)]
+        await asyncio.sleep(0)
+        loader.gate.set()
+        results = await asyncio.gather(*waiting)
+        assert results == ["print(1)"] * 10
+        assert await cache.get("001", loader) == "print(1)"
+
+    asyncio.run(scenario())
+    assert loader.calls == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced_waits"], stats["hits"]) == (1, 9, 1)
+
+
+def test_failed_load_is_not_cached():
+    cache = AnswerCache()
+    loader = FakeLoader({"001": RuntimeError("backend down")})
+
+    async def scenario():
+        loader.gate = asyncio.Event()
+        waiting = [asyncio.create_task(cache.get("001", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        loader.gate.set()
+        results = await asyncio.gather(*waiting, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+        loader.answers["001"] = "print(1)"
+        assert await cache.get("001", loader) == "print(1)"
+
+    asyncio.run(scenario())
+    assert loader.calls == 2
+    assert cache.stats()["load_errors"] == 1
+
+
+def test_put_during_load_is_seen_by_every_waiter():
+    cache = AnswerCache()
+    loader = FakeLoader({"001": "old"})
+
+    async def scenario():
+        loader.gate = asyncio.Event()
+        waiting = [asyncio.create_task(cache.get("001", loader)) for _ in range(3)]
+        await asyncio.sleep(0)
+        cache.put("001", "new")
+        late = await cache.get("001", loader)
+        loader.gate.set()
+        return late, await asyncio.gather(*waiting)
+
+    late, results = asyncio.run(scenario())
+    assert late == "new"
+    assert results == ["new"] * 3
+    assert loader.calls == 1
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_invalidate_during_load_reloads(concurrency):
+    cache = AnswerCache()
+    loader = FakeLoader({"001": "old"})
+
+    async def scenario():
+        loader.gate = asyncio.Event()
+        waiting = [asyncio.create_task(cache.get("001", loader)) for _ in range(concurrency)]
+        await asyncio.sleep(0)
+        cache.invalidate("001")
+        loader.answers["001"] = "new"
+        loader.gate.set()
+        return await asyncio.gather(*waiting)
+
+    assert asyncio.run(scenario()) == ["new"] * concurrency
+    # 무효화 전에 시작한 조회 한 번과, 기다리던 요청들이 함께 다시 한 조회 한 번
+    assert loader.calls == 2
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import app as server
+
+THEORY_HEADER = "🤖 챗봇: {topic}에 대한 이론 설명입니다.\n\n"
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class ChunkingModel:
+    """
+    generate_content(prompt, stream=True)로 정해진 조각을 delay 간격으로 내보내는 모델 대역.
+    """
+
+    def __init__(self, chunks, delay=0.0):
+        self.chunks = chunks
+        self.delay = delay
+        self.stream_calls = 0
+        self.yielded = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False):
+        if not stream:
+            return FakeResponse("".join(self.chunks))
+        with self._lock:
+            self.stream_calls += 1
+        return self._stream()
+
+    def _stream(self):
+        for chunk in self.chunks:
+            time.sleep(self.delay)
+            self.yielded += 1
+            yield FakeResponse(chunk)
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+async def post_stream(message, user_id):
+    client = server.app.test_client()
+    response = await client.post("/api/chat/stream", json={"message": message, "user_id": user_id})
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    return parse_events(await response.get_data(as_text=True))
+
+
+@pytest.fixture
+def tutor(monkeypatch):
+    monkeypatch.setattr(server.tutor.prefetcher, "enabled", False)
+    return server.tutor
+
+
+def test_stream_orders_start_messages_done(tutor, monkeypatch):
+    model = ChunkingModel(["파이썬은 ", "간결하고 ", "읽기 쉽습니다."])
+    monkeypatch.setattr(tutor.content_generator, "_model", model)
+    events = asyncio.run(post_stream("파이썬의 특징 이론", "stream-order"))
+
+    names = [name for name, _ in events]
+    assert names[0] == "start" and names[-1] == "done"
+    assert set(names[1:-1]) == {"message"}
+    deltas = [data["delta"] for name, data in events if name == "message"]
+    assert deltas == [THEORY_HEADER.format(topic="파이썬의 특징"), *model.chunks]
+    assert events[0][1] == events[-1][1] == {"user_id": "stream-order"}
+    assert model.stream_calls == 1
+
+
+def test_cached_theory_is_sent_as_single_chunk(tutor, monkeypatch):
+    model = ChunkingModel(["변수는 ", "값에 붙이는 ", "이름입니다."])
+    monkeypatch.setattr(tutor.content_generator, "_model", model)
+
+    async def scenario():
+        first = await post_stream("변수 이론", "stream-cache-1")
+        second = await post_stream("변수 이론", "stream-cache-2")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    header = THEORY_HEADER.format(topic="변수")
+    assert [d["delta"] for n, d in first if n == "message"] == [header, *model.chunks]
+    assert [d["delta"] for n, d in second if n == "message"] == [header, "".join(model.chunks)]
+    assert model.stream_calls == 1
+
+
+def test_disconnect_keeps_partial_response(tutor, monkeypatch):
+    model = ChunkingModel([f"조각{i} " for i in range(40)], delay=0.02)
+    monkeypatch.setattr(tutor.content_generator, "_model", model)
+    user_id = "stream-disconnect"
+
+    async def scenario():
+        client = server.app.test_client()
+        async with client.request(
+            "/api/chat/stream", method="POST", headers={"Content-Type": "application/json"}
+        ) as connection:
+            await connection.send(json.dumps({"message": "숫자형 이론", "user_id": user_id}).encode())
+            await connection.send_complete()
+            received = b""
+            while received.count(b"event: message") < 3:
+                received += await connection.receive()
+            await connection.disconnect()
+        for _ in range(100):
+            session = tutor.session_manager.sessions.get(user_id)
+            if session is not None and session.last_response:
+                return session.last_response
+            await asyncio.sleep(0.02)
+        return None
+
+    last_response = asyncio.run(scenario())
+    assert last_response is not None
+    assert last_response.startswith(THEORY_HEADER.format(topic="숫자형") + "조각0 조각1 ")
+    # 끊긴 뒤에는 생성이 중단되어 전체 응답까지 가지 않음
+    assert len(last_response) < len(THEORY_HEADER.format(topic="숫자형") + "".join(model.chunks))
+    assert model.yielded < len(model.chunks)
+
+
+def test_stream_request_is_traced(tutor, monkeypatch):
+    from tracing import get_tracer
+
+    model = ChunkingModel(["문자열은 ", "글자의 나열입니다."])
+    monkeypatch.setattr(tutor.content_generator, "_model", model)
+    monkeypatch.setattr(get_tracer(), "slow_ms", 0)
+
+    async def scenario():
+        client = server.app.test_client()
+        response = await client.post(
+            "/api/chat/stream",
+            json={"message": "문자열 자료형 이론", "user_id": "stream-trace"},
+            headers={"X-Request-ID": "stream-trace-id"},
+        )
+        return parse_events(await response.get_data(as_text=True))
+
+    events = asyncio.run(scenario())
+    assert events[-1][0] == "done"
+    trace = get_tracer().get("stream-trace-id")
+    assert trace is not None
+    assert trace["name"] == "PythonTutor.stream_user_input"
+    names = [span["name"] for span in trace["spans"]]
+    assert "PythonTutor.intent_recognition" in names
+    assert trace["spans"][0]["duration_ms"] is not None
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import sandbox
+from ai import CodeVerifier, PythonTutor
+from sandbox import SandboxPool
+
+EXERCISES_TEXT = """1. 두 배 출력하기 (난이도: 쉬움)
+- 정수 하나를 입력받아 두 배를 출력하세요.
+입력 예:
+3
+출력 예:
+6
+입력 예:
+10
+출력 예:
+20
+---
+2. 더하기 (난이도: 쉬움)
+- 정수 두 개를 한 줄씩 입력받아 합을 출력하세요.
+입력 예:
+1
+2
+출력 예:
+3
+"""
+
+ANSWERS = {
+    "두 배 출력하기": "n = int(input())\nprint(n * 2)",
+    "더하기": "a = int(input())\nb = int(input())\nprint(a + b)",
+}
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGemini:
+    """
+    프롬프트 종류에 따라 정해진 응답을 돌려주는 Gemini 모델 대역.
+    실제 호출처럼 작업 스레드에서 잠시 멈추고, 동시에 진행 중인 호출 수의 최댓값을 기록합니다.
+    """
+
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def respond(self, prompt):
+        if "연습문제를 생성" in prompt:
+            return EXERCISES_TEXT
+        if "정답 코드를 작성" in prompt:
+            return next(code for question, code in ANSWERS.items() if question in prompt)
+        if "힌트" in prompt:
+            return "입력을 정수로 바꿔 보세요."
+        if "오류를 검토" in prompt:
+            return json.dumps({
+                "error_type": "논리 오류",
+                "error_line": "2",
+                "correction_suggestion": "두 배를 출력해야 합니다.",
+            }, ensure_ascii=False)
+        return "파이썬은 읽기 쉬운 언어입니다."
+
+    def generate_content(self, prompt, stream=False):
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            text = self.respond(prompt)
+        finally:
+            with self._lock:
+                self.active -= 1
+        if stream:
+            return iter([FakeResponse(text)])
+        return FakeResponse(text)
+
+
+class FakeInferenceEngine:
+    async def classify(self, code):
+        return "LogicError"
+
+
+def make_backend():
+    """
+    튜터가 호출하는 Spring 엔드포인트만 흉내 내는 백엔드 대역.
+    """
+    state = {"submissions": [], "answers": {}}
+
+    async def save_submission(request):
+        state["submissions"].append(await request.json())
+        return web.json_response({"ok": True})
+
+    async def save_submissions(request):
+        state["submissions"].extend(await request.json())
+        return web.json_response({"ok": True})
+
+    async def save_answer(request):
+        data = await request.json()
+        state["answers"][data["problem_number"]] = data
+        return web.json_response(data)
+
+    async def save_answers(request):
+        for data in await request.json():
+            state["answers"][data["problem_number"]] = data
+        return web.json_response({"ok": True})
+
+    async def get_answer(request):
+        answer = state["answers"].get(request.match_info["number"])
+        if answer is None:
+            raise web.HTTPNotFound()
+        return web.json_response(answer)
+
+    async def exercise_sets(request):
+        return web.json_response({"items": [], "next_cursor": 0, "has_more": False})
+
+    app = web.Application()
+    app.router.add_post("/api/submit-code", save_submission)
+    app.router.add_post("/api/submit-code/batch", save_submissions)
+    app.router.add_post("/api/save-answer", save_answer)
+    app.router.add_post("/api/save-answer/batch", save_answers)
+    app.router.add_get("/api/get-answer/{number}", get_answer)
+    app.router.add_get("/api/submit-code/{user_id}/exercise-sets", exercise_sets)
+    return app, state
+
+
+async def simulate_user(tutor, user_id):
+    manager = tutor.session_manager
+    results = {}
+    async with manager.user_session(user_id):
+        results["exercises"] = await tutor.handle_user_input("변수 연습문제", user_id)
+    async with manager.user_session(user_id):
+        results["correct"] = await tutor.handle_code_submission(ANSWERS["두 배 출력하기"], "001", user_id)
+    async with manager.user_session(user_id):
+        results["wrong"] = await tutor.handle_code_submission(
+            "a = int(input())\nb = int(input())\nprint(a - b)", "002", user_id
+        )
+    async with manager.user_session(user_id):
+        results["hint"] = await tutor.handle_user_input("힌트 002", user_id)
+    return results
+
+
+@pytest.mark.parametrize("users", [20])
+def test_concurrent_users_are_isolated(users, monkeypatch, tmp_path):
+    monkeypatch.setenv("WRITE_BEHIND", "0")
+    monkeypatch.setenv("GENERATION_CACHE", "0")
+    monkeypatch.setenv("PREFETCH", "0")
+    monkeypatch.setenv("SESSION_SPILL_PATH", str(tmp_path / "sessions.db"))
+    pool = SandboxPool(size=2)
+    monkeypatch.setattr(sandbox, "_shared_pool", pool)
+    gemini = FakeGemini()
+
+    async def scenario():
+        app, state = make_backend()
+        server = TestServer(app)
+        await server.start_server()
+        monkeypatch.setenv("BACKEND_URL", str(server.make_url("")).rstrip("/"))
+        await pool.start()
+        tutor = PythonTutor(api_key=None)
+        tutor.content_generator.model = gemini
+        tutor.verifier = CodeVerifier(api_key=None, inference_engine=FakeInferenceEngine(), sandbox=pool)
+        tutor.verifier._gemini_model = gemini
+        try:
+            results = await asyncio.gather(
+                *(simulate_user(tutor, f"user-{i}") for i in range(users))
+            )
+            return tutor, state, results
+        finally:
+            await pool.stop()
+            await server.close()
+
+    tutor, state, results = asyncio.run(scenario())
+
+    for result in results:
+        assert "두 배 출력하기" in result["exercises"]
+        assert result["correct"]["is_correct"] is True
+        assert result["wrong"]["success"] is True
+        assert result["wrong"]["is_correct"] is False
+        assert "두 배를 출력해야 합니다" in result["wrong"]["message"]
+        assert "002번 문제 힌트" in result["hint"]
+
+    sessions = tutor.session_manager.sessions
+    for i in range(users):
+        session = sessions[f"user-{i}"]
+        # 사용자마다 자기 요청 4번만 반영되고 다른 사용자의 상태가 섞이지 않음
+        assert session.interaction_count == 4
+        assert [e.get("solved", False) for e in session.current_exercises] == [True, False]
+        assert session.hint_counts == {"002": 1}
+
+    submissions = state["submissions"]
+    assert len(submissions) == 2 * users
+    assert {s["user_id"] for s in submissions} == {f"user-{i}" for i in range(users)}
+    assert sum(s["is_correct"] for s in submissions) == users
+    # 사용자 요청이 Gemini 호출을 기다리는 동안 다른 사용자의 요청도 진행됨
+    assert gemini.max_active > 1
@@ -0,0 +1,20 @@
+import asyncio
+
+import app as server
+
+
+def test_debug_stats_consolidates_component_stats():
+    async def scenario():
+        client = server.app.test_client()
+        everything = await (await client.get("/debug/stats")).get_json()
+        prefetch = await (await client.get("/debug/stats?component=prefetch")).get_json()
+        missing = await client.get("/debug/stats?component=nope")
+        removed = await client.get("/api/prefetch/metrics")
+        return everything, prefetch, missing.status_code, removed.status_code
+
+    everything, prefetch, missing, removed = asyncio.run(scenario())
+    assert {"http", "prefetch", "stream", "sessions", "intent", "logging", "tracing"} <= set(everything)
+    assert prefetch == everything["prefetch"]
+    assert missing == 404
+    # 기능별 지표 라우트는 /debug/stats로 합쳐짐
+    assert removed == 404
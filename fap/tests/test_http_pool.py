@@ -0,0 +1,151 @@
+import asyncio
+import threading
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from http_pool import HTTPPool, RetryPolicy
+
+
+def make_app(responses, peers):
+    """
+    경로별로 정해 둔 상태 코드를 차례로 돌려주는 백엔드 대역.
+    마지막 상태 코드는 이후 요청에도 계속 사용합니다.
+    """
+    calls = {}
+
+    async def handler(request):
+        peers.add(request.transport.get_extra_info("peername"))
+        path = request.path
+        index = calls.get(path, 0)
+        calls[path] = index + 1
+        codes = responses[path]
+        status = codes[min(index, len(codes) - 1)]
+        if status == 200:
+            return web.json_response({"ok": True, "attempt": index + 1})
+        return web.json_response({"error": status}, status=status)
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handler)
+    return app, calls
+
+
+async def run_with_server(responses, scenario):
+    peers = set()
+    app, calls = make_app(responses, peers)
+    server = TestServer(app)
+    await server.start_server()
+    pool = HTTPPool(retry_policy=RetryPolicy(max_retries=2, base_delay=0, max_delay=0))
+    try:
+        await scenario(pool, str(server.make_url("")))
+    finally:
+        await pool.close()
+        await server.close()
+    return pool, calls, peers
+
+
+def test_retries_5xx_and_429_then_succeeds():
+    async def scenario(pool, base):
+        result = await pool.request_json("GET", f"{base}/flaky", name="flaky")
+        assert result == {"ok": True, "attempt": 3}
+
+    pool, calls, _ = asyncio.run(run_with_server({"/flaky": [503, 429, 200]}, scenario))
+    assert calls["/flaky"] == 3
+    assert pool.retries == 2
+    assert pool.failures == 0
+    metrics = pool.metrics()["calls"]["flaky"]
+    assert metrics["count"] == 3
+    assert metrics["errors"] == 2
+
+
+def test_reuses_keepalive_connection_through_pool():
+    async def scenario(pool, base):
+        for _ in range(5):
+            await pool.request_json("POST", f"{base}/save", json={"x": 1}, name="save")
+        await asyncio.gather(*(pool.request_json("GET", f"{base}/save", name="save") for _ in range(5)))
+        for _ in range(3):
+            await pool.request_json("GET", f"{base}/save", name="save")
+
+    pool, calls, peers = asyncio.run(run_with_server({"/save": [200]}, scenario))
+    assert calls["/save"] == 13
+    assert pool.sessions_created == 1
+    # 순차 요청은 같은 연결을 다시 쓰고, 동시 요청 때 열린 연결 수를 넘지 않음
+    assert len(peers) <= 5
+    assert pool.in_flight == 0
+    assert pool.peak_in_flight >= 2
+
+
+def test_gives_up_after_max_retries():
+    async def scenario(pool, base):
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await pool.request_json("GET", f"{base}/down", name="down")
+        assert error.value.status == 500
+
+    pool, calls, _ = asyncio.run(run_with_server({"/down": [500]}, scenario))
+    assert calls["/down"] == 3
+    assert pool.retries == 2
+    assert pool.failures == 1
+
+
+def test_does_not_retry_client_errors():
+    async def scenario(pool, base):
+        with pytest.raises(aiohttp.ClientResponseError) as error:
+            await pool.request_json("GET", f"{base}/missing", name="missing")
+        assert error.value.status == 404
+
+    pool, calls, _ = asyncio.run(run_with_server({"/missing": [404, 200]}, scenario))
+    assert calls["/missing"] == 1
+    assert pool.retries == 0
+    assert pool.failures == 1
+
+
+def test_zero_retries_sends_once():
+    async def scenario(pool, base):
+        pool.retry_policy = RetryPolicy(max_retries=0, base_delay=0, max_delay=0)
+        with pytest.raises(aiohttp.ClientResponseError):
+            await pool.request_json("GET", f"{base}/down", name="down")
+
+    pool, calls, _ = asyncio.run(run_with_server({"/down": [503]}, scenario))
+    assert calls["/down"] == 1
+    assert pool.retries == 0
+
+
+def test_session_from_a_previous_loop_is_closed():
+    pool = HTTPPool()
+
+    async def open_session():
+        return await pool.get_session()
+
+    first = asyncio.run(open_session())
+    second = asyncio.run(open_session())
+    assert second is not first
+    assert first.closed
+    assert pool.sessions_created == 2
+    asyncio.run(pool.close())
+
+
+def test_session_on_a_running_loop_is_closed_on_that_loop():
+    pool = HTTPPool()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        first = asyncio.run_coroutine_threadsafe(pool.get_session(), loop).result(5)
+
+        async def reopen():
+            session = await pool.get_session()
+            for _ in range(100):
+                if first.closed:
+                    break
+                await asyncio.sleep(0.01)
+            await pool.close()
+            return session
+
+        assert asyncio.run(reopen()) is not first
+        assert first.closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from intent_router import TRAINING_DATA, IntentModel, IntentRouter
+
+MESSAGES = [text for text, _ in TRAINING_DATA] + [
+    "파이썬 리스트 설명해줘",
+    "while문 이론 알려줘",
+    "문제 더 내줘",
+    "연습문제 주세요",
+    "002번 힌트 주세요",
+    "힌트 좀",
+    "정답 코드 알려줘",
+    "답이 뭐야",
+    "추가 문제 더 풀고 싶어",
+    "딕셔너리 자료형 문제",
+    "Hello WORLD",
+    "ㅎㅎ",
+    "",
+]
+
+
+def test_matches_sklearn_pipeline_on_fixed_messages():
+    pytest.importorskip("sklearn")
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import make_pipeline
+
+    texts = [text for text, _ in TRAINING_DATA]
+    labels = [label for _, label in TRAINING_DATA]
+    reference = make_pipeline(TfidfVectorizer(), MultinomialNB()).fit(texts, labels)
+    model = IntentModel.fit(TRAINING_DATA)
+
+    assert model.predict(MESSAGES) == list(reference.predict(MESSAGES))
+
+    # 예측뿐 아니라 클래스별 확률도 같은지 확인
+    tfidf = model._normalize(model._counts(MESSAGES, model.vocabulary) * model.idf)
+    scores = tfidf @ model.feature_log_prob.T + model.class_log_prior
+    log_proba = scores - np.logaddexp.reduce(scores, axis=1, keepdims=True)
+    assert model.classes == list(reference.classes_)
+    np.testing.assert_allclose(log_proba, reference.predict_log_proba(MESSAGES), atol=1e-9)
+
+
+def test_artifact_round_trip(tmp_path):
+    path = tmp_path / "intent_router.json"
+    trained = IntentRouter(artifact_path=str(path))
+    trained.load()
+    assert trained.trained and path.exists()
+
+    loaded = IntentRouter(artifact_path=str(path))
+    loaded.load()
+    assert not loaded.trained
+    assert loaded.route_batch(MESSAGES) == trained.route_batch(MESSAGES)
@@ -0,0 +1,85 @@
+import asyncio
+
+from prefetch import TopicPrefetcher
+
+
+class SlowGenerator:
+    """
+    생성마다 delay초 걸리는 ContentGenerator 대역.
+    """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.started = []
+
+    async def generate_theory(self, topic):
+        self.started.append(("theory", topic))
+        await asyncio.sleep(self.delay)
+        return f"{topic} 이론"
+
+    async def generate_exercises(self, topic, save=True):
+        self.started.append(("exercises", topic))
+        await asyncio.sleep(self.delay)
+        return [{"number": "001", "topic": topic}]
+
+
+def test_take_bypasses_prefetch_waiting_for_a_slot():
+    generator = SlowGenerator(delay=0.2)
+    prefetcher = TopicPrefetcher(generator, concurrency=1)
+
+    async def scenario():
+        prefetcher.schedule("변수")
+        await asyncio.sleep(0)
+        # 변수 이론만 실행 중이고 나머지 세 건은 자리를 기다리는 중
+        assert generator.started == [("theory", "변수")]
+        prefetcher.schedule("if문")
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        assert await prefetcher.take("theory", "if문") is None
+        assert loop.time() - start < 0.05
+
+        # 실행 중인 예약은 끝날 때까지 기다려 결과를 받음
+        assert await prefetcher.take("theory", "변수") == "변수 이론"
+        await prefetcher.stop()
+
+    asyncio.run(scenario())
+    assert ("theory", "if문") not in generator.started
+    metrics = prefetcher.metrics()
+    assert metrics["bypassed"] == 1
+    assert metrics["in_flight_hits"] == 1
+
+
+def test_prune_does_not_cancel_a_prefetch_someone_is_waiting_for():
+    generator = SlowGenerator(delay=0.1)
+    prefetcher = TopicPrefetcher(generator, concurrency=4, max_topics=1)
+
+    async def scenario():
+        prefetcher.schedule("변수")
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(prefetcher.take("theory", "변수"))
+        await asyncio.sleep(0)
+        # max_topics를 넘겨 변수 항목이 정리되어도 기다리는 요청은 결과를 받음
+        prefetcher.schedule("if문")
+        assert await waiting == "변수 이론"
+        await prefetcher.stop()
+
+    asyncio.run(scenario())
+    # 기다리는 요청이 없던 변수 연습문제만 취소됨
+    assert prefetcher.metrics()["wasted"] == 1
+
+
+def test_take_treats_a_cancelled_prefetch_as_a_miss():
+    generator = SlowGenerator(delay=0.1)
+    prefetcher = TopicPrefetcher(generator, concurrency=4)
+
+    async def scenario():
+        prefetcher.schedule("변수")
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(prefetcher.take("theory", "변수"))
+        await asyncio.sleep(0)
+        await prefetcher.stop()
+        return await waiting
+
+    assert asyncio.run(scenario()) is None
+    assert prefetcher.metrics()["misses"] == 1
@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+
+from sandbox import SandboxError, SandboxPool, SandboxWorker
+
+
+def test_failed_respawn_keeps_the_original_error_and_retries_later(monkeypatch):
+    pool = SandboxPool(size=1, timeout=0.5)
+    real_spawn = SandboxWorker.spawn.__func__
+
+    async def failing_spawn(cls, *args):
+        raise OSError("fork 실패")
+
+    async def scenario():
+        await pool.start()
+        monkeypatch.setattr(SandboxWorker, "spawn", classmethod(failing_spawn))
+        with pytest.raises(SandboxError, match="실행 시간 제한"):
+            await pool.run("while True:\n    pass\n", "")
+        assert pool.metrics()["missing"] == 1
+
+        # 여전히 띄울 수 없으면 기다리지 않고 바로 실패
+        with pytest.raises(SandboxError, match="시작하지 못했습니다"):
+            await pool.run("print(1)", "")
+
+        # 다음 run에서 비어 있는 자리를 다시 채움
+        monkeypatch.setattr(SandboxWorker, "spawn", classmethod(real_spawn))
+        output = await pool.run("print(input())", "ok")
+        await pool.stop()
+        return output
+
+    assert asyncio.run(scenario()).strip() == "ok"
+    metrics = pool.metrics()
+    assert metrics["spawn_failures"] == 2
+    assert metrics["missing"] == 0
@@ -0,0 +1,128 @@
+import multiprocessing
+import time
+
+import pytest
+
+from session_store import BoundedStore, ExerciseSetCache, SQLiteSessionBackend, UserSession
+
+
+def open_store(path, record_type=UserSession, name="sessions"):
+    return BoundedStore(name, record_type, backend=SQLiteSessionBackend(name, path))
+
+
+def read_back(path, record_type=UserSession, name="sessions"):
+    store = open_store(path, record_type, name)
+    store.acquire("u")
+    return store["u"]
+
+
+def test_concurrent_increments_are_not_lost(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first, second = open_store(path), open_store(path)
+    first["u"] = UserSession(interaction_count=1, current_exercises=[{"number": 1}, {"number": 2}])
+    first.commit("u")
+
+    # 두 워커가 같은 버전(1)에서 시작해 동시에 수정
+    first.acquire("u")
+    second.acquire("u")
+    a, b = first["u"], second["u"]
+    a.interaction_count += 1
+    b.interaction_count += 1
+    a.feedback.append("a")
+    b.feedback.append("b")
+    a.hint_counts["1"] = 1
+    b.hint_counts["1"] = 1
+    b.hint_counts["2"] = 1
+    a.current_exercises[0]["solved"] = True
+    b.current_exercises[1]["solved"] = True
+    b.last_response = "from b"
+    first.release("u")
+    second.release("u")
+
+    assert second.conflicts == 1
+    fresh = read_back(path)
+    assert fresh.interaction_count == 3
+    assert sorted(fresh.feedback) == ["a", "b"]
+    assert fresh.hint_counts == {"1": 2, "2": 1}
+    assert [e.get("solved") for e in fresh.current_exercises] == [True, True]
+    assert fresh.last_response == "from b"
+
+
+def test_replaced_exercise_list_wins_over_stale_edits(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first, second = open_store(path), open_store(path)
+    first["u"] = UserSession(current_exercises=[{"number": 1}])
+    first.commit("u")
+    first.acquire("u")
+    second.acquire("u")
+    first["u"].current_exercises = [{"number": 10}, {"number": 11}]
+    second["u"].current_exercises[0]["solved"] = True
+    first.release("u")
+    second.release("u")
+    assert read_back(path).current_exercises == [{"number": 10}, {"number": 11}]
+
+
+def test_exercise_set_cursor_and_items_merge(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    first = open_store(path, ExerciseSetCache, "exercise_sets")
+    second = open_store(path, ExerciseSetCache, "exercise_sets")
+    first["u"] = ExerciseSetCache(cursor=3, exercises=[{"id": 1}])
+    first.commit("u")
+    first.acquire("u")
+    second.acquire("u")
+    first["u"].exercises.append({"id": 2})
+    first["u"].cursor = 5
+    second["u"].exercises.append({"id": 3})
+    second["u"].cursor = 4
+    first.release("u")
+    second.release("u")
+    merged = read_back(path, ExerciseSetCache, "exercise_sets")
+    assert merged.cursor == 5
+    assert merged.exercises == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def bounce_worker(path, worker, rounds, barrier):
+    """
+    같은 사용자의 요청을 여러 워커 프로세스가 번갈아 처리하는 상황을 흉내 냅니다.
+    """
+    store = open_store(path)
+    barrier.wait()
+    for i in range(rounds):
+        store.acquire("u")
+        session = store["u"]
+        session.interaction_count += 1
+        session.feedback.append(f"{worker}-{i}")
+        session.hint_counts[str(worker)] = session.hint_counts.get(str(worker), 0) + 1
+        # 다른 워커의 요청과 겹치도록 처리 시간을 둠
+        time.sleep(0.002)
+        store.release("u")
+    store.close()
+
+
+def test_user_bouncing_between_worker_processes(tmp_path):
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        pytest.skip("fork를 지원하지 않는 플랫폼")
+    path = str(tmp_path / "sessions.db")
+    store = open_store(path)
+    store["u"] = UserSession()
+    store.commit("u")
+    store.close()
+
+    workers, rounds = 4, 25
+    barrier = context.Barrier(workers)
+    processes = [
+        context.Process(target=bounce_worker, args=(path, worker, rounds, barrier))
+        for worker in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+
+    session = read_back(path)
+    assert session.interaction_count == workers * rounds
+    assert len(session.feedback) == workers * rounds
+    assert session.hint_counts == {str(worker): rounds for worker in range(workers)}
@@ -0,0 +1,116 @@
+import threading
+import time
+
+from session_store import BoundedStore, InMemorySessionBackend, UserSession
+
+
+class CountingBackend(InMemorySessionBackend):
+    """
+    백엔드 호출 횟수를 세는 메모리 백엔드.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def load(self, user_id):
+        self.calls += 1
+        return super().load(user_id)
+
+    def version(self, user_id):
+        self.calls += 1
+        return super().version(user_id)
+
+    def save(self, user_id, data, expected_version):
+        self.calls += 1
+        return super().save(user_id, data, expected_version)
+
+
+def test_pinned_records_are_served_from_memory():
+    backend = CountingBackend()
+    store = BoundedStore("sessions", UserSession, capacity=10, backend=backend)
+    store.acquire("new-user")
+    calls = backend.calls
+    # 고정된 동안의 조회/저장은 백엔드를 거치지 않음
+    assert "new-user" not in store
+    assert store.get("new-user") is None
+    store["new-user"] = UserSession(interaction_count=1)
+    assert store["new-user"].interaction_count == 1
+    assert backend.calls == calls
+    store.release("new-user")
+    assert backend.load("new-user") is not None
+
+
+def test_pinned_records_are_not_evicted():
+    backend = CountingBackend()
+    store = BoundedStore("sessions", UserSession, capacity=1, backend=backend)
+    store.acquire("a")
+    store["a"] = UserSession(interaction_count=1)
+    store.acquire("b")
+    store["b"] = UserSession(interaction_count=2)
+    store.release("b")
+    # 용량을 넘었지만 a는 사용 중이므로 b를 내보냄
+    assert list(store._resident) == ["a"]
+    assert store.evictions == 1
+    session = store["a"]
+    session.interaction_count += 1
+    store.release("a")
+    assert store.stats()["pinned"] == 0
+    store.acquire("a")
+    assert store["a"].interaction_count == 2
+    store.acquire("b")
+    assert store["b"].interaction_count == 2
+
+
+class SlowBackend(InMemorySessionBackend):
+    """
+    save가 gate가 열릴 때까지 멈추는 메모리 백엔드.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.saving = threading.Event()
+        self.gate = threading.Event()
+
+    def save(self, user_id, data, expected_version):
+        self.saving.set()
+        self.gate.wait(5)
+        return super().save(user_id, data, expected_version)
+
+
+def test_slow_commit_does_not_block_other_users():
+    backend = SlowBackend()
+    store = BoundedStore("sessions", UserSession, capacity=10, backend=backend)
+    store["other"] = UserSession()
+    store.acquire("slow")
+    store["slow"] = UserSession(interaction_count=1)
+    releasing = threading.Thread(target=store.release, args=("slow",))
+    releasing.start()
+    assert backend.saving.wait(5)
+
+    # slow의 저장이 끝나지 않았어도 다른 사용자의 조회/저장과 통계는 바로 처리됨
+    start = time.monotonic()
+    assert "other" in store
+    store["other"].interaction_count += 1
+    store["new"] = UserSession()
+    assert "missing" not in store
+    assert store.stats()["resident"] == 3
+    assert time.monotonic() - start < 1
+
+    backend.gate.set()
+    releasing.join(5)
+    assert backend.load("slow") is not None
+
+
+def test_lookups_never_touch_the_backend():
+    backend = CountingBackend()
+    backend.save("stored", '{"interaction_count": 3}', 0)
+    store = BoundedStore("sessions", UserSession, capacity=10, backend=backend)
+    calls = backend.calls
+    assert "stored" not in store
+    assert store.get("stored") is None
+    assert backend.calls == calls
+    # 메모리에 없는 레코드는 acquire()로 읽어 옴
+    store.acquire("stored")
+    assert store["stored"].interaction_count == 3
+    store.release("stored")
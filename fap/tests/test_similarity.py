@@ -0,0 +1,72 @@
+import pytest
+
+from similarity import SimilarityEngine, normalize_tokens
+
+ANSWER = "total = 0\nfor i in range(1, 11):\n    total += i\nprint(total)\n"
+
+# (제출 코드, 통과해야 하는지) - 기본 기준값(0.8)을 맞출 때 쓴 표본
+CALIBRATION = [
+    ("s = 0\nfor n in range(1, 11):\n    s += n\nprint(s)\n", True),
+    ("total = 0  # 합계\nfor i in range(1, 11):\n\n    total += i\nprint(total)\n", True),
+    ("total = 0\nfor i in range(1, 101):\n    total += i\nprint(total)\n", False),
+    ("total = 0\nfor i in range(1, 11):\n    total -= i\nprint(total)\n", False),
+    ("print(sum(range(1, 11)))\n", False),
+]
+
+
+@pytest.fixture
+def engine():
+    return SimilarityEngine()
+
+
+def test_identifier_renames_match_the_answer(engine):
+    renamed = "def plus(x, y):\n    # 더하기\n    return x + y\n"
+    answer = "def add(a, b):\n    return a + b\n"
+    assert engine.similarity_to_answer("001", answer, renamed) == 1.0
+    assert engine.similarity_to_answer("002", "print('Hello, World!')", 'print("Hello, World!")') == 1.0
+
+
+def test_literal_changes_do_not_match_the_answer(engine):
+    assert engine.similarity_to_answer("001", "print('Hello, World!')", "print('Goodbye')") < engine.threshold
+    assert engine.similarity_to_answer(
+        "002", "x = 10\nprint(x * 2)", "x = 3\nprint(x * 7)"
+    ) < engine.threshold
+
+
+@pytest.mark.parametrize("code,passes", CALIBRATION)
+def test_threshold_calibration(engine, code, passes):
+    assert (engine.similarity_to_answer("001", ANSWER, code) > engine.threshold) is passes
+
+
+def test_syntax_error_falls_back_to_regex_tokens(engine):
+    broken = "def add(a, b:\n    return a + b\n"
+    tokens = normalize_tokens(broken)
+    assert tokens[:3] == ["def", "ID", "("]
+    assert normalize_tokens("print(3 +", keep_literals=True) == ["print", "(", "3", "+"]
+    # 괄호 하나 빠진 제출도 정답과 비교할 수 있고 완전히 다른 코드보다 가깝게 나옴
+    answer = "def add(a, b):\n    return a + b\n"
+    assert engine.similarity_to_answer("001", answer, broken) > engine.similarity_to_answer(
+        "001", answer, "print('hi')"
+    )
+
+
+def test_find_similar_ignores_literals_and_excludes_the_caller(engine):
+    engine.index_submission("001", "alice", ANSWER)
+    engine.index_submission("001", "bob", "print(sum(range(1, 11)))\n")
+    engine.index_submission("002", "carol", ANSWER)
+
+    copied = "acc = 0\nfor k in range(5, 50):\n    acc += k\nprint(acc)\n"
+    assert engine.find_similar("001", copied) == [("alice", 1.0)]
+    assert engine.find_similar("001", ANSWER, exclude="alice") == []
+    assert engine.find_similar("003", ANSWER) == []
+
+
+def test_lsh_index_evicts_the_oldest_submission():
+    engine = SimilarityEngine(max_submissions=2)
+    for user in ("alice", "bob", "carol"):
+        engine.index_submission("001", user, ANSWER)
+    assert sorted(key for key, _ in engine.find_similar("001", ANSWER)) == ["bob", "carol"]
+    # 같은 사용자가 다시 제출하면 새 항목을 만들지 않고 서명만 바꿈
+    engine.index_submission("001", "bob", "print(sum(range(1, 11)))\n")
+    assert engine.find_similar("001", ANSWER) == [("carol", 1.0)]
+    assert engine.stats()["indexed_submissions"] == 2
@@ -0,0 +1,84 @@
+import asyncio
+
+from prefetch import TopicPrefetcher
+from tracing import Tracer, _current_span
+
+
+class TracedGenerator:
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.seen_spans = []
+
+    async def generate_theory(self, topic):
+        self.seen_spans.append(_current_span.get())
+        with self.tracer.span("generate_theory"):
+            await asyncio.sleep(0.01)
+        return topic
+
+    async def generate_exercises(self, topic, save=True):
+        self.seen_spans.append(_current_span.get())
+        return []
+
+
+def span_names(trace):
+    return [span["name"] for span in trace["spans"]]
+
+
+def test_late_spans_are_rejected_after_root_closes():
+    tracer = Tracer(slow_ms=0)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def late_work():
+            started.set()
+            await asyncio.sleep(0.02)
+            with tracer.span("late"):
+                pass
+
+        with tracer.trace("request", trace_id="t-late"):
+            with tracer.span("inside"):
+                pass
+            task = asyncio.create_task(late_work())
+            await started.wait()
+        await task
+
+    asyncio.run(scenario())
+    assert span_names(tracer.get("t-late")) == ["request", "inside"]
+    assert tracer.stats()["late_spans"] == 1
+
+
+def test_prefetch_runs_outside_the_scheduling_request_trace():
+    tracer = Tracer(slow_ms=0)
+    generator = TracedGenerator(tracer)
+    prefetcher = TopicPrefetcher(generator, concurrency=2)
+
+    async def scenario():
+        with tracer.trace("request", trace_id="t-prefetch"):
+            prefetcher.schedule("변수")
+        await asyncio.sleep(0.05)
+        await prefetcher.stop()
+
+    asyncio.run(scenario())
+    assert generator.seen_spans == [None, None]
+    assert span_names(tracer.get("t-prefetch")) == ["request"]
+    assert tracer.stats()["late_spans"] == 0
+
+
+def test_explicit_zero_limits_are_respected():
+    tracer = Tracer(slow_ms=0, buffer_size=0, max_spans=0)
+    with tracer.trace("request", trace_id="t-zero"):
+        with tracer.span("child"):
+            pass
+    # 버퍼 크기 0이면 아무것도 보관하지 않고, 스팬 수 0이어도 루트 스팬은 남김
+    assert tracer.get("t-zero") is None
+    stats = tracer.stats()
+    assert (stats["buffer_size"], stats["buffered"], stats["kept"]) == (0, 0, 1)
+
+    tracer = Tracer(slow_ms=0, max_spans=0)
+    with tracer.trace("request", trace_id="t-root"):
+        with tracer.span("child"):
+            pass
+    trace = tracer.get("t-root")
+    assert span_names(trace) == ["request"]
+    assert trace["dropped_spans"] == 1
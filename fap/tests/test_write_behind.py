@@ -0,0 +1,105 @@
+import asyncio
+
+import aiohttp
+from yarl import URL
+
+from write_behind import WriteBehindQueue
+
+
+class FakeBackend:
+    """
+    payload에 poison이 섞여 있으면 배치 전체를 거절하는 백엔드 대역.
+    """
+
+    def __init__(self, unreachable=False, status=None):
+        self.unreachable = unreachable
+        self.status = status
+        self.calls = []
+        self.saved = []
+
+    async def save_submissions(self, payloads):
+        self.calls.append(len(payloads))
+        if self.unreachable:
+            raise aiohttp.ClientConnectionError("connection refused")
+        if self.status is not None:
+            url = URL("http://backend/api/save-submissions")
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(url, "POST", {}, url), (), status=self.status, message="Service Unavailable"
+            )
+        if any(payload.get("poison") for payload in payloads):
+            raise ValueError("400 Bad Request")
+        self.saved.extend(payloads)
+
+    async def save_answers(self, payloads):
+        self.saved.extend(payloads)
+
+
+def attempts(queue):
+    return dict(queue._connect().execute("SELECT payload, attempts FROM spool").fetchall())
+
+
+def test_poison_row_is_isolated_from_batch(tmp_path):
+    backend = FakeBackend()
+    queue = WriteBehindQueue(backend, spool_path=str(tmp_path / "spool.db"), batch_size=16, flush_interval=60,
+                             max_attempts=2)
+
+    async def scenario():
+        await queue.start()
+        for i in range(8):
+            await queue.enqueue("submission", {"n": i, "poison": i == 5})
+        await queue.flush()
+        assert sorted(p["n"] for p in backend.saved) == [0, 1, 2, 3, 4, 6, 7]
+        assert queue.depth == 1
+        assert list(attempts(queue).values()) == [1]
+
+        # 다음 전송에서는 남은 poison 한 건만 실패해 보류됨
+        await queue.flush()
+        assert queue.depth == 0
+        assert queue.dead_letters == 1
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert queue.flushed == 7
+
+
+def test_unreachable_backend_is_not_bisected(tmp_path):
+    backend = FakeBackend(unreachable=True)
+    queue = WriteBehindQueue(backend, spool_path=str(tmp_path / "spool.db"), batch_size=16, flush_interval=60)
+
+    async def scenario():
+        await queue.start()
+        for i in range(8):
+            await queue.enqueue("submission", {"n": i})
+        await queue.flush()
+        assert backend.calls == [8]
+        assert queue.depth == 8
+        # 백엔드 장애는 항목 탓이 아니므로 시도 횟수를 올리지 않음
+        assert set(attempts(queue).values()) == {0}
+        queue._task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_backend_wide_5xx_is_not_bisected_or_dead_lettered(tmp_path):
+    backend = FakeBackend(status=503)
+    queue = WriteBehindQueue(backend, spool_path=str(tmp_path / "spool.db"), batch_size=16, flush_interval=60,
+                             max_attempts=2)
+
+    async def scenario():
+        await queue.start()
+        for i in range(8):
+            await queue.enqueue("submission", {"n": i})
+        for _ in range(3):
+            await queue.flush()
+        assert backend.calls == [8, 8, 8]
+        assert queue.depth == 8
+        assert queue.dead_letters == 0
+
+        # 백엔드가 복구되면 그대로 전송됨
+        backend.status = None
+        await queue.flush()
+        assert queue.depth == 0
+        await queue.stop()
+
+    asyncio.run(scenario())
+    assert queue.flushed == 8
@@ -0,0 +1,333 @@
+"""
+요청 단위 프로세스 내 트레이싱.
+
+trace()로 요청의 루트 스팬을 열면 같은 컨텍스트(하위 코루틴, 거기서 만든 태스크 포함)에서 연
+span()들이 자식 스팬으로 기록됩니다. 요청이 끝난 뒤에도 도는 백그라운드 작업은 빈 컨텍스트
+(asyncio.create_task(..., context=contextvars.Context()))에서 실행해 트레이스를 물려받지 않게 하고,
+루트 스팬이 끝난 트레이스에 뒤늦게 열린 스팬은 기록하지 않습니다.
+루트 스팬이 끝나면 tail sampling으로 느린 요청(TRACE_SLOW_MS 이상)이나 어느 스팬에서든 오류가 난 요청만
+링 버퍼(TRACE_BUFFER_SIZE개)에 남기고, TRACE_EXPORT_PATH가 있으면 JSON 한 줄로도 기록합니다.
+진행 중인 트레이스가 없을 때 span()은 아무것도 기록하지 않습니다.
+
+환경 변수:
+    TRACING            0이면 끔
+    TRACE_SLOW_MS      남길 요청의 최소 소요 시간, 기본 1000
+    TRACE_BUFFER_SIZE  링 버퍼 크기, 기본 200
+    TRACE_MAX_SPANS    트레이스 하나에 기록할 최대 스팬 수, 기본 500
+    TRACE_EXPORT_PATH  남긴 트레이스를 JSONL로 기록할 파일 (기본 없음)
+
+트레이스 ID는 요청 ID(log_config.request_id_var)를 그대로 써서 같은 요청의 로그와 연결합니다.
+"""
+import contextvars
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+import uuid
+from collections import deque
+
+from log_config import create_queue_logging, request_id_var
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+# --------------------------
+# Trace / Span 클래스
+# --------------------------
+class Trace:
+    __slots__ = ("trace_id", "name", "start_wall", "start", "spans", "dropped_spans", "max_spans",
+                 "has_error", "closed")
+
+    def __init__(self, trace_id, name, max_spans):
+        self.trace_id = trace_id
+        self.name = name
+        self.start_wall = time.time()
+        self.start = time.perf_counter()
+        self.spans = []
+        self.dropped_spans = 0
+        self.max_spans = max_spans
+        self.has_error = False
+        self.closed = False
+
+    def add(self, span):
+        if self.closed:
+            # 루트 스팬이 끝나 이미 내보낸 트레이스는 바꾸지 않음
+            return False
+        # 루트 스팬은 max_spans가 0이어도 남김 (요약과 소요 시간 계산에 필요)
+        if len(self.spans) < self.max_spans or not self.spans:
+            self.spans.append(span)
+        else:
+            self.dropped_spans += 1
+        return True
+
+    def to_dict(self):
+        root = self.spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start": self.start_wall,
+            "duration_ms": root.duration_ms,
+            "error": root.error,
+            "has_error": self.has_error,
+            "span_count": len(self.spans),
+            "dropped_spans": self.dropped_spans,
+            "spans": [span.to_dict(self.start) for span in self.spans],
+        }
+
+    def summary(self):
+        root = self.spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start": self.start_wall,
+            "duration_ms": root.duration_ms,
+            "error": root.error,
+            "has_error": self.has_error,
+            "span_count": len(self.spans),
+        }
+
+
+class Span:
+    """
+    with 블록 하나의 구간. 예외가 나면 error에 예외 형식과 메시지를 남깁니다.
+    """
+    __slots__ = ("trace", "span_id", "parent_id", "name", "attributes", "start", "end",
+                 "error", "_token", "_tracer", "_recorded")
+
+    def __init__(self, tracer, trace, name, parent_id, attributes):
+        self._tracer = tracer
+        self.trace = trace
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = None
+        self.end = None
+        self.error = None
+        self._token = None
+        self._recorded = False
+
+    def set(self, key, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self):
+        if self.end is None:
+            return None
+        return (self.end - self.start) * 1000
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self._recorded = self.trace.add(self)
+        if not self._recorded:
+            self._tracer.count_late_span()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self.error = f"{exc_type.__name__}: {exc}"
+            if self._recorded:
+                self.trace.has_error = True
+        _current_span.reset(self._token)
+        if self.parent_id is None:
+            self._tracer.finish(self.trace)
+        return False
+
+    def to_dict(self, trace_start):
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ms": (self.start - trace_start) * 1000,
+            "duration_ms": self.duration_ms,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+# --------------------------
+# Tracer 클래스
+# --------------------------
+class Tracer:
+    """
+    끝난 트레이스 중 느리거나 오류가 난 것만 링 버퍼에 보관합니다.
+    """
+
+    def __init__(self, slow_ms=None, buffer_size=None, max_spans=None, export_path=None):
+        self.enabled = os.getenv("TRACING", "1") != "0"
+        self.slow_ms = slow_ms if slow_ms is not None else float(os.getenv("TRACE_SLOW_MS", "1000"))
+        self.buffer_size = buffer_size if buffer_size is not None else int(
+            os.getenv("TRACE_BUFFER_SIZE", "200")
+        )
+        self.max_spans = max_spans if max_spans is not None else int(os.getenv("TRACE_MAX_SPANS", "500"))
+        self.export_path = export_path or os.getenv("TRACE_EXPORT_PATH") or None
+        self._buffer = deque(maxlen=self.buffer_size)
+        self._lock = threading.Lock()
+        self.started = 0
+        self.kept = 0
+        self.sampled_out = 0
+        self.late_spans = 0
+        self._export_logger = None
+        if self.export_path:
+            self._export_logger = self._create_export_logger()
+
+    def _create_export_logger(self):
+        # 파일 기록은 로그와 같은 방식으로 큐 + 백그라운드 스레드에서 처리
+        handler = logging.handlers.RotatingFileHandler(
+            self.export_path,
+            maxBytes=int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
+            backupCount=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        queue_handler, self._export_listener = create_queue_logging([handler])
+        logger = logging.getLogger("tracing.export")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(queue_handler)
+        self._export_listener.start()
+        return logger
+
+    def trace(self, name, trace_id=None, **attributes):
+        """
+        진행 중인 트레이스가 없으면 새 트레이스의 루트 스팬을, 있으면 자식 스팬을 반환합니다.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        parent = _current_span.get()
+        if parent is not None:
+            return Span(self, parent.trace, name, parent.span_id, attributes)
+        with self._lock:
+            self.started += 1
+        trace = Trace(trace_id or request_id_var.get() or uuid.uuid4().hex, name, self.max_spans)
+        return Span(self, trace, name, None, attributes)
+
+    def span(self, name, **attributes):
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP_SPAN
+        return Span(self, parent.trace, name, parent.span_id, attributes)
+
+    def count_late_span(self):
+        with self._lock:
+            self.late_spans += 1
+
+    def finish(self, trace):
+        # 이후에 열리는 스팬(요청이 끝난 뒤 도는 작업 등)은 Trace.add에서 거부됨
+        trace.closed = True
+        root = trace.spans[0]
+        # 처리 중 잡힌 예외도 남기기 위해 루트가 아닌 스팬의 오류도 확인
+        if not trace.has_error and root.duration_ms < self.slow_ms:
+            with self._lock:
+                self.sampled_out += 1
+            return
+        with self._lock:
+            self._buffer.append(trace)
+            self.kept += 1
+        if self._export_logger is not None:
+            self._export_logger.info(json.dumps(trace.to_dict(), ensure_ascii=False, default=str))
+
+    def close(self):
+        if self._export_logger is not None:
+            self._export_listener.stop()
+            for handler in self._export_listener.handlers:
+                handler.close()
+            self._export_logger = None
+
+    def recent(self, limit=50, min_ms=0.0, name=None):
+        with self._lock:
+            traces = list(self._buffer)
+        result = [
+            trace.summary() for trace in reversed(traces)
+            if trace.spans[0].duration_ms >= min_ms and (name is None or trace.name == name)
+        ]
+        return result[:limit]
+
+    def get(self, trace_id):
+        with self._lock:
+            for trace in reversed(self._buffer):
+                if trace.trace_id == trace_id:
+                    return trace.to_dict()
+        return None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "slow_ms": self.slow_ms,
+                "buffer_size": self.buffer_size,
+                "buffered": len(self._buffer),
+                "started": self.started,
+                "kept": self.kept,
+                "sampled_out": self.sampled_out,
+                "late_spans": self.late_spans,
+                "export_path": self.export_path,
+            }
+
+
+_shared_tracer = None
+_shared_lock = threading.Lock()
+
+
+def get_tracer():
+    """
+    프로세스 전역에서 공유되는 Tracer를 반환합니다.
+    """
+    global _shared_tracer
+    if _shared_tracer is None:
+        with _shared_lock:
+            if _shared_tracer is None:
+                _shared_tracer = Tracer()
+    return _shared_tracer
+
+
+def trace(name, trace_id=None, **attributes):
+    return get_tracer().trace(name, trace_id, **attributes)
+
+
+def span(name, **attributes):
+    return get_tracer().span(name, **attributes)
+
+
+def current_span():
+    return _current_span.get() or _NOOP_SPAN
+
+
+def current_trace_id():
+    current = _current_span.get()
+    return current.trace.trace_id if current is not None else None
+
+
+def traced(name, root=False):
+    """
+    코루틴 함수 전체를 name 스팬으로 감싸는 데코레이터.
+    root=True이면 진행 중인 트레이스가 없을 때 새 트레이스를 시작합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with trace(name) if root else span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,296 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import aiohttp
+
+DEFAULT_SPOOL_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "write_behind.db"
+)
+
+
+# --------------------------
+# WriteBehindQueue 클래스
+# --------------------------
+class WriteBehindQueue:
+    """
+    제출/정답 저장을 사용자 응답과 분리하는 write-behind 큐.
+    enqueue는 로컬 SQLite 스풀에 기록한 뒤 바로 반환하고, 백그라운드 태스크가
+    건수나 시간 임계값에 도달할 때마다 Spring 백엔드로 일괄 전송합니다.
+    전송에 성공한 항목만 스풀에서 지우므로 프로세스가 죽어도 재시작 후 다시 전송됩니다.
+    백엔드 장애(연결 실패, 시간 초과, 5xx, 429) 동안의 실패는 시도 횟수(max_attempts)에 세지 않으므로
+    장애가 길어져도 정상 항목이 보류되지 않습니다.
+    """
+
+    def __init__(self, api_client, spool_path=None, batch_size=None, flush_interval=None,
+                 max_attempts=None):
+        self.api_client = api_client
+        self.spool_path = spool_path or os.getenv("WRITE_BEHIND_SPOOL", DEFAULT_SPOOL_PATH)
+        self.batch_size = batch_size or int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "20"))
+        self.flush_interval = flush_interval or float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "1.0"))
+        self.max_attempts = max_attempts or int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "10"))
+        self.senders = {
+            "submission": self.api_client.save_submissions,
+            "answer": self.api_client.save_answers,
+        }
+        self._conn = None
+        self._db_lock = threading.Lock()
+        self._wakeup = None
+        self._task = None
+        self._flush_lock = None
+        self.depth = 0
+        self.enqueued = 0
+        self.flushed = 0
+        self.flush_count = 0
+        self.flush_failures = 0
+        self.dead_letters = 0
+        self.last_flush_latency = None
+        self.max_flush_latency = 0.0
+        self.total_flush_latency = 0.0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.spool_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS spool (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    dead INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._conn.commit()
+            self.depth = self._conn.execute(
+                "SELECT COUNT(*) FROM spool WHERE dead = 0"
+            ).fetchone()[0]
+        return self._conn
+
+    # ---- 스풀 조작 (워커 스레드에서 실행) ----
+    def _append(self, kind, payload):
+        with self._db_lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO spool (kind, payload, created_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+            conn.commit()
+            self.depth += 1
+
+    def _fetch(self, kind, limit):
+        with self._db_lock:
+            rows = self._connect().execute(
+                "SELECT id, payload FROM spool WHERE kind = ? AND dead = 0 ORDER BY id LIMIT ?",
+                (kind, limit)
+            ).fetchall()
+        return [(row_id, json.loads(payload)) for row_id, payload in rows]
+
+    def _delete(self, ids):
+        with self._db_lock:
+            conn = self._connect()
+            conn.executemany("DELETE FROM spool WHERE id = ?", [(i,) for i in ids])
+            conn.commit()
+            self.depth -= len(ids)
+
+    def _mark_failed(self, ids):
+        with self._db_lock:
+            conn = self._connect()
+            conn.executemany(
+                "UPDATE spool SET attempts = attempts + 1 WHERE id = ?", [(i,) for i in ids]
+            )
+            dead = conn.execute(
+                "UPDATE spool SET dead = 1 WHERE dead = 0 AND attempts >= ?", (self.max_attempts,)
+            ).rowcount
+            conn.commit()
+            self.depth -= dead
+            self.dead_letters += dead
+        if dead:
+            logging.error(f"write-behind 전송을 {self.max_attempts}회 실패해 {dead}건을 보류했습니다.")
+
+    def _oldest_age(self):
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT MIN(created_at) FROM spool WHERE dead = 0"
+            ).fetchone()
+        return time.time() - row[0] if row and row[0] else 0.0
+
+    # ---- 비동기 인터페이스 ----
+    async def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        await asyncio.to_thread(self._connect)
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        # 처음 enqueue한 요청의 트레이스/요청 ID를 물려받지 않도록 빈 컨텍스트에서 실행
+        self._task = asyncio.create_task(self._run(), context=contextvars.Context())
+        if self.depth:
+            logging.info(f"이전 실행에서 전송되지 않은 write-behind 항목 {self.depth}건을 재전송합니다.")
+            self._wakeup.set()
+
+    @property
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 종료 직전에 남은 항목을 한 번 더 전송 (실패한 항목은 스풀에 남아 다음 실행에서 처리)
+        await self.flush()
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    async def enqueue(self, kind, payload):
+        if kind not in self.senders:
+            raise ValueError(f"알 수 없는 write-behind 항목 종류입니다: {kind}")
+        if self._task is None:
+            await self.start()
+        await asyncio.to_thread(self._append, kind, payload)
+        self.enqueued += 1
+        if self.depth >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logging.exception("write-behind 전송 중 오류 발생")
+
+    async def flush(self):
+        """
+        스풀에 쌓인 항목을 종류별로 batch_size씩 전송합니다.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            for kind, sender in self.senders.items():
+                while True:
+                    rows = await asyncio.to_thread(self._fetch, kind, self.batch_size)
+                    if not rows:
+                        break
+                    ids = [row_id for row_id, _ in rows]
+                    start = time.perf_counter()
+                    try:
+                        await sender([payload for _, payload in rows])
+                    except Exception as e:
+                        self.flush_failures += 1
+                        logging.error(f"write-behind {kind} {len(rows)}건 전송 실패: {e}")
+                        if self._is_unreachable(e):
+                            # 백엔드가 응답하지 못하는 동안은 시도 횟수를 올리지 않고 다음 주기에 다시 보냄
+                            return
+                        if len(rows) == 1:
+                            await asyncio.to_thread(self._mark_failed, ids)
+                            break
+                        # 일부 항목 때문에 배치 전체가 거절됐을 수 있으므로 나눠 보내
+                        # 실제로 실패하는 항목만 시도 횟수를 올림
+                        sent, failed = await self._send_split(kind, sender, rows)
+                        if sent:
+                            await asyncio.to_thread(self._delete, sent)
+                            self.flushed += len(sent)
+                        await asyncio.to_thread(self._mark_failed, failed)
+                        break
+                    latency = time.perf_counter() - start
+                    await asyncio.to_thread(self._delete, ids)
+                    self.flushed += len(rows)
+                    self.flush_count += 1
+                    self.last_flush_latency = latency
+                    self.total_flush_latency += latency
+                    self.max_flush_latency = max(self.max_flush_latency, latency)
+                    if len(rows) < self.batch_size:
+                        break
+
+    @staticmethod
+    def _is_unreachable(error):
+        # 연결 실패, 시간 초과, 5xx, 429는 백엔드 전체의 문제이지 항목 탓이 아니므로 나눠 보내도 소용없음
+        # (나눠 보내면 과부하인 백엔드에 요청만 늘어남). 항목 탓으로 보고 나눠 보내는 것은 4xx뿐
+        if isinstance(error, aiohttp.ClientResponseError):
+            return error.status >= 500 or error.status == 429
+        return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+    async def _send_split(self, kind, sender, rows):
+        """
+        전송에 실패한 rows를 반으로 나눠 다시 보냅니다. 실패한 쪽은 한 건이 될 때까지 계속 나눕니다.
+        (전송된 id 목록, 실패한 id 목록)을 반환합니다. 도중에 백엔드가 응답하지 못하게 되면 멈추고,
+        남은 항목은 어느 목록에도 넣지 않아 다음 주기에 시도 횟수를 올리지 않고 다시 보냅니다.
+        """
+        sent, failed = [], []
+        middle = len(rows) // 2
+        for part in (rows[:middle], rows[middle:]):
+            part_ids = [row_id for row_id, _ in part]
+            try:
+                await sender([payload for _, payload in part])
+                sent.extend(part_ids)
+            except Exception as e:
+                if self._is_unreachable(e):
+                    break
+                if len(part) == 1:
+                    logging.error(f"write-behind {kind} 항목 {part_ids[0]} 전송 실패: {e}")
+                    failed.extend(part_ids)
+                    continue
+                part_sent, part_failed = await self._send_split(kind, sender, part)
+                sent.extend(part_sent)
+                failed.extend(part_failed)
+                if len(part_sent) + len(part_failed) < len(part):
+                    break
+        return sent, failed
+
+    def metrics(self):
+        return {
+            "depth": self.depth,
+            "oldest_age_sec": self._oldest_age() if self._conn is not None else 0.0,
+            "enqueued": self.enqueued,
+            "flushed": self.flushed,
+            "flush_count": self.flush_count,
+            "flush_failures": self.flush_failures,
+            "dead_letters": self.dead_letters,
+            "batch_size": self.batch_size,
+            "flush_interval_sec": self.flush_interval,
+            "last_flush_latency_ms": (
+                self.last_flush_latency * 1000 if self.last_flush_latency is not None else None
+            ),
+            "avg_flush_latency_ms": (
+                self.total_flush_latency / self.flush_count * 1000 if self.flush_count else 0.0
+            ),
+            "max_flush_latency_ms": self.max_flush_latency * 1000,
+        }
+
+
+_shared_queue = None
+_shared_lock = threading.Lock()
+
+
+def get_write_behind_queue(api_client_factory):
+    """
+    프로세스 전역 write-behind 큐를 반환합니다.
+    WRITE_BEHIND=0 이면 None을 반환하며, 이때 호출자는 바로 백엔드에 저장합니다.
+    """
+    global _shared_queue
+    if os.getenv("WRITE_BEHIND", "1") == "0":
+        return None
+    if _shared_queue is None:
+        with _shared_lock:
+            if _shared_queue is None:
+                _shared_queue = WriteBehindQueue(api_client_factory())
+    return _shared_queue
@@ -32,6 +32,16 @@ public class Answer {
     @JsonProperty("answer_code")
     private String answerCode;
 
+    // 정답 코드를 입력 예로 실행한 기준 출력 (채점 시 정답 코드를 다시 실행하지 않기 위함)
+    @Column(columnDefinition = "TEXT")
+    @JsonProperty("reference_output")
+    private String referenceOutput;
+
+    // 기준 출력을 계산한 정답 코드/입력 예의 실행 지문 (정답이 바뀌면 기준 출력을 다시 계산)
+    @Column(length = 64)
+    @JsonProperty("reference_fingerprint")
+    private String referenceFingerprint;
+
     @CreationTimestamp
     private LocalDateTime createdAt;
 
@@ -4,6 +4,8 @@ import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
 
+import java.util.List;
+
 @RestController
 @RequestMapping("/api")
 public class AnswerController {
@@ -15,13 +17,20 @@ public class AnswerController {
         this.answerService = answerService;
     }
 
-    // POST 엔드포인트: Gemini가 생성한 정답을 저장
+    // POST 엔드포인트: Gemini가 생성한 정답을 저장 (같은 문제 번호가 있으면 갱신)
     @PostMapping("/save-answer")
     public ResponseEntity<Answer> createAnswer(@RequestBody Answer answer) {
         Answer saved = answerService.saveAnswer(answer);
         return ResponseEntity.ok(saved);
     }
 
+    // POST 엔드포인트: 여러 정답을 한 번에 저장 (같은 문제 번호가 있으면 갱신)
+    @PostMapping("/save-answer/batch")
+    public ResponseEntity<List<Answer>> createAnswers(@RequestBody List<Answer> answers) {
+        List<Answer> saved = answerService.saveAnswers(answers);
+        return ResponseEntity.ok(saved);
+    }
+
     // GET 엔드포인트: 문제 번호로 정답 조회
     @GetMapping("/get-answer/{problemNumber}")
     public ResponseEntity<Answer> getAnswer(@PathVariable("problemNumber") String problemNumber) {
@@ -0,0 +1,46 @@
+package com.example.demo.answer;
+
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import org.springframework.boot.ApplicationArguments;
+import org.springframework.boot.ApplicationRunner;
+import org.springframework.jdbc.core.JdbcTemplate;
+import org.springframework.stereotype.Component;
+import org.springframework.transaction.annotation.Transactional;
+
+// answers.problemNumber 유일 제약 적용
+// 예전에는 단건 저장이 항상 새 행을 넣어 같은 문제 번호가 여러 행 있을 수 있고,
+// 그 상태에서는 ddl-auto=update가 유일 제약을 만들지 못해 findByProblemNumber가 예외를 던짐
+// 문제 번호마다 가장 최근 행만 남긴 뒤 제약이 없으면 추가
+@Component
+public class AnswerSchemaMigration implements ApplicationRunner {
+
+    private static final Logger logger = LoggerFactory.getLogger(AnswerSchemaMigration.class);
+
+    private final JdbcTemplate jdbcTemplate;
+
+    public AnswerSchemaMigration(JdbcTemplate jdbcTemplate) {
+        this.jdbcTemplate = jdbcTemplate;
+    }
+
+    @Override
+    @Transactional
+    public void run(ApplicationArguments args) {
+        Integer uniqueIndexes = jdbcTemplate.queryForObject(
+                "SELECT COUNT(*) FROM information_schema.statistics "
+                        + "WHERE table_schema = DATABASE() AND table_name = 'answers' "
+                        + "AND column_name = 'problemNumber' AND non_unique = 0",
+                Integer.class);
+        if (uniqueIndexes != null && uniqueIndexes > 0) {
+            return;
+        }
+
+        // 제출 기록은 문제 번호로 정답을 참조하므로 중복 행을 지워도 연결이 끊기지 않음
+        int removed = jdbcTemplate.update(
+                "DELETE older FROM answers older "
+                        + "JOIN answers newer ON older.problemNumber = newer.problemNumber AND older.id < newer.id");
+        jdbcTemplate.execute(
+                "ALTER TABLE answers ADD CONSTRAINT uk_answers_problem_number UNIQUE (problemNumber)");
+        logger.info("answers 문제 번호 중복 {}건을 정리하고 유일 제약을 추가했습니다.", removed);
+    }
+}
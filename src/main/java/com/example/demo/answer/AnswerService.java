@@ -2,7 +2,10 @@ package com.example.demo.answer;
 
 import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
 
+import java.util.ArrayList;
+import java.util.List;
 import java.util.Optional;
 
 @Service
@@ -15,9 +18,32 @@ public class AnswerService {
         this.answerRepository = answerRepository;
     }
 
-    // 정답 저장
+    // 정답 저장: 이미 있는 문제 번호는 정답 코드만 갱신 (일괄 저장과 같은 방식)
+    @Transactional
     public Answer saveAnswer(Answer answer) {
-        return answerRepository.save(answer);
+        return upsert(answer);
+    }
+
+    // 정답 일괄 저장: 이미 있는 문제 번호는 정답 코드만 갱신
+    @Transactional
+    public List<Answer> saveAnswers(List<Answer> answers) {
+        List<Answer> saved = new ArrayList<>();
+        for (Answer answer : answers) {
+            saved.add(upsert(answer));
+        }
+        return saved;
+    }
+
+    private Answer upsert(Answer answer) {
+        Answer target = answerRepository.findByProblemNumber(answer.getProblemNumber())
+                .map(existing -> {
+                    existing.setAnswerCode(answer.getAnswerCode());
+                    existing.setReferenceOutput(answer.getReferenceOutput());
+                    existing.setReferenceFingerprint(answer.getReferenceFingerprint());
+                    return existing;
+                })
+                .orElse(answer);
+        return answerRepository.save(target);
     }
 
     // 문제 번호에 해당하는 정답 조회
@@ -8,7 +8,9 @@ import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.http.ResponseEntity;
 import org.springframework.web.bind.annotation.*;
 
+import java.util.LinkedHashMap;
 import java.util.List;
+import java.util.Map;
 
 @RestController
 @RequestMapping("/api/submit-code")
@@ -40,10 +42,39 @@ public class CodeSubmissionController {
         }
     }
 
+    // 여러 제출 정보를 한 번에 저장하는 엔드포인트 (AI 서버의 write-behind 큐가 사용)
+    @PostMapping("/batch")
+    public ResponseEntity<List<CodeSubmission>> submitCodeBatch(@RequestBody List<CodeSubmission> submissions) {
+        logger.info("제출 정보 일괄 수신: {}건", submissions.size());
+        try {
+            List<CodeSubmission> saved = submissionService.saveSubmissions(submissions);
+            return ResponseEntity.ok(saved);
+        } catch (Exception e) {
+            logger.error("제출 정보 일괄 저장 중 오류 발생", e);
+            return ResponseEntity.status(500).build();
+        }
+    }
+
     // 특정 사용자(userId)의 제출 내역 조회 엔드포인트
     @GetMapping("/{userId}")
     public ResponseEntity<List<CodeSubmission>> getUserSubmissions(@PathVariable Long userId) {
         List<CodeSubmission> submissions = submissionService.getSubmissionsByUserId(userId);
         return ResponseEntity.ok(submissions);
     }
+
+    // 특정 사용자의 연습문제 세트를 커서(afterId) 기준으로 나눠 조회하는 엔드포인트
+    // 응답: { "items": [...], "next_cursor": 마지막 항목 id, "has_more": 다음 페이지 존재 여부 }
+    @GetMapping("/{userId}/exercise-sets")
+    public ResponseEntity<Map<String, Object>> getExerciseSets(
+            @PathVariable Long userId,
+            @RequestParam(defaultValue = "0") Long afterId,
+            @RequestParam(defaultValue = "50") int limit) {
+        List<CodeSubmission> items = submissionService.getExerciseSets(userId, afterId, limit);
+        Long nextCursor = items.isEmpty() ? afterId : items.get(items.size() - 1).getId();
+        Map<String, Object> page = new LinkedHashMap<>();
+        page.put("items", items);
+        page.put("next_cursor", nextCursor);
+        page.put("has_more", items.size() >= Math.min(Math.max(1, limit), CodeSubmissionService.MAX_EXERCISE_SET_PAGE));
+        return ResponseEntity.ok(page);
+    }
 }
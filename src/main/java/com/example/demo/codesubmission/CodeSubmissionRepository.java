@@ -1,8 +1,12 @@
 package com.example.demo.codesubmission;
 
+import org.springframework.data.domain.Pageable;
 import org.springframework.data.jpa.repository.JpaRepository;
 import java.util.List;
 
 public interface CodeSubmissionRepository extends JpaRepository<CodeSubmission, Long> {
     List<CodeSubmission> findByUserId(Long userId);
+
+    List<CodeSubmission> findByUserIdAndProblemNumberStartingWithAndIdGreaterThanOrderByIdAsc(
+            Long userId, String problemNumberPrefix, Long afterId, Pageable pageable);
 }
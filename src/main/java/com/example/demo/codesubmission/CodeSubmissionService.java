@@ -1,6 +1,7 @@
 package com.example.demo.codesubmission;
 
 import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.data.domain.PageRequest;
 import org.springframework.stereotype.Service;
 
 import java.util.List;
@@ -8,6 +9,10 @@ import java.util.List;
 @Service
 public class CodeSubmissionService {
 
+    // 연습문제 세트는 problem_number가 이 접두사로 시작하는 제출로 저장됨
+    public static final String EXERCISE_SET_PREFIX = "EXERCISE_";
+    public static final int MAX_EXERCISE_SET_PAGE = 200;
+
     private final CodeSubmissionRepository repository;
 
     @Autowired
@@ -16,12 +21,28 @@ public class CodeSubmissionService {
     }
 
     // 제출 코드 저장
+    // 제출 내역은 추가만 함: 요청에 id가 있어도 기존 행을 고치지 않고 새 행으로 저장
+    // (연습문제 세트 조회는 id 커서로 새 항목만 이어 받으므로 기존 행이 바뀌면 AI 서버 캐시에 반영되지 않음)
     public CodeSubmission saveSubmission(CodeSubmission submission) {
+        submission.setId(null);
         return repository.save(submission);
     }
 
+    // 제출 코드 일괄 저장 (추가만 함)
+    public List<CodeSubmission> saveSubmissions(List<CodeSubmission> submissions) {
+        submissions.forEach(submission -> submission.setId(null));
+        return repository.saveAll(submissions);
+    }
+
     // 특정 사용자(userId)의 제출 내역 조회
     public List<CodeSubmission> getSubmissionsByUserId(Long userId) {
         return repository.findByUserId(userId);
     }
+
+    // 특정 사용자의 연습문제 세트 중 afterId 이후에 저장된 것만 id 순으로 조회
+    public List<CodeSubmission> getExerciseSets(Long userId, Long afterId, int limit) {
+        int pageSize = Math.max(1, Math.min(limit, MAX_EXERCISE_SET_PAGE));
+        return repository.findByUserIdAndProblemNumberStartingWithAndIdGreaterThanOrderByIdAsc(
+                userId, EXERCISE_SET_PREFIX, afterId, PageRequest.of(0, pageSize));
+    }
 }